@@ -0,0 +1 @@
+"""Benchmarks de los procesadores con libros Excel sintéticos (python -m benchmarks desde src/)"""
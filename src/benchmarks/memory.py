@@ -0,0 +1,189 @@
+"""
+Benchmark de memoria por procesador: pico de tracemalloc de la lectura, la transformación
+y la detección de registros nuevos (identify_new_records) sobre los libros sintéticos.
+
+El pico de cada etapa se mide sobre la memoria ya asignada al empezarla, de modo que
+refleja las copias intermedias de la etapa y no el tamaño del DataFrame de entrada.
+
+Uso (desde src/):
+    python -m benchmarks.memory --scale 20 --output data/benchmarks/memory_baseline.json
+    python -m benchmarks.memory --scale 20 --compare data/benchmarks/memory_baseline.json
+"""
+from datetime import datetime
+from typing import Dict, List
+import tracemalloc
+import argparse
+import platform
+import logging
+import json
+import gc
+import sys
+import os
+import pandas as pd
+from loaders.data_loader import DataLoader
+from utils.excel_transformer import ExcelTransformer
+from benchmarks.run import _processor_classes
+from benchmarks.workbooks import generate_workbook
+
+STAGES = ('read', 'transform', 'dedupe')
+_MB = 1024 * 1024
+
+def _measure(func, *args):
+    """Ejecuta func y retorna su resultado y el pico de memoria asignada durante la llamada (MB)"""
+    gc.collect()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    return result, round(max(peak, 0) / _MB, 2)
+
+def memory_processor(processor_class, loader: DataLoader, scale: float, seed: int,
+                     logger: logging.Logger) -> Dict:
+    """
+    Mide el pico de memoria por etapa de un procesador sobre su libro sintético
+
+    Para identify_new_records se simula una tabla que ya contiene la mitad de las claves.
+
+    Returns:
+        Dict: Filas, tamaño en memoria del DataFrame leído y pico en MB por etapa
+    """
+    file_name, data = generate_workbook(processor_class.__name__, scale, seed)
+    processor = processor_class(None, ExcelTransformer(), loader, logger)
+    file_info = {'name': file_name, 'path': 'benchmark', 'data': data, 'metadata': {'name': file_name}}
+
+    df, read_peak = _measure(lambda: processor.transformer.process_file(file_info, **processor.get_read_params()))
+    if df is None or df.empty:
+        raise RuntimeError(f"{processor_class.__name__}: no se pudo leer {file_name}")
+    frame_mb = round(df.memory_usage(deep=True).sum() / _MB, 2)
+    rows_read = len(df)
+
+    transformed, transform_peak = _measure(processor.transform_data, df)
+    del df
+
+    key_columns = processor.get_key_columns()
+    existing = transformed.loc[::2, key_columns].reset_index(drop=True)
+    new_records, dedupe_peak = _measure(loader.identify_new_records, transformed, existing, key_columns)
+
+    return {
+        'file': file_name,
+        'rows_read': rows_read,
+        'rows_out': len(transformed),
+        'rows_new': len(new_records),
+        'frame_mb': frame_mb,
+        'read_peak_mb': read_peak,
+        'transform_peak_mb': transform_peak,
+        'dedupe_peak_mb': dedupe_peak,
+    }
+
+def run_memory(scale: float = 1.0, seed: int = 42, processor_names: List[str] = None) -> Dict:
+    """
+    Ejecuta el benchmark de memoria de todos los procesadores con generador de libros
+
+    Returns:
+        Dict: Resultados comparables en JSON
+    """
+    logger = logging.getLogger('benchmarks')
+    # identify_new_records no consulta la base; basta una SQLite en memoria para crear el loader
+    loader = DataLoader({'url': 'sqlite://'})
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        results = {}
+        for name, processor_class in _processor_classes(processor_names).items():
+            logger.info(f"Benchmark de memoria de {name} (escala {scale})")
+            results[name] = memory_processor(processor_class, loader, scale, seed, logger)
+    finally:
+        if not started:
+            tracemalloc.stop()
+        loader.close_connections()
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': scale,
+        'seed': seed,
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.10) -> List[str]:
+    """
+    Compara el pico por etapa con una línea base
+
+    Returns:
+        List[str]: Regresiones (etapas con más memoria que la línea base por encima del umbral)
+    """
+    if current['scale'] != baseline['scale']:
+        print(f"Aviso: la línea base usa escala {baseline['scale']}; esta ejecución escala {current['scale']}")
+
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            continue
+        for stage in STAGES:
+            key = f"{stage}_peak_mb"
+            if not base.get(key):
+                continue
+            ratio = result[key] / base[key]
+            marker = ''
+            if ratio > 1 + threshold:
+                marker = '  <-- más memoria'
+                regressions.append(f"{name}.{stage}: {base[key]} MB -> {result[key]} MB (x{ratio:.2f})")
+            elif ratio < 1 - threshold:
+                marker = f"  (-{(1 - ratio) * 100:.0f}%)"
+            print(f"{name:40} {stage:10} {base[key]:>9.2f} MB -> {result[key]:>9.2f} MB  x{ratio:.2f}{marker}")
+    return regressions
+
+def print_results(report: Dict):
+    print(f"{'Procesador':40} {'filas':>9} {'df MB':>8} {'leer MB':>9} {'transf. MB':>11} {'dedupe MB':>10}")
+    for name, result in report['results'].items():
+        print(
+            f"{name:40} {result['rows_out']:>9} {result['frame_mb']:>8.2f} {result['read_peak_mb']:>9.2f} "
+            f"{result['transform_peak_mb']:>11.2f} {result['dedupe_peak_mb']:>10.2f}"
+        )
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de memoria por procesador con libros Excel sintéticos")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplicador de filas de los libros")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla de generación")
+    parser.add_argument('--processor', action='append', default=[], help="Procesador a medir (puede repetirse)")
+    parser.add_argument('--output', help="Guarda los resultados como línea base JSON")
+    parser.add_argument('--compare', help="Línea base JSON con la que comparar")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Tolerancia antes de marcar una regresión")
+    parser.add_argument('--verbose', action='store_true', help="Muestra el log de los procesadores")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    report = run_memory(args.scale, args.seed, args.processor)
+    print_results(report)
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Línea base guardada en {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("Regresiones:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
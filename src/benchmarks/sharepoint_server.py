@@ -0,0 +1,361 @@
+"""
+Servidor local que emula los endpoints REST de SharePoint usados por SharePointExtractor
+(sitio, carpetas, archivos y descarga con $value) a partir de un árbol de directorios.
+
+La raíz del árbol es la biblioteca de documentos: 'Shared Documents/Base/Folder/2-Comercio-Servicios'
+se sirve desde <root>/Base/Folder/2-Comercio-Servicios. Permite inyectar latencia, limitar el
+ancho de banda y responder 429 (por probabilidad o por exceso de peticiones simultáneas) para
+medir el rastreo y la concurrencia de descargas sin un tenant real.
+
+Uso (desde src/):
+    python -m benchmarks.sharepoint_server serve --root data/sharepoint --latency-ms 80 --max-concurrent 4
+    python -m benchmarks.sharepoint_server record --root data/sharepoint   # copia la carpeta base real
+    SHAREPOINT_SITE_URL=http://127.0.0.1:8765/sites/etl SHAREPOINT_AUTH=none python main.py
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timezone
+from urllib.parse import unquote, urlsplit
+from typing import Dict, Optional
+import threading
+import argparse
+import hashlib
+import logging
+import random
+import json
+import time
+import sys
+import os
+import re
+
+# get(Folder|File)ByServerRelativeUrl('...') o ...ByServerRelativePath(DecodedUrl='...') y el resto de la ruta
+_RESOURCE = re.compile(
+    r"/get(folder|file)byserverrelative(?:url|path)\((?:decodedurl=)?'(.*?)'\)(/.*)?$", re.IGNORECASE
+)
+_LIBRARIES = ('shared documents', 'documents', 'documentos compartidos')
+_CHUNK = 64 * 1024
+
+class SharePointStandIn:
+    """
+    Servidor HTTP local con la forma de la API REST de SharePoint (respuestas odata=verbose)
+
+    Args:
+        root (str): Directorio que representa la biblioteca de documentos
+        host (str): Interfaz de escucha
+        port (int): Puerto (0: uno libre)
+        site_path (str): Ruta del sitio en la URL
+        latency_ms (float): Latencia añadida a cada respuesta
+        bandwidth_kbps (float): Ancho de banda por descarga en KB/s (0: sin límite)
+        throttle_rate (float): Probabilidad de responder 429 a cada petición
+        max_concurrent (int): Peticiones simultáneas admitidas antes de responder 429 (0: sin límite)
+        retry_after (int): Segundos indicados en Retry-After de las respuestas 429
+        seed (int): Semilla de la limitación aleatoria
+    """
+    def __init__(self, root: str, host: str = '127.0.0.1', port: int = 8765, site_path: str = '/sites/etl',
+                 latency_ms: float = 0, bandwidth_kbps: float = 0, throttle_rate: float = 0.0,
+                 max_concurrent: int = 0, retry_after: int = 1, seed: int = 42):
+        self.root = os.path.abspath(root)
+        self.site_path = '/' + site_path.strip('/')
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth_kbps * 1024
+        self.throttle_rate = throttle_rate
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.logger = logging.getLogger(__name__)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {'requests': 0, 'throttled': 0, 'not_found': 0, 'downloads': 0, 'bytes_sent': 0, 'max_in_flight': 0}
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL del sitio para SHAREPOINT_SITE_URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.site_path}"
+
+    def start(self) -> 'SharePointStandIn':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='sharepoint-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _enter(self) -> bool:
+        """Registra una petición en curso; False si debe responderse 429"""
+        with self._lock:
+            self._stats['requests'] += 1
+            throttled = (
+                (self.max_concurrent and self._in_flight >= self.max_concurrent)
+                or (self.throttle_rate and self._random.random() < self.throttle_rate)
+            )
+            if throttled:
+                self._stats['throttled'] += 1
+                return False
+            self._in_flight += 1
+            self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._in_flight)
+            return True
+
+    def _leave(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def resolve(self, server_relative_url: str) -> Optional[str]:
+        """Ruta en disco de una URL relativa al servidor ('/sites/etl/Shared Documents/x' o 'Shared Documents/x')"""
+        path = unquote(server_relative_url).replace("''", "'").strip('/')
+        site = self.site_path.strip('/')
+        if path.lower().startswith(site.lower()):
+            path = path[len(site):].strip('/')
+        parts = [part for part in path.split('/') if part]
+        if parts and parts[0].lower() in _LIBRARIES:
+            parts = parts[1:]
+        if any(part in ('.', '..') for part in parts):
+            return None
+        return os.path.join(self.root, *parts)
+
+    def server_relative_url(self, path: str) -> str:
+        relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return f"{self.site_path}/Shared Documents" + ('' if relative == '.' else f"/{relative}")
+
+    def folder_properties(self, path: str) -> Dict:
+        return {
+            'Name': os.path.basename(path) if path != self.root else 'Shared Documents',
+            'ServerRelativeUrl': self.server_relative_url(path),
+            'ItemCount': len(os.listdir(path)),
+            'Exists': True,
+        }
+
+    def file_properties(self, path: str) -> Dict:
+        stat = os.stat(path)
+        unique_id = hashlib.md5(self.server_relative_url(path).encode('utf-8')).hexdigest()
+        return {
+            'Name': os.path.basename(path),
+            'ServerRelativeUrl': self.server_relative_url(path),
+            'Length': str(stat.st_size),
+            'TimeLastModified': datetime.fromtimestamp(stat.st_mtime, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'ETag': f'"{{{unique_id}}},{int(stat.st_mtime)}"',
+            'UniqueId': unique_id,
+            'Exists': True,
+        }
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def standin(self) -> SharePointStandIn:
+        return self.server.standin
+
+    def log_message(self, format, *args):
+        self.standin.logger.debug(format % args)
+
+    def do_POST(self):
+        # El cliente envía un cuerpo (p. ej. en contextinfo) que hay que consumir
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self._handle()
+
+    def do_GET(self):
+        self._handle()
+
+    def _handle(self):
+        standin = self.standin
+        path = unquote(urlsplit(self.path).path)
+        if path == '/_standin/stats':
+            return self._send_json(200, standin.stats())
+
+        if not standin._enter():
+            self.send_response(429)
+            self.send_header('Retry-After', str(standin.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            if standin.latency:
+                time.sleep(standin.latency)
+            self._route(path)
+        finally:
+            standin._leave()
+
+    def _route(self, path: str):
+        standin = self.standin
+        lower = path.lower()
+        if lower.endswith('/_api/contextinfo'):
+            return self._send_json(200, {'d': {'GetContextWebInformation': {
+                'FormDigestValue': 'standin-digest',
+                'FormDigestTimeoutSeconds': 1800,
+                'WebFullUrl': standin.url,
+                'SiteFullUrl': standin.url,
+            }}})
+        if lower.endswith('/_api/web'):
+            return self._send_json(200, {'d': {'Title': 'SharePoint local (stand-in)', 'ServerRelativeUrl': standin.site_path}})
+
+        match = _RESOURCE.search(path)
+        if not match:
+            return self._not_found(path)
+        kind, url, rest = match.group(1).lower(), match.group(2), (match.group(3) or '').lower()
+        target = standin.resolve(url)
+
+        if kind == 'folder':
+            if target is None or not os.path.isdir(target):
+                return self._not_found(url)
+            entries = sorted(os.listdir(target))
+            if rest == '/folders':
+                results = [standin.folder_properties(os.path.join(target, e)) for e in entries
+                           if os.path.isdir(os.path.join(target, e))]
+                return self._send_json(200, {'d': {'results': results}})
+            if rest == '/files':
+                results = [standin.file_properties(os.path.join(target, e)) for e in entries
+                           if os.path.isfile(os.path.join(target, e))]
+                return self._send_json(200, {'d': {'results': results}})
+            return self._send_json(200, {'d': standin.folder_properties(target)})
+
+        if target is None or not os.path.isfile(target):
+            return self._not_found(url)
+        if rest in ('/$value', '/openbinarystream'):
+            return self._send_file(target)
+        return self._send_json(200, {'d': standin.file_properties(target)})
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;odata=verbose;charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self, url: str):
+        self.standin._count('not_found')
+        self._send_json(404, {'error': {
+            'code': '-2130575338, System.IO.FileNotFoundException',
+            'message': {'lang': 'es-ES', 'value': f"El archivo o carpeta {url} no existe."},
+        }})
+
+    def _send_file(self, path: str):
+        """Envía el archivo en bloques, respetando el ancho de banda configurado"""
+        standin = self.standin
+        size = os.path.getsize(path)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(_CHUNK)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                if standin.bandwidth:
+                    time.sleep(len(chunk) / standin.bandwidth)
+        standin._count('downloads')
+        standin._count('bytes_sent', size)
+
+def record(extractor, base_folder: str, root: str) -> int:
+    """
+    Copia a disco la estructura y los archivos de la carpeta base de SharePoint, para
+    servirlos luego con el stand-in
+
+    Args:
+        extractor (SharePointExtractor): Extractor conectado al tenant real
+        base_folder (str): Carpeta base (SHAREPOINT_BASE_FOLDER)
+        root (str): Directorio destino (raíz de la biblioteca de documentos)
+
+    Returns:
+        int: Archivos guardados
+    """
+    saved = 0
+    pending = [base_folder]
+    while pending:
+        folder_path = pending.pop()
+        target = os.path.join(root, *folder_path.split('/'))
+        os.makedirs(target, exist_ok=True)
+        for file_name in extractor.list_files(folder_path):
+            data = extractor.download_file(folder_path, file_name)
+            if data is None:
+                continue
+            with open(os.path.join(target, file_name), 'wb') as f:
+                f.write(data.getbuffer())
+            saved += 1
+        pending.extend(
+            f"{folder_path}/{name}" if folder_path else name for name in extractor.list_folders(folder_path)
+        )
+    return saved
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="SharePoint local para pruebas y benchmarks de extracción")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="Sirve un árbol de directorios con la API REST de SharePoint")
+    serve.add_argument('--root', required=True, help="Directorio raíz de la biblioteca de documentos")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--site-path', default='/sites/etl')
+    serve.add_argument('--latency-ms', type=float, default=0, help="Latencia añadida a cada respuesta")
+    serve.add_argument('--bandwidth-kbps', type=float, default=0, help="KB/s por descarga (0: sin límite)")
+    serve.add_argument('--throttle-rate', type=float, default=0.0, help="Probabilidad de responder 429")
+    serve.add_argument('--max-concurrent', type=int, default=0, help="Peticiones simultáneas antes de responder 429")
+    serve.add_argument('--retry-after', type=int, default=1, help="Segundos de Retry-After en las respuestas 429")
+    serve.add_argument('--seed', type=int, default=42)
+
+    record_parser = commands.add_parser('record', help="Copia la carpeta base de SharePoint (configurada en .env) a disco")
+    record_parser.add_argument('--root', required=True, help="Directorio destino")
+    record_parser.add_argument('--folder', help="Carpeta a copiar (por defecto SHAREPOINT_BASE_FOLDER)")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == 'record':
+        from config.settings import (
+            SHAREPOINT_SITE_URL, SHAREPOINT_USERNAME, SHAREPOINT_PASSWORD, SHAREPOINT_BASE_FOLDER
+        )
+        from extractors.sharepoint_extractor import SharePointExtractor
+        extractor = SharePointExtractor(SHAREPOINT_SITE_URL, SHAREPOINT_USERNAME, SHAREPOINT_PASSWORD)
+        if not extractor.connect():
+            return 1
+        saved = record(extractor, args.folder if args.folder is not None else SHAREPOINT_BASE_FOLDER, args.root)
+        print(f"{saved} archivos guardados en {args.root}")
+        return 0
+
+    standin = SharePointStandIn(
+        args.root, args.host, args.port, args.site_path, args.latency_ms, args.bandwidth_kbps,
+        args.throttle_rate, args.max_concurrent, args.retry_after, args.seed
+    )
+    print(f"SharePoint local en {standin.url} (raíz {standin.root}); usar SHAREPOINT_AUTH=none")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+        print(json.dumps(standin.stats()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
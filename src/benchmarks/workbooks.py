@@ -0,0 +1,206 @@
+"""
+Generadores de libros Excel sintéticos con la misma forma que los archivos reales
+de SharePoint, uno por tipo de procesador.
+
+Cada generador recibe el número de filas de datos y un generador aleatorio con
+semilla (resultados reproducibles) y retorna (nombre_archivo, contenido en BytesIO).
+"""
+from datetime import date
+from io import BytesIO
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+MESES = [
+    'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+    'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+]
+
+DEPARTAMENTOS = [
+    ('05', 'Antioquia', 'Andina'), ('08', 'Atlántico', 'Caribe'), ('11', 'Bogotá', 'Andina'),
+    ('13', 'Bolívar', 'Caribe'), ('76', 'Valle del Cauca', 'Pacífico'), ('68', 'Santander', 'Andina'),
+    ('50', 'Meta', 'Orinoquía'), ('47', 'Magdalena', 'Caribe'),
+]
+
+def _country_codes(count: int) -> List[str]:
+    return [f"{i:03d}" for i in range(1, count + 1)]
+
+def _write(sheets: List[Tuple[str, pd.DataFrame, int, List[str], List[str], bool]]) -> BytesIO:
+    """
+    Escribe las hojas en un libro xlsx
+
+    Args:
+        sheets: (nombre, datos, fila de encabezado, filas de título, filas de pie, escribir encabezado)
+    """
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for sheet_name, df, header_row, titles, footers, header in sheets:
+            df.to_excel(writer, sheet_name=sheet_name, startrow=header_row, index=False, header=header)
+            worksheet = writer.sheets[sheet_name]
+            for row, title in enumerate(titles, start=1):
+                worksheet.cell(row=row, column=1, value=title)
+            last_row = header_row + len(df) + (1 if header else 0)
+            for offset, footer in enumerate(footers, start=1):
+                worksheet.cell(row=last_row + offset, column=2, value=footer)
+    buffer.seek(0)
+    return buffer
+
+def exportaciones_workbook(rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    """Hoja ancha de exportaciones (segunda hoja) con columnas FOBDO/KNETO por año y periodo"""
+    countries = _country_codes(240)
+    departamentos = [DEPARTAMENTOS[i] for i in rng.integers(0, len(DEPARTAMENTOS), rows)]
+    index = np.arange(rows)
+    df = pd.DataFrame({
+        # Multiplicación por un impar no múltiplo de 5 módulo 10^10: códigos únicos de aspecto aleatorio
+        'NANDINA': [f"{(i * 2654435761) % 10**10:010d}" for i in index],
+        'partida': [f"{(i * 2654435761) % 10**10:010d}"[:4] for i in index],
+        'TECNOLOGÍA': rng.choice(['Alta', 'Media', 'Baja', 'Basados en recursos naturales'], rows),
+        'CLAS MIN': rng.choice(['M1', 'M2', 'NM'], rows),
+        'DES CLAS MIN': rng.choice(['Carbón', 'Petróleo y derivados', 'Oro', 'No minero'], rows),
+        'GRUPOS CLAS MIN': rng.choice(['Minero energético', 'No minero energético'], rows),
+        'MINEROS/NO MINEROS': rng.choice(['Mineros', 'No mineros'], rows),
+        'CUCI_AGREGADO': rng.choice(['Agropecuarios', 'Manufacturas', 'Combustibles', 'Otros'], rows),
+        'PAIS': rng.choice(countries, rows),
+        'PAÍS': [f"País {code}" for code in rng.choice(countries, rows)],
+        'GRUPO1': rng.choice(['ALADI', 'CAN', 'UE', 'Otros'], rows),
+        'GRUPO2': rng.choice(['América', 'Europa', 'Asia', 'África', 'Oceanía'], rows),
+        'GRUPO3': rng.choice(['TLC vigente', 'Sin acuerdo'], rows),
+        'DEPORIG': [code for code, _, _ in departamentos],
+        'DEPARTAMENTO': [name for _, name, _ in departamentos],
+        'región': [region for _, _, region in departamentos],
+    })
+    value_columns = [
+        f"{metric}{year}{period}"
+        for metric in ('FOBDO', 'KNETO')
+        for year, period in [(y, '') for y in range(19, 24)] + [(24, 'EMZ')]
+    ]
+    values = rng.gamma(2.0, 50_000.0, (rows, len(value_columns))).round(2)
+    # Celdas vacías como en los archivos reales
+    values[rng.random(values.shape) < 0.05] = np.nan
+    df = pd.concat([df, pd.DataFrame(values, columns=value_columns)], axis=1)
+
+    notes = pd.DataFrame({'Notas': ['Fuente: DANE - DIAN. Cálculos OEE.', 'Cifras en dólares FOB y kilos netos.']})
+    return 'OEE MA Exportaciones.xlsx', _write([
+        ('Notas', notes, 0, [], [], True),
+        ('Datos', df, 0, [], [], True),
+    ])
+
+def emces_workbook(rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    """EMCES: títulos en las primeras filas, encabezado en la fila 7 y notas al pie"""
+    countries = _country_codes(120)
+    departamentos = [DEPARTAMENTOS[i] for i in rng.integers(0, len(DEPARTAMENTOS), rows)]
+    codes = [f"S{i:02d}" for i in range(1, 13)]
+    pais = rng.choice(countries, rows)
+    codigo = rng.choice(codes, rows)
+    df = pd.DataFrame({
+        'FLUJO_COMERCIAL': rng.choice(['Exportaciones', 'Importaciones'], rows),
+        'PERIODO_MES': [f"{year}{month:02d}" for year, month in zip(rng.integers(2019, 2025, rows), rng.integers(1, 13, rows))],
+        'CÓDIGO': codigo,
+        'DESCRIPCION_CABPS': [f"Servicio {code}" for code in codigo],
+        'PAÍS': pais,
+        'NOMBRE_PAÍS': [f"País {code}" for code in pais],
+        'DEPARTAMENTO': [code for code, _, _ in departamentos],
+        'NOMBRE_DEPARTAMENTO': [name for _, name, _ in departamentos],
+        'TOTAL_EN_MILES_DE_DOLARES': rng.gamma(1.5, 800.0, rows).round(4),
+    })
+    titles = [
+        'DANE - Encuesta Mensual de Comercio Exterior de Servicios (EMCES)',
+        'Exportaciones e importaciones de servicios por país y departamento',
+        f"Actualizado: {date.today().isoformat()}",
+    ]
+    footers = ['', 'Fuente: DANE, EMCES.', 'Nota: cifras provisionales.']
+    return 'Datos_EMCES.xlsx', _write([('Datos', df, 6, titles, footers, True)])
+
+def _investment_workbook(file_name: str, rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    """Hoja 'Series de datos' de BanRep: fechas trimestrales como columnas y una fila de pie"""
+    countries = _country_codes(200)
+    series = ['Participaciones de capital', 'Reinversión de utilidades', 'Instrumentos de deuda', 'Total']
+    quarters = [
+        date(year, month, day).strftime('%d/%m/%Y')
+        for year in range(2014, 2024)
+        for month, day in ((3, 31), (6, 30), (9, 30), (12, 31))
+    ]
+    grid = [
+        ['Inversión directa por país (millones de dólares)', ''] + [''] * len(quarters),
+        ['', ''] + quarters,
+        ['COD País', 'Serie'] + ['Millones de USD'] * len(quarters),
+    ]
+    values = rng.normal(50.0, 120.0, (rows, len(quarters))).round(2)
+    for i in range(rows):
+        cycle = i // len(countries)
+        serie = series[cycle % len(series)] + (f" {cycle // len(series)}" if cycle >= len(series) else '')
+        grid.append([countries[i % len(countries)], serie] + values[i].tolist())
+    grid.append(['Fuente: Banco de la República.', ''] + [''] * len(quarters))
+    return file_name, _write([('Series de datos', pd.DataFrame(grid), 0, [], [], False)])
+
+def ied_workbook(rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    return _investment_workbook('IED por país origen.xlsx', rows, rng)
+
+def idce_workbook(rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    return _investment_workbook('IDCE por país destino.xlsx', rows, rng)
+
+def turismo_workbook(rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    """Libro de turismo con las hojas de salidas y de extranjeros, encabezado en la fila 11 y pies"""
+    def sheet(count: int) -> pd.DataFrame:
+        countries = [f"País {code}" for code in _country_codes(max(1, count // (12 * 12) + 1))]
+        combos = [
+            (year, month, country)
+            for year in range(2013, 2025) for month in MESES for country in countries
+        ][:count]
+        return pd.DataFrame({
+            'Año': [year for year, _, _ in combos],
+            'Mes': [month for _, month, _ in combos],
+            'País': [country for _, _, country in combos],
+            'Viajeros': rng.integers(0, 50_000, len(combos)),
+        })
+
+    titles = ['Ministerio de Comercio, Industria y Turismo', 'Oficina de Estudios Económicos', 'Turismo']
+    return 'OEE EC TURISMO.xlsx', _write([
+        ('Salidas colombianos', sheet(rows), 10, titles,
+         ['Fuente: Migración Colombia.', 'Cálculos: OEE.', 'Datos provisionales.'], True),
+        ('Extranjeros Pais de Residencia', sheet(rows), 10, titles,
+         ['Fuente: Migración Colombia.', 'Cálculos: OEE.', 'No incluye cruceristas.',
+          'No incluye colombianos residentes en el exterior.', 'Datos provisionales.'], True),
+    ])
+
+def pais_acuerdos_workbook(rows: int, rng: np.random.Generator) -> Tuple[str, BytesIO]:
+    """Tabla de países y acuerdos con una fila de título sobre el encabezado"""
+    codes = ['000'] + _country_codes(rows - 1)
+    df = pd.DataFrame({
+        'Cod. Pais': codes,
+        'País': ['Mundo'] + [f"País {code}" for code in codes[1:]],
+        'Grupos DIE': rng.choice(['América del Norte', 'Unión Europea', 'Asia', 'Comunidad Andina'], len(codes)),
+        'AP': rng.choice(['Sí', 'No'], len(codes)),
+        'AEC': rng.choice(['Sí', 'No'], len(codes)),
+        'ACUERDOS': rng.choice(['TLC', 'AAP', 'Sin acuerdo'], len(codes)),
+        'ALADI': rng.choice(['Sí', 'No'], len(codes)),
+        'CELAC': rng.choice(['Sí', 'No'], len(codes)),
+    })
+    return 'Código País Acuerdos.xlsx', _write([('Países', df, 1, ['Códigos de país y acuerdos comerciales'], [], True)])
+
+# Procesador -> generador de su libro y filas de datos por unidad de escala
+WORKBOOKS: Dict[str, Tuple[Callable, int]] = {
+    'ComercioBienesExportacionesProcessor': (exportaciones_workbook, 1000),
+    'ComercioServiciosProcessor': (emces_workbook, 2000),
+    'IedPaisOrigenProcessor': (ied_workbook, 400),
+    'IdcePaisDestinoProcessor': (idce_workbook, 400),
+    'TurismoSalidaColombianosProcessor': (turismo_workbook, 1500),
+    'TurismoVisitantesPaisProcessor': (turismo_workbook, 1500),
+    'PaisAcuerdosProcessor': (pais_acuerdos_workbook, 250),
+}
+
+def generate_workbook(processor_name: str, scale: float = 1.0, seed: int = 42) -> Tuple[str, BytesIO]:
+    """
+    Genera el libro sintético de un procesador
+
+    Args:
+        processor_name (str): Nombre de la clase del procesador
+        scale (float): Multiplicador del número de filas base del procesador
+        seed (int): Semilla del generador aleatorio
+
+    Returns:
+        Tuple[str, BytesIO]: Nombre del archivo (coincide con los patrones del procesador) y contenido
+    """
+    generator, base_rows = WORKBOOKS[processor_name]
+    rows = max(2, int(base_rows * scale))
+    return generator(rows, np.random.default_rng(seed))
@@ -9,6 +9,29 @@ SHAREPOINT_USERNAME = os.getenv('SHAREPOINT_USERNAME')
 SHAREPOINT_PASSWORD = os.getenv('SHAREPOINT_PASSWORD')
 SHAREPOINT_BASE_FOLDER = os.getenv('SHAREPOINT_BASE_FOLDER', 'Documentos Compartidos')
 SHAREPOINT_FOLDER_PATH = os.getenv('SHAREPOINT_FOLDER_PATH', '')
+SHAREPOINT_MAX_CONCURRENT_REQUESTS = int(os.getenv('SHAREPOINT_MAX_CONCURRENT_REQUESTS', 4))
+# Reintentos ante respuestas 429/503 de SharePoint (se respeta Retry-After)
+SHAREPOINT_MAX_RETRIES = int(os.getenv('SHAREPOINT_MAX_RETRIES', 5))
+# 'user' (usuario y contraseña) | 'none' (SharePoint local de benchmarks.sharepoint_server, sin autenticación)
+SHAREPOINT_AUTH = os.getenv('SHAREPOINT_AUTH', 'user')
+
+# Ejecución: ETL_MAX_WORKERS > 1 procesa carpetas y procesadores en paralelo
+ETL_MAX_WORKERS = int(os.getenv('ETL_MAX_WORKERS', 1))
+# ETL_MODE: 'batch' (por procesador) | 'pipeline' (descarga, transformación y carga solapadas)
+#           | 'streaming' (descarga, transformación y carga archivo por archivo)
+ETL_MODE = os.getenv('ETL_MODE', 'batch')
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 2))
+PIPELINE_PARSE_WORKERS = int(os.getenv('PIPELINE_PARSE_WORKERS', 1))
+
+# Modo distribuido: varios nodos se reparten los trabajos con leases en la base de datos destino.
+# Todos los nodos de una misma ejecución deben usar el mismo SHARD_RUN_ID; sin él, cada nodo genera
+# uno propio (y lo registra en el log) y no comparte trabajos con los demás
+ETL_SHARDED = os.getenv('ETL_SHARDED', 'false').lower() in ('1', 'true', 'yes')
+SHARD_RUN_ID = os.getenv('SHARD_RUN_ID')
+LEASE_TTL_SECONDS = int(os.getenv('LEASE_TTL_SECONDS', 300))
+LEASE_HEARTBEAT_SECONDS = int(os.getenv('LEASE_HEARTBEAT_SECONDS', 60))
+# Intentos por trabajo: un lease fallido se vuelve a tomar hasta alcanzarlos
+LEASE_MAX_ATTEMPTS = int(os.getenv('LEASE_MAX_ATTEMPTS', 3))
 
 # Database connection
 DATABASE_HOST = os.getenv('DATABASE_HOST', '127.0.0.1')
@@ -16,11 +39,77 @@ DATABASE_PORT = int(os.getenv('DATABASE_PORT', 3306))
 DATABASE_NAME = os.getenv('DATABASE_NAME', 'erc_db')
 DATABASE_USER = os.getenv('DATABASE_USER', 'erc_user')
 DATABASE_PASSWORD = os.getenv('DATABASE_PASSWORD', 'erc_password')
+DATABASE_DRIVER = os.getenv('DATABASE_DRIVER', 'auto')  # auto | mysqldb | pymysql | mysqlconnector
+DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', 5))
+DATABASE_MAX_OVERFLOW = int(os.getenv('DATABASE_MAX_OVERFLOW', 5))
+DATABASE_POOL_TIMEOUT = int(os.getenv('DATABASE_POOL_TIMEOUT', 30))
+DATABASE_POOL_RECYCLE = int(os.getenv('DATABASE_POOL_RECYCLE', 3600))
+DATABASE_CONNECT_TIMEOUT = int(os.getenv('DATABASE_CONNECT_TIMEOUT', 10))
+# URL SQLAlchemy completa que reemplaza la conexión MySQL (p. ej. sqlite:///data/local.db para pruebas locales)
+DATABASE_URL_OVERRIDE = os.getenv('DATABASE_URL_OVERRIDE')
+
+# Carga: LOAD_WORKERS > 1 activa inserciones paralelas en bloques disjuntos por clave
+LOAD_WORKERS = int(os.getenv('LOAD_WORKERS', 1))
+LOAD_CHUNK_SIZE = int(os.getenv('LOAD_CHUNK_SIZE', 10000))
+LOAD_MAX_RETRIES = int(os.getenv('LOAD_MAX_RETRIES', 3))
 DATABASE_URL = f"mysql+mysqlconnector://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
 
 # Configure logging
 LOGGING_LEVEL = os.getenv('LOGGING_LEVEL', 'INFO')
 LOGGING_FILE = os.getenv('LOGGING_FILE', "etl_process.log")
+# 'text' | 'json' (archivo de log con un objeto JSON por línea, incluye el procesador en curso)
+LOGGING_FORMAT = os.getenv('LOGGING_FORMAT', 'text')
+# Mensajes repetidos desde un mismo punto del código: máximo BURST por ventana de SECONDS (0: sin límite)
+LOGGING_RATE_LIMIT_BURST = int(os.getenv('LOGGING_RATE_LIMIT_BURST', 50))
+LOGGING_RATE_LIMIT_SECONDS = float(os.getenv('LOGGING_RATE_LIMIT_SECONDS', 10))
+
+# Modo vigilancia (--watch): intervalo entre revisiones de carpetas
+WATCH_INTERVAL_SECONDS = int(os.getenv('WATCH_INTERVAL_SECONDS', 300))
+
+# Manifiesto de archivos cargados (permite omitir archivos sin cambios)
+MANIFEST_PATH = os.getenv('MANIFEST_PATH', 'data/run_manifest.json')
+
+# Checkpoints por etapa para retomar ejecuciones fallidas
+CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH', 'data/checkpoints')
+
+# Historial de duraciones por procesador y archivo (programa primero los trabajos más largos)
+JOB_HISTORY_PATH = os.getenv('JOB_HISTORY_PATH', 'data/job_history.json')
+
+# Métricas: reporte JSON de cada ejecución y archivo para el textfile collector de node_exporter
+METRICS_REPORT_PATH = os.getenv('METRICS_REPORT_PATH', 'data/metrics/run_report.json')
+METRICS_TEXTFILE_PATH = os.getenv('METRICS_TEXTFILE_PATH', '')
+
+# Historial de rendimiento por ejecución (JSONL) y alarma cuando una etapa, procesador o tabla es más lenta
+# (ms por fila; segundos si no procesó filas) que el percentil PERF_REGRESSION_PERCENTILE de sus últimas
+# PERF_HISTORY_WINDOW ejecuciones
+PERF_HISTORY_PATH = os.getenv('PERF_HISTORY_PATH', 'data/metrics/perf_history.jsonl')
+PERF_HISTORY_WINDOW = int(os.getenv('PERF_HISTORY_WINDOW', 20))
+PERF_REGRESSION_PERCENTILE = float(os.getenv('PERF_REGRESSION_PERCENTILE', 90))
+PERF_REGRESSION_MIN_RUNS = int(os.getenv('PERF_REGRESSION_MIN_RUNS', 5))
+PERF_REGRESSION_MIN_SECONDS = float(os.getenv('PERF_REGRESSION_MIN_SECONDS', 1.0))
+
+# Validación declarativa: muestra de hasta VALIDATION_QUARANTINE_SAMPLE filas rechazadas por archivo
+# en VALIDATION_QUARANTINE_PATH/<run_id>/<procesador>.csv (0: sin cuarentena)
+VALIDATION_QUARANTINE_PATH = os.getenv('VALIDATION_QUARANTINE_PATH', 'data/quarantine')
+VALIDATION_QUARANTINE_SAMPLE = int(os.getenv('VALIDATION_QUARANTINE_SAMPLE', 0))
+
+# Perfil de memoria por etapa (RSS y tracemalloc) y presupuesto de memoria residente en MB (0: sin límite)
+MEMORY_PROFILE = os.getenv('MEMORY_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+MEMORY_PROFILE_TOP = int(os.getenv('MEMORY_PROFILE_TOP', 5))
+MEMORY_BUDGET_MB = int(os.getenv('MEMORY_BUDGET_MB', 0))
+
+# Perfil de CPU por procesador (cProfile y muestreo de pila): archivos por ejecución en CPU_PROFILE_PATH/<run_id>.
+# cProfile solo con ETL_MAX_WORKERS=1; con varios workers, solo el muestreo de pila
+CPU_PROFILE = os.getenv('CPU_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+CPU_PROFILE_PATH = os.getenv('CPU_PROFILE_PATH', 'data/profiles')
+CPU_PROFILE_TOP = int(os.getenv('CPU_PROFILE_TOP', 20))
+CPU_PROFILE_INTERVAL_MS = float(os.getenv('CPU_PROFILE_INTERVAL_MS', 5))
+
+# Trazas por etapa y archivo (JSONL con campos de OpenTelemetry) en TRACING_PATH/<run_id>.jsonl;
+# TRACING_OTEL envía además los spans al TracerProvider de OpenTelemetry si está instalado
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+TRACING_PATH = os.getenv('TRACING_PATH', 'data/traces')
+TRACING_OTEL = os.getenv('TRACING_OTEL', 'false').lower() in ('1', 'true', 'yes')
 
 # Folder paths
 # RAW_DATA_PATH = os.getenv('RAW_DATA_PATH', 'data/raw')
@@ -29,4 +118,5 @@ LOGGING_FILE = os.getenv('LOGGING_FILE', "etl_process.log")
 # Ensure paths exist
 # os.makedirs(RAW_DATA_PATH, exist_ok=True)
 # os.makedirs(PROCESSED_DATA_PATH, exist_ok=True)
-os.makedirs(os.path.dirname(LOGGING_FILE), exist_ok=True)
\ No newline at end of file
+if os.path.dirname(LOGGING_FILE):
+    os.makedirs(os.path.dirname(LOGGING_FILE), exist_ok=True)
\ No newline at end of file
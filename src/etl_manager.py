@@ -1,109 +1,506 @@
+import hashlib
 import logging
-from typing import Dict
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 from extractors.sharepoint_extractor import SharePointExtractor
 from utils.excel_transformer import ExcelTransformer
 from loaders.data_loader import DataLoader
+from loaders.lease_manager import LeaseManager, new_run_id
 from processors import ProcessorFactory
+from etl_pipeline import ETLPipeline
+from utils.run_manifest import RunManifest
+from utils.checkpoints import CheckpointStore
+from utils.file_filter import FileFilter
+from utils.job_history import JobHistory
+from utils.memory_profiler import MemoryBudgetExceeded
+from utils.cpu_profiler import PROFILER
+from utils.tracing import TRACER
 
-class ETLManager: 
+class ETLManager:
     def __init__(self, config: Dict):
         print('iniciando el etl')
         self.config = config
-        self.extractor = SharePointExtractor(
-            config['SHAREPOINT_SITE_URL'],
-            config['SHAREPOINT_USERNAME'],
-            config['SHAREPOINT_PASSWORD']
-        )
+        self.max_workers = int(config.get('ETL_MAX_WORKERS', 1))
+        # 'batch': cada procesador extrae, transforma y carga por fases; 'pipeline': etapas solapadas;
+        # 'streaming': archivo por archivo, con memoria acotada por el archivo más grande
+        self.mode = config.get('ETL_MODE', 'batch')
+        self.pipeline_stats = []
+        # Ejecución dirigida: procesadores por nombre de clase y filtro de archivos
+        self.processor_names = {name.lower() for name in config.get('PROCESSOR_NAMES') or []}
+        self.file_filter = FileFilter(config.get('FILE_GLOBS'), config.get('MODIFIED_SINCE'))
+
+        # Límite global de peticiones simultáneas a SharePoint, compartido por todos los workers
+        max_requests = int(config.get('SHAREPOINT_MAX_CONCURRENT_REQUESTS', 4))
+        self.sharepoint_limiter = threading.BoundedSemaphore(max_requests)
+        self._local = threading.local()
+        # Sesiones de SharePoint libres, como (extractor, generación): los hilos las toman prestadas
+        # (extractor_session) y las devuelven, así sobreviven a los hilos de corta vida del pipeline
+        self._idle_extractors = queue.LifoQueue()
+        # Generación de las sesiones de SharePoint: al incrementarse, cada worker se reconecta
+        self._connection_generation = 0
+        self._executor = None
+
+        self.extractor = self._create_extractor()
         self.transformer = ExcelTransformer()
+        # Manifiesto de archivos ya cargados; FORCE reprocesa todo pero sigue registrando
+        self.manifest = RunManifest(
+            config.get('MANIFEST_PATH', 'data/run_manifest.json'),
+            force=bool(config.get('FORCE', False))
+        )
+        # Checkpoints por etapa: una ejecución fallida se retoma en la siguiente
+        self.checkpoints = CheckpointStore.resume_or_create(
+            config.get('CHECKPOINT_PATH', 'data/checkpoints'),
+            run_id=config.get('RUN_ID'),
+            resume=bool(config.get('RESUME', True)),
+            options={**self.file_filter.to_dict(), 'force': self.manifest.force}
+        )
+        # Identificador de esta invocación (trazas, perfiles, cuarentena e historial de rendimiento):
+        # el de los checkpoints se repite en cada invocación que los retoma
+        self.run_id = new_run_id()
+        # Historial de duraciones: los trabajos más largos se programan primero
+        self.history = JobHistory(config.get('JOB_HISTORY_PATH', 'data/job_history.json'))
+        # Loader único: todas las conexiones salen del mismo pool, cuyo tamaño limita las conexiones a la BD
         self.loader = DataLoader(config['DATABASE_CONFIG'])
         self.logger = logging.getLogger(__name__)
+        # Modo distribuido: los nodos se reparten los trabajos con leases en la base de datos destino
+        self.leases = None
+        # Listados de carpetas de los trabajos en curso (_run_jobs): folder_path -> metadatos.
+        # Los comparten la predicción, la ronda distribuida y los procesadores, para listar una sola vez
+        self._listings: Dict[str, List[Dict]] = {}
+        if config.get('ETL_SHARDED'):
+            self.shard_run_id = config.get('SHARD_RUN_ID')
+            if not self.shard_run_id:
+                self.shard_run_id = new_run_id()
+                self.logger.warning(
+                    f"SHARD_RUN_ID no definido: ejecución distribuida {self.shard_run_id}; "
+                    f"los demás nodos deben unirse con SHARD_RUN_ID={self.shard_run_id}"
+                )
+            self.leases = LeaseManager(
+                self.loader.pool,
+                run_id=self.shard_run_id,
+                ttl_seconds=int(config.get('LEASE_TTL_SECONDS', 300)),
+                heartbeat_seconds=int(config.get('LEASE_HEARTBEAT_SECONDS', 60)),
+                max_attempts=int(config.get('LEASE_MAX_ATTEMPTS', 3))
+            )
+
+    def _create_extractor(self) -> SharePointExtractor:
+        return SharePointExtractor(
+            self.config['SHAREPOINT_SITE_URL'],
+            self.config['SHAREPOINT_USERNAME'],
+            self.config['SHAREPOINT_PASSWORD'],
+            request_limiter=self.sharepoint_limiter,
+            auth=self.config.get('SHAREPOINT_AUTH', 'user'),
+            max_retries=int(self.config.get('SHAREPOINT_MAX_RETRIES', 5))
+        )
+
+    def _borrow_extractor(self) -> SharePointExtractor:
+        """Asigna al hilo actual una sesión libre del pool (o una nueva si no hay)"""
+        try:
+            extractor, generation = self._idle_extractors.get_nowait()
+        except queue.Empty:
+            extractor, generation = self._create_extractor(), self._connection_generation
+        self._local.extractor = extractor
+        self._local.generation = generation
+        return extractor
+
+    @contextmanager
+    def extractor_session(self):
+        """
+        Presta al hilo actual una sesión de SharePoint del pool del manager durante el bloque y
+        la devuelve al terminar, ya autenticada, para el siguiente hilo que la necesite
+        """
+        if (threading.current_thread() is threading.main_thread()
+                or getattr(self._local, 'extractor', None) is not None):
+            yield self._get_extractor()
+            return
+
+        self._borrow_extractor()
+        try:
+            yield self._get_extractor()
+        finally:
+            extractor, generation = self._local.extractor, self._local.generation
+            self._local.extractor = None
+            self._idle_extractors.put((extractor, generation))
+
+    def _get_extractor(self) -> SharePointExtractor:
+        """
+        Retorna la sesión de SharePoint del hilo actual: la principal en el hilo principal y la
+        prestada por extractor_session en los workers (fuera de una, el hilo toma una y la conserva)
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.extractor
+
+        extractor = getattr(self._local, 'extractor', None)
+        if extractor is None:
+            extractor = self._borrow_extractor()
+        if self._local.generation != self._connection_generation:
+            # reset_connections se llamó después de la última petición con esta sesión
+            extractor.reset_connection()
+            self._local.generation = self._connection_generation
+        return extractor
+
+    def reset_connections(self):
+        """Fuerza una nueva autenticación en SharePoint en el hilo principal y en todos los workers"""
+        self._connection_generation += 1
+        self.extractor.reset_connection()
+
+    def _create_processor(self, processor_class):
+        """Crea una instancia del procesador con la sesión de SharePoint del hilo actual"""
+        return processor_class(
+            self._get_extractor(),
+            self.transformer,
+            self.loader,
+            self.logger,
+            manifest=self.manifest,
+            checkpoint=self.checkpoints.for_processor(processor_class.__name__) if self.mode == 'batch' else None,
+            file_filter=self.file_filter or None,
+            history=self.history,
+            listings=self._listings
+        )
+
+    def _get_processor_classes(self, folder_name: str) -> List:
+        processor_classes = ProcessorFactory.get_processor(folder_name)
+        if not processor_classes:
+            return []
+        # Manejar procesador único o múltiples procesadores
+        if not isinstance(processor_classes, list):
+            processor_classes = [processor_classes]
+        if self.processor_names:
+            processor_classes = [
+                processor_class for processor_class in processor_classes
+                if processor_class.__name__.lower() in self.processor_names
+            ]
+        return processor_classes
+
+    def _list_files(self, folder_path: str) -> List[Dict]:
+        """Metadatos de los archivos de la carpeta, listados una vez por ejecución de trabajos"""
+        files = self._listings.get(folder_path)
+        if files is None:
+            files = self._get_extractor().list_files_metadata(folder_path)
+            if files:
+                # Un listado vacío puede ser un error de SharePoint: el procesador vuelve a intentarlo
+                self._listings[folder_path] = files
+        return files
+
+    def _pending_bytes(self, job: Tuple) -> Optional[int]:
+        """Tamaño de los archivos que el trabajo procesaría (según patrones, filtro y manifiesto)"""
+        _, folder_path, processor_class = job
+        try:
+            # El listado queda en _listings y el procesador del trabajo lo reutiliza
+            self._list_files(folder_path)
+            files = self._create_processor(processor_class).list_matching_files(folder_path)
+        except Exception as e:
+            self.logger.warning(f"No se pudieron listar los archivos de {processor_class.__name__}: {str(e)}")
+            return None
+        return sum(metadata.get('size') or 0 for metadata in files)
+
+    def _predict(self, jobs: List[Tuple]) -> List[Optional[float]]:
+        """
+        Duración esperada de cada trabajo: tamaño de sus archivos pendientes por los segundos
+        por byte del historial del procesador, o su media de duraciones si no hay tamaños.
+        Con un solo trabajo el orden no importa y no se listan archivos.
+        """
+        if len(jobs) <= 1:
+            return [self.history.predict(processor_class.__name__) for _, _, processor_class in jobs]
+        return [self.history.predict(job[2].__name__, self._pending_bytes(job)) for job in jobs]
+
+    def _schedule(self, predictions: List[Optional[float]]) -> List[int]:
+        """
+        Orden de ejecución de los trabajos: primero los de mayor duración esperada según
+        el historial, para que un libro grande no quede para el final de la ejecución.
+        Los procesadores sin historial van primero, por no poder descartar que sean largos.
+
+        Args:
+            predictions (List[Optional[float]]): Duración esperada de cada trabajo (_predict)
+
+        Returns:
+            List[int]: Índices de los trabajos en el orden de ejecución
+        """
+        return sorted(
+            range(len(predictions)),
+            key=lambda index: (predictions[index] is not None, -(predictions[index] or 0))
+        )
+
+    def _run_jobs(self, jobs: List[Tuple]) -> List[bool]:
+        """
+        Ejecuta trabajos (folder_name, folder_path, processor_class) en el pool de workers,
+        los más largos primero
+
+        Returns:
+            List[bool]: Resultado de cada trabajo, en el mismo orden de entrada
+        """
+        try:
+            if self.leases:
+                return self._run_sharded_jobs(jobs)
+            return self._run_scheduled_jobs(jobs)
+        finally:
+            # La siguiente ejecución (p. ej. la siguiente revisión del modo vigilancia) vuelve a listar
+            self._listings.clear()
+
+    def _run_scheduled_jobs(self, jobs: List[Tuple]) -> List[bool]:
+        predictions = self._predict(jobs)
+        order = self._schedule(predictions)
+        predicted = sum(prediction or 0 for prediction in predictions)
+        start = time.perf_counter()
+
+        outcomes = [None] * len(jobs)
+        for index, success in zip(order, self._run_ordered_jobs([jobs[index] for index in order])):
+            outcomes[index] = success
+
+        self.history.save()
+        self.logger.info(
+            f"Trabajos completados en {time.perf_counter() - start:.1f}s "
+            f"(suma de duraciones según historial: {predicted:.1f}s)"
+        )
+        return outcomes
+
+    def _run_ordered_jobs(self, jobs: List[Tuple]) -> List[bool]:
+        if self.mode == 'pipeline':
+            pipeline = ETLPipeline(
+                self,
+                queue_size=int(self.config.get('PIPELINE_QUEUE_SIZE', 2)),
+                parse_workers=int(self.config.get('PIPELINE_PARSE_WORKERS', 1))
+            )
+            outcomes = pipeline.run(jobs)
+            self.pipeline_stats = pipeline.get_stats()
+            return outcomes
+
+        if self.max_workers <= 1 or len(jobs) <= 1:
+            return [
+                self._process_with_single_processor(processor_class, folder_path, folder_name)
+                for folder_name, folder_path, processor_class in jobs
+            ]
+
+        self.logger.info(f"Ejecutando {len(jobs)} procesadores con {self.max_workers} workers")
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._process_with_single_processor, processor_class, folder_path, folder_name)
+            for folder_name, folder_path, processor_class in jobs
+        ]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _lease_key(job: Tuple) -> str:
+        folder_name, _, processor_class = job
+        return f"{folder_name}/{processor_class.__name__}"
+
+    def _shard_round_id(self, jobs: List[Tuple]) -> str:
+        """
+        Ronda de leases de una pasada: <SHARD_RUN_ID>.<resumen> de los trabajos y de la versión
+        (nombre, ETag, fecha y tamaño) de los archivos de sus carpetas. Los nodos que ven las
+        mismas carpetas en SharePoint calculan la misma ronda sin importar cuántas pasadas lleve
+        cada uno (modo vigilancia); una carpeta sin cambios vuelve a su ronda anterior, donde
+        solo quedan por tomar los trabajos fallidos.
+        """
+        digest = hashlib.sha1()
+        for key in sorted(self._lease_key(job) for job in jobs):
+            digest.update(f"{key}\n".encode('utf-8'))
+        for folder_path in sorted({folder_path for _, folder_path, _ in jobs}):
+            for name, etag, modified, size in sorted(
+                (f['name'], f.get('etag') or '', str(f.get('modified') or ''), f.get('size') or 0)
+                for f in self._list_files(folder_path)
+            ):
+                digest.update(f"{folder_path}/{name}|{etag}|{modified}|{size}\n".encode('utf-8'))
+        return f"{self.shard_run_id}.{digest.hexdigest()[:12]}"
+
+    def _run_sharded_jobs(self, jobs: List[Tuple]) -> List[bool]:
+        """
+        Ejecuta los trabajos repartidos entre nodos: cada worker toma un lease, procesa el
+        trabajo y lo marca como terminado, hasta que no queden trabajos pendientes ni en curso
+        en ningún nodo (los de nodos caídos se retoman al expirar su lease).
+
+        Returns:
+            List[bool]: Resultado de cada trabajo; None para los procesados por otros nodos
+        """
+        if not jobs:
+            return []
+        if self.mode == 'pipeline':
+            self.logger.info("El modo distribuido procesa cada trabajo por separado, sin pipeline")
+
+        self.leases.run_id = self._shard_round_id(jobs)
+
+        keys = [self._lease_key(job) for job in jobs]
+        index_by_key = {key: index for index, key in enumerate(keys)}
+        # Prioridad según el historial: los trabajos más largos se toman primero
+        order = self._schedule(self._predict(jobs))
+        self.leases.register({keys[index]: len(order) - rank for rank, index in enumerate(order)})
+        self.logger.info(f"Modo distribuido: nodo {self.leases.owner}, ejecución {self.leases.run_id}")
+
+        outcomes = [None] * len(jobs)
+
+        def worker():
+            while True:
+                key = self.leases.claim(keys)
+                if key is None:
+                    if not self.leases.remaining(keys):
+                        return
+                    # Trabajos en curso en otros nodos: esperar por si alguno expira
+                    time.sleep(self.leases.heartbeat_seconds)
+                    continue
+                folder_name, folder_path, processor_class = jobs[index_by_key[key]]
+                success = self._process_with_single_processor(processor_class, folder_path, folder_name)
+                outcomes[index_by_key[key]] = success
+                self.leases.complete(key, success)
+
+        self.leases.start_heartbeat()
+        try:
+            if self.max_workers <= 1:
+                worker()
+            else:
+                executor = self._get_executor()
+                for future in [executor.submit(worker) for _ in range(self.max_workers)]:
+                    future.result()
+        finally:
+            self.leases.stop_heartbeat()
+            self.history.save()
+
+        processed = sum(1 for success in outcomes if success is not None)
+        self.logger.info(f"Nodo {self.leases.owner}: {processed}/{len(jobs)} trabajos procesados aquí")
+        return outcomes
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Pool de workers persistente entre ejecuciones (las sesiones de SharePoint salen de extractor_session)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='etl')
+        return self._executor
+
+    def close(self):
+        """Libera el pool de workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def process_all_folders(self, base_folder: str) -> Dict[str, bool]:
         """Procesa todas las carpetas encontradas"""
-        results = {}
-        
         # Obtener estructura de carpetas
         folder_details = self.extractor.get_folder_details(base_folder)
         if not folder_details:
             self.logger.error("No se pudo obtener la estructura de carpetas")
-            return results
-        
-        # Procesar cada subcarpeta
-        for subfolder in folder_details.subfolders:
-            folder_name = subfolder.name
-            folder_path = subfolder.path
-            
+            return {}
+
+        folders = [(subfolder.name, subfolder.path) for subfolder in folder_details.subfolders]
+        return self.process_folders(folders)
+
+    def process_folders(self, folders: List[Tuple[str, str]]) -> Dict[str, bool]:
+        """
+        Procesa las carpetas indicadas como (folder_name, folder_path)
+
+        Returns:
+            Dict[str, bool]: Resultado por carpeta
+        """
+        results = {}
+
+        # Construir un trabajo por cada procesador de cada subcarpeta
+        jobs = []
+        for folder_name, folder_path in folders:
             self.logger.info(f"Procesando carpeta: {folder_name}")
-            
+
             # Obtener procesador(es) específico(s)
-            processor_classes = ProcessorFactory.get_processor(folder_name)
+            processor_classes = self._get_processor_classes(folder_name)
             if not processor_classes:
                 self.logger.warning(f"No hay procesador para {folder_name}, saltando...")
                 continue
-            
-            # Manejar múltiples procesadores
-            if isinstance(processor_classes, list):
-                folder_success = True
-                for processor_class in processor_classes:
-                    success = self._process_with_single_processor(processor_class, folder_path, folder_name)
-                    if not success:
-                        folder_success = False
-                results[folder_name] = folder_success
-            else:
-                # Procesador único
-                success = self._process_with_single_processor(processor_classes, folder_path, folder_name)
-                results[folder_name] = success
-            
-            if results[folder_name]:
+
+            for processor_class in processor_classes:
+                jobs.append((folder_name, folder_path, processor_class))
+
+        outcomes = self._run_jobs(jobs)
+        self.checkpoints.finish()
+
+        # Consolidar resultados por carpeta
+        for (folder_name, _, _), success in zip(jobs, outcomes):
+            if success is None:
+                # Procesado por otro nodo en modo distribuido
+                continue
+            results[folder_name] = results.get(folder_name, True) and success
+
+        for folder_name, success in results.items():
+            if success:
                 self.logger.info(f"✓ {folder_name} procesado exitosamente")
             else:
                 self.logger.error(f"✗ Error procesando {folder_name}")
-        
+
         return results
-    
+
+    def plan_folders(self, folders: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Simulación (dry-run): lista lo que se descargaría y cargaría sin descargar ni cargar nada
+
+        Returns:
+            List[Dict]: Un elemento por archivo con carpeta, procesador, tabla, bytes y filas estimadas
+        """
+        plan = []
+        for folder_name, folder_path in folders:
+            for processor_class in self._get_processor_classes(folder_name):
+                processor = self._create_processor(processor_class)
+                rows_per_byte = self.manifest.rows_per_byte(processor_class.__name__)
+                for metadata in processor.list_matching_files(folder_path):
+                    size = metadata.get('size')
+                    plan.append({
+                        'folder': folder_name,
+                        'processor': processor_class.__name__,
+                        'table': processor.get_table_name(),
+                        'file': metadata['name'],
+                        'modified': metadata.get('modified'),
+                        'bytes': size,
+                        'estimated_rows': int(size * rows_per_byte) if size and rows_per_byte else None,
+                    })
+        return plan
+
     def _process_with_single_processor(self, processor_class, folder_path: str, folder_name: str) -> bool:
         """Procesa una carpeta con un procesador específico"""
+        with self.extractor_session():
+            return self._run_processor(processor_class, folder_path, folder_name)
+
+    def _run_processor(self, processor_class, folder_path: str, folder_name: str) -> bool:
         try:
             # Crear instancia del procesador
-            processor = processor_class(
-                self.extractor, 
-                self.transformer, 
-                self.loader, 
-                self.logger
-            )
-            
+            processor = self._create_processor(processor_class)
+
             processor_name = processor_class.__name__
+            predicted = self.history.predict(processor_name)
             self.logger.info(f"Ejecutando {processor_name} para {folder_name}")
-            
+
             # Ejecutar proceso ETL
-            success = processor.process_folder(folder_path)
-            
+            start = time.perf_counter()
+            with PROFILER.profile(f"{folder_name}/{processor_name}"), \
+                    TRACER.span('process_folder', folder=folder_name, processor=processor_name, mode=self.mode):
+                if self.mode == 'streaming':
+                    success = processor.process_folder_streaming(folder_path)
+                else:
+                    success = processor.process_folder(folder_path)
+            elapsed = time.perf_counter() - start
+
             if success:
+                self.history.record_job(processor_name, elapsed, processor.files_downloaded,
+                                        processor.bytes_downloaded)
+                predicted_text = f"{predicted:.1f}s" if predicted is not None else "sin historial"
+                self.logger.info(f"{processor_name}: duración {elapsed:.1f}s (predicha: {predicted_text})")
                 self.logger.info(f"✓ {processor_name} completado exitosamente")
             else:
                 self.logger.error(f"✗ Error en {processor_name}")
-                
+
             return success
-            
+
+        except MemoryBudgetExceeded:
+            raise
         except Exception as e:
             self.logger.error(f"Error ejecutando procesador {processor_class.__name__}: {str(e)}")
             return False
-    
+
     def process_single_folder(self, folder_name: str, folder_path: str) -> bool:
         """Procesa una carpeta específica"""
-        processor_classes = ProcessorFactory.get_processor(folder_name)
+        processor_classes = self._get_processor_classes(folder_name)
         if not processor_classes:
             self.logger.error(f"No hay procesador para {folder_name}")
             return False
-        
-        # Manejar múltiples procesadores
-        if isinstance(processor_classes, list):
-            overall_success = True
-            for processor_class in processor_classes:
-                success = self._process_with_single_processor(processor_class, folder_path, folder_name)
-                if not success:
-                    overall_success = False
-            return overall_success
-        else:
-            # Procesador único
-            return self._process_with_single_processor(processor_classes, folder_path, folder_name)
\ No newline at end of file
+
+        jobs = [(folder_name, folder_path, processor_class) for processor_class in processor_classes]
+        outcomes = self._run_jobs(jobs)
+        self.checkpoints.finish()
+        # None: trabajo procesado por otro nodo en modo distribuido
+        return all(success for success in outcomes if success is not None)
@@ -0,0 +1,280 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+import pandas as pd
+from utils.tracing import TRACER, file_id
+
+# Marca de fin de flujo entre etapas
+_END = object()
+
+class StageStats:
+    """Tiempos acumulados de una etapa del pipeline"""
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.wait_input_seconds = 0.0    # esperando trabajo de la etapa anterior
+        self.wait_output_seconds = 0.0   # bloqueado por backpressure de la siguiente
+        self._lock = threading.Lock()
+
+    def add(self, busy: float = 0.0, wait_input: float = 0.0, wait_output: float = 0.0, items: int = 0):
+        with self._lock:
+            self.busy_seconds += busy
+            self.wait_input_seconds += wait_input
+            self.wait_output_seconds += wait_output
+            self.items += items
+
+    def to_dict(self) -> Dict:
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'wait_input_seconds': round(self.wait_input_seconds, 3),
+            'wait_output_seconds': round(self.wait_output_seconds, 3),
+        }
+
+class ETLPipeline:
+    """
+    Ejecuta los procesadores como un pipeline productor/consumidor:
+    descarga -> lectura/transformación -> carga, conectadas por colas acotadas.
+
+    Mientras el archivo N+1 se descarga, el N se transforma y el N-1 se carga.
+    Las colas acotadas aplican backpressure para limitar la memoria en vuelo.
+    """
+    def __init__(self, manager, queue_size: int = 2, parse_workers: int = 1):
+        self.manager = manager
+        self.queue_size = max(1, queue_size)
+        self.parse_workers = max(1, parse_workers)
+        self.logger = logging.getLogger(__name__)
+        self.stats = {name: StageStats(name) for name in ('download', 'transform', 'load')}
+
+    def _put(self, q: queue.Queue, item, stage: StageStats):
+        start = time.perf_counter()
+        q.put(item)
+        stage.add(wait_output=time.perf_counter() - start)
+
+    def _get(self, q: queue.Queue, stage: StageStats):
+        start = time.perf_counter()
+        item = q.get()
+        stage.add(wait_input=time.perf_counter() - start)
+        return item
+
+    def run(self, jobs: List[Tuple]) -> List[bool]:
+        """
+        Ejecuta los trabajos (folder_name, folder_path, processor_class)
+
+        Returns:
+            List[bool]: Resultado de cada trabajo, en el mismo orden de entrada
+        """
+        outcomes = [True] * len(jobs)
+        outcomes_lock = threading.Lock()
+        parse_queue = queue.Queue(maxsize=self.queue_size)
+        load_queue = queue.Queue(maxsize=self.queue_size)
+
+        # Segundos de trabajo efectivo de cada trabajo en las tres etapas (para el historial)
+        job_seconds = [0.0] * len(jobs)
+        # Procesador de cada trabajo, con los archivos y bytes que descargó
+        job_processors = [None] * len(jobs)
+
+        # Un error fatal (p. ej. presupuesto de memoria excedido) detiene la descarga y
+        # las demás etapas solo vacían sus colas hasta el fin de flujo
+        abort = threading.Event()
+        fatal_errors = []
+
+        def fatal(error: Exception):
+            with outcomes_lock:
+                fatal_errors.append(error)
+            abort.set()
+
+        def fail(job_index: int):
+            with outcomes_lock:
+                outcomes[job_index] = False
+
+        def failed(job_index: int) -> bool:
+            with outcomes_lock:
+                return not outcomes[job_index]
+
+        def charge(job_index: int, seconds: float):
+            with outcomes_lock:
+                job_seconds[job_index] += seconds
+
+        def download_stage():
+            stage = self.stats['download']
+            try:
+                # Sesión de SharePoint del pool del manager: el hilo del pipeline dura una ejecución,
+                # la sesión autenticada queda en el pool para la siguiente
+                with self.manager.extractor_session():
+                    for job_index, (folder_name, folder_path, processor_class) in enumerate(jobs):
+                        if abort.is_set():
+                            break
+                        try:
+                            # Creado en este hilo para usar la sesión de SharePoint prestada
+                            processor = self.manager._create_processor(processor_class)
+                            job_processors[job_index] = processor
+                            files_metadata = processor.list_matching_files(folder_path)
+                        except Exception as e:
+                            self.logger.error(f"Error listando archivos de {folder_name}: {str(e)}")
+                            fail(job_index)
+                            continue
+
+                        for metadata in files_metadata:
+                            if abort.is_set():
+                                break
+                            start = time.perf_counter()
+                            file_info = processor.download_file(folder_path, metadata)
+                            busy = time.perf_counter() - start
+                            stage.add(busy=busy, items=1)
+                            charge(job_index, busy)
+                            if file_info is None:
+                                fail(job_index)
+                                continue
+                            self._put(parse_queue, (job_index, processor, file_info), stage)
+            except Exception as e:
+                fatal(e)
+            finally:
+                for _ in range(self.parse_workers):
+                    self._put(parse_queue, _END, stage)
+
+        finished_parsers = [0]
+        finished_lock = threading.Lock()
+
+        def transform_stage():
+            stage = self.stats['transform']
+            try:
+                while True:
+                    item = self._get(parse_queue, stage)
+                    if item is _END:
+                        break
+                    if abort.is_set():
+                        continue
+                    job_index, processor, file_info = item
+                    start = time.perf_counter()
+                    try:
+                        df = processor.transform_file(file_info)
+                    except Exception as e:
+                        fatal(e)
+                        continue
+                    busy = time.perf_counter() - start
+                    stage.add(busy=busy, items=1)
+                    charge(job_index, busy)
+                    source = (file_info['path'], file_info['metadata'])
+                    # Liberar el archivo descargado lo antes posible
+                    del item, file_info
+                    if not df.empty:
+                        self._put(load_queue, (job_index, processor, df, source), stage)
+            finally:
+                with finished_lock:
+                    finished_parsers[0] += 1
+                    last = finished_parsers[0] == self.parse_workers
+                if last:
+                    self._put(load_queue, _END, stage)
+
+        def load_stage():
+            stage = self.stats['load']
+            # Procesadores de refresco completo necesitan todos sus archivos: se cargan al final
+            pending_full_refresh: Dict[int, Tuple] = {}
+            finished = False
+            try:
+                while True:
+                    item = self._get(load_queue, stage)
+                    if item is _END:
+                        finished = True
+                        break
+                    if abort.is_set():
+                        continue
+                    job_index, processor, df, source = item
+
+                    if processor.get_load_strategy() == 'full_refresh':
+                        if failed(job_index):
+                            # Un archivo del trabajo ya falló: no se reemplazará la tabla
+                            pending_full_refresh.pop(job_index, None)
+                            continue
+                        pending = pending_full_refresh.setdefault(job_index, (processor, [], []))
+                        pending[1].append(df)
+                        pending[2].append((source, len(df)))
+                        continue
+
+                    start = time.perf_counter()
+                    try:
+                        with TRACER.files(file_id(*source)):
+                            loaded = processor.load_data(df)
+                    except Exception as e:
+                        fatal(e)
+                        continue
+                    if loaded:
+                        processor.record_loaded(source[0], source[1], len(df))
+                    else:
+                        fail(job_index)
+                    busy = time.perf_counter() - start
+                    stage.add(busy=busy, items=1)
+                    charge(job_index, busy)
+
+                for job_index, (processor, frames, sources) in pending_full_refresh.items():
+                    if abort.is_set():
+                        break
+                    if failed(job_index):
+                        # Reemplazar la tabla sin todos los archivos borraría los datos de los que faltan
+                        self.logger.error(
+                            f"{type(processor).__name__}: no se reemplaza la tabla porque falló la "
+                            f"descarga de alguno de sus archivos"
+                        )
+                        continue
+                    start = time.perf_counter()
+                    df = pd.concat(frames, ignore_index=True)
+                    try:
+                        with TRACER.files(*[file_id(*source) for source, _ in sources]):
+                            loaded = processor.load_data(df)
+                    except Exception as e:
+                        fatal(e)
+                        break
+                    if loaded:
+                        for (folder_path, metadata), rows in sources:
+                            processor.record_loaded(folder_path, metadata, rows)
+                    else:
+                        fail(job_index)
+                    busy = time.perf_counter() - start
+                    stage.add(busy=busy, items=1)
+                    charge(job_index, busy)
+            except Exception as e:
+                fatal(e)
+            finally:
+                # Vaciar la cola hasta el fin de flujo para no bloquear a los transformadores
+                while not finished:
+                    finished = self._get(load_queue, stage) is _END
+
+        threads = [threading.Thread(target=download_stage, name='pipeline-download')]
+        threads += [
+            threading.Thread(target=transform_stage, name=f'pipeline-transform-{i}')
+            for i in range(self.parse_workers)
+        ]
+        threads.append(threading.Thread(target=load_stage, name='pipeline-load'))
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        if fatal_errors:
+            raise fatal_errors[0]
+
+        self.logger.info(f"Pipeline completado en {elapsed:.2f}s")
+        for (_, _, processor_class), success, seconds, processor in zip(jobs, outcomes, job_seconds, job_processors):
+            if success and processor is not None:
+                self.manager.history.record_job(processor_class.__name__, seconds, processor.files_downloaded,
+                                                processor.bytes_downloaded)
+        for stats in self.get_stats():
+            self.logger.info(
+                f"Etapa {stats['stage']}: {stats['items']} elementos, ocupada {stats['busy_seconds']}s, "
+                f"esperando entrada {stats['wait_input_seconds']}s, "
+                f"bloqueada por cola llena {stats['wait_output_seconds']}s"
+            )
+
+        return outcomes
+
+    def get_stats(self) -> List[Dict]:
+        """Tiempos por etapa: ocupada, esperando entrada y bloqueada por backpressure"""
+        return [stage.to_dict() for stage in self.stats.values()]
@@ -2,11 +2,15 @@ import os
 import logging
 from office365.runtime.auth.authentication_context import AuthenticationContext
 from office365.sharepoint.client_context import ClientContext
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 from io import BytesIO
+from utils.metrics import METRICS
 import logging
+import time
 import os
+from utils.log_handlers import lazy
 
 @dataclass
 class FolderInfo:
@@ -18,12 +22,20 @@ class FolderInfo:
     excel_files: List[str] = None
     total_files: int = 0
 
+# Respuestas de SharePoint por limitación de peticiones: se reintentan respetando Retry-After
+THROTTLE_STATUS = (429, 503)
+
 class SharePointExtractor:
-    def __init__(self, site_url, username, password):
+    def __init__(self, site_url, username, password, request_limiter=None, auth='user', max_retries=5):
         self.site_url = site_url
         self.username = username
         self.password = password
         self.ctx = None
+        # Semáforo compartido que limita las peticiones simultáneas a SharePoint
+        self.request_limiter = request_limiter
+        # 'user': usuario y contraseña del tenant | 'none': servidor local sin autenticación (benchmarks.sharepoint_server)
+        self.auth = auth
+        self.max_retries = max_retries
         self.logger = logging.getLogger(__name__)
         self.folder_structure = {}
 
@@ -32,13 +44,26 @@ class SharePointExtractor:
         Método para conectar a SharePoint
         """
         try:
+            if self.auth == 'none':
+                self.ctx = ClientContext(self.site_url).with_access_token(
+                    lambda: {'tokenType': 'Bearer', 'accessToken': 'anonymous'}
+                )
+                web = self.ctx.web
+                self.ctx.load(web)
+                self._execute_query()
+                self.logger.info(f"Conectado sin autenticación a: {web.properties['Title']}")
+                return True
+
             ctx_auth = AuthenticationContext(self.site_url)
             
-            if ctx_auth.acquire_token_for_user(self.username, self.password):
+            with self._limit_requests():
+                token_acquired = ctx_auth.acquire_token_for_user(self.username, self.password)
+
+            if token_acquired:
                 self.ctx = ClientContext(self.site_url, ctx_auth)
                 web = self.ctx.web
                 self.ctx.load(web)
-                self.ctx.execute_query()
+                self._execute_query()
                 self.logger.info("Conexión exitosa a SharePoint")
                 self.logger.info(f"Conectado a sitio: {web.properties['Title']}")
                 return True
@@ -49,6 +74,51 @@ class SharePointExtractor:
             self.logger.error(f"Error al conectar con SharePoint: {str(e)}")
             return False
 
+    def reset_connection(self):
+        """Descarta el contexto actual para forzar una nueva autenticación en la próxima petición"""
+        self.ctx = None
+
+    def _limit_requests(self):
+        """Contexto que respeta el límite global de peticiones simultáneas"""
+        return self.request_limiter if self.request_limiter is not None else nullcontext()
+
+    def _send(self, request):
+        """
+        Ejecuta una petición respetando el límite de peticiones simultáneas; si SharePoint
+        responde 429/503 espera lo indicado en Retry-After (o un backoff exponencial) y reintenta
+
+        Args:
+            request: Función sin argumentos que realiza la petición
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._limit_requests():
+                    return request()
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                status = getattr(response, 'status_code', None)
+                if status not in THROTTLE_STATUS or attempt == self.max_retries:
+                    raise
+                retry_after = response.headers.get('Retry-After') if response is not None else None
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+                METRICS.record('throttled', delay, error=True)
+                self.logger.warning(
+                    f"SharePoint limitó la petición ({status}), reintento {attempt + 1}/{self.max_retries} en {delay}s"
+                )
+                time.sleep(delay)
+
+    def _execute_query(self):
+        """Ejecuta las consultas pendientes del contexto respetando el límite de peticiones"""
+        def execute():
+            # La consulta fallida sale de la cola del contexto: se reencola para el reintento
+            try:
+                self.ctx.execute_query()
+            except Exception:
+                if getattr(self.ctx, 'current_query', None) is not None:
+                    self.ctx.add_query(self.ctx.current_query)
+                raise
+        self._send(execute)
+
     def _get_folder_url(self, folder_path):
         """Construir URL completa de la carpeta según el tipo de sitio"""
         if not folder_path:
@@ -72,7 +142,7 @@ class SharePointExtractor:
             folder = self.ctx.web.get_folder_by_server_relative_url(folder_url)
             subfolders = folder.folders
             self.ctx.load(subfolders)
-            self.ctx.execute_query()
+            self._execute_query()
 
             # Procesar subcarpetas recursivamente
             subfolder_infos = []
@@ -96,15 +166,26 @@ class SharePointExtractor:
         except Exception as e:
                 self.logger.error(f"Error al obtener detalles de la carpeta: {str(e)}")
                 return None
-    def list_files(self, folder_path: str = '') -> List[str]:
+    def _file_metadata(self, file) -> Dict:
+        """Extrae los metadatos relevantes de un archivo de SharePoint"""
+        props = file.properties
+        size = props.get('Length')
+        return {
+            'name': props['Name'],
+            'modified': str(props.get('TimeLastModified')) if props.get('TimeLastModified') else None,
+            'etag': props.get('ETag') or props.get('UniqueId'),
+            'size': int(size) if size is not None else None,
+        }
+
+    def list_files_metadata(self, folder_path: str = '') -> List[Dict]:
         """
-        Lista los archivos en una carpeta específica de SharePoint
+        Lista los archivos de una carpeta con sus metadatos
         
         Args:
             folder_path (str): Ruta de la carpeta en SharePoint
             
         Returns:
-            List[str]: Lista de nombres de archivos
+            List[Dict]: Nombre, fecha de modificación, ETag y tamaño de cada archivo
         """
         try:
             if not self.ctx:
@@ -114,18 +195,21 @@ class SharePointExtractor:
             # Usar el método helper para construir la URL correcta
             folder_url = self._get_folder_url(folder_path)
             self.logger.info(f"Listando archivos en: {folder_url}")
+            start = time.perf_counter()
             
             try:
                 # Obtener la carpeta
                 folder = self.ctx.web.get_folder_by_server_relative_url(folder_url)
                 files = folder.files
                 self.ctx.load(files)
-                self.ctx.execute_query()
+                self._execute_query()
                 
-                file_names = [file.properties['Name'] for file in files]
-                self.logger.info(f"Archivos encontrados: {len(file_names)} - {file_names}")
+                files_metadata = [self._file_metadata(file) for file in files]
+                METRICS.record('list', time.perf_counter() - start, rows_out=len(files_metadata))
+                self.logger.info(f"Archivos encontrados: {len(files_metadata)}")
+                self.logger.debug("Archivos: %s", lazy(lambda: [f['name'] for f in files_metadata]))
                 
-                return file_names
+                return files_metadata
                 
             except Exception as e:
                 self.logger.warning(f"Error accediendo a carpeta {folder_url}: {str(e)}")
@@ -134,16 +218,30 @@ class SharePointExtractor:
                 folder = doc_lib.get_folder_by_server_relative_url(folder_url)
                 files = folder.files
                 self.ctx.load(files)
-                self.ctx.execute_query()
+                self._execute_query()
                 
-                file_names = [file.properties['Name'] for file in files]
-                self.logger.info(f"Archivos encontrados (método alternativo): {len(file_names)} - {file_names}")
+                files_metadata = [self._file_metadata(file) for file in files]
+                METRICS.record('list', time.perf_counter() - start, rows_out=len(files_metadata))
+                self.logger.info(f"Archivos encontrados (método alternativo): {len(files_metadata)}")
+                self.logger.debug("Archivos: %s", lazy(lambda: [f['name'] for f in files_metadata]))
                 
-                return file_names
+                return files_metadata
                 
         except Exception as e:
             self.logger.error(f"Error al listar archivos en {folder_path}: {str(e)}")
             return []
+
+    def list_files(self, folder_path: str = '') -> List[str]:
+        """
+        Lista los archivos en una carpeta específica de SharePoint
+        
+        Args:
+            folder_path (str): Ruta de la carpeta en SharePoint
+            
+        Returns:
+            List[str]: Lista de nombres de archivos
+        """
+        return [file['name'] for file in self.list_files_metadata(folder_path)]
         
     def download_file(self, folder_path: str, file_name: str) -> Optional[BytesIO]:
         """
@@ -166,16 +264,16 @@ class SharePointExtractor:
             file_url = f"{folder_url}/{file_name}"
             
             self.logger.info(f"Descargando archivo: {file_url}")
+            start = time.perf_counter()
             
             try:
                 # Obtener referencia al archivo
                 file_obj = self.ctx.web.get_file_by_server_relative_url(file_url)
                 self.ctx.load(file_obj)
-                self.ctx.execute_query()
+                self._execute_query()
                 
                 # Descargar contenido
-                response = file_obj.read()
-                self.ctx.execute_query()
+                response = self._send(file_obj.read)
                 
                 # Manejar diferentes tipos de respuesta
                 if isinstance(response, bytes):
@@ -193,11 +291,13 @@ class SharePointExtractor:
                     return None
                 
                 file_stream = BytesIO(content_bytes)
+                METRICS.record('download', time.perf_counter() - start, bytes=len(content_bytes))
                 self.logger.info(f"Archivo {file_name} descargado: {len(content_bytes)} bytes")
         
                 return file_stream
                 
             except Exception as e:
+                METRICS.record('download', time.perf_counter() - start, error=True)
                 self.logger.error(f"Error descargando archivo {file_name}: {str(e)}")
                 return None
             
@@ -225,14 +325,14 @@ class SharePointExtractor:
                 folder = self.ctx.web.get_folder_by_server_relative_url(folder_url)
                 sub_folders = folder.folders
                 self.ctx.load(sub_folders)
-                self.ctx.execute_query()
+                self._execute_query()
             except Exception as e:
                 self.logger.warning(f"Error al obtener carpeta: {str(e)}")
                 doc_lib = self.ctx.web.default_document_library()
                 folder = doc_lib.get_folder_by_server_relative_url(folder_url)
                 sub_folders = folder.folders
                 self.ctx.load(sub_folders)
-                self.ctx.execute_query()
+                self._execute_query()
             
             folder_names = []
             for sub_folder in sub_folders:
@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from typing import Dict, Optional
+import importlib.util
+import threading
+import logging
+import time
+
+# Drivers soportados por SQLAlchemy, en orden de preferencia para el modo 'auto'
+DRIVERS = {
+    'mysqldb': ('MySQLdb', 'mysql+mysqldb'),                  # mysqlclient (C)
+    'pymysql': ('pymysql', 'mysql+pymysql'),                  # Python puro
+    'mysqlconnector': ('mysql.connector', 'mysql+mysqlconnector'),
+}
+
+def resolve_driver(driver: str = 'auto') -> str:
+    """
+    Determina el dialecto SQLAlchemy a utilizar
+
+    Args:
+        driver (str): 'auto' o uno de los drivers de DRIVERS
+
+    Returns:
+        str: Prefijo del dialecto (ej. 'mysql+mysqldb')
+    """
+    if driver and driver != 'auto':
+        if driver not in DRIVERS:
+            raise ValueError(f"Driver de base de datos no soportado: {driver}")
+        return DRIVERS[driver][1]
+
+    for module_name, dialect in DRIVERS.values():
+        if importlib.util.find_spec(module_name.split('.')[0]) is not None:
+            return dialect
+
+    # Sin driver instalado: dejar que SQLAlchemy reporte el error al conectar
+    return DRIVERS['pymysql'][1]
+
+class ConnectionPool:
+    """
+    Pool de conexiones compartido por todos los DataLoader del proceso.
+
+    Envuelve un engine SQLAlchemy con QueuePool de tamaño explícito y expone
+    métricas de espera al obtener conexiones y de utilización del pool.
+    """
+    _instances: Dict[tuple, 'ConnectionPool'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, config: Dict):
+        self.logger = logging.getLogger(__name__)
+        self.pool_size = int(config.get('pool_size', 5))
+        self.max_overflow = int(config.get('max_overflow', 5))
+        self.pool_timeout = int(config.get('pool_timeout', 30))
+        self.pool_recycle = int(config.get('pool_recycle', 3600))
+        self.connect_timeout = int(config.get('connect_timeout', 10))
+        self.url = config.get('url') or self._build_url(config)
+
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._in_use = 0
+        self._peak_in_use = 0
+
+        self.engine = self._create_engine()
+
+    @classmethod
+    def shared(cls, config: Dict) -> 'ConnectionPool':
+        """Retorna el pool compartido para la configuración dada, creándolo si no existe"""
+        key = cls._config_key(config)
+        with cls._instances_lock:
+            pool = cls._instances.get(key)
+            if pool is None:
+                pool = cls(config)
+                cls._instances[key] = pool
+            return pool
+
+    @classmethod
+    def dispose_all(cls):
+        """Cierra todos los pools compartidos"""
+        with cls._instances_lock:
+            for pool in cls._instances.values():
+                pool.dispose()
+            cls._instances.clear()
+
+    @staticmethod
+    def _config_key(config: Dict) -> tuple:
+        if config.get('url'):
+            return (config['url'],)
+        return (
+            config.get('driver', 'auto'), config.get('host'), config.get('port'),
+            config.get('user'), config.get('database')
+        )
+
+    def _build_url(self, config: Dict) -> str:
+        dialect = resolve_driver(config.get('driver', 'auto'))
+        return (
+            f"{dialect}://{config['user']}:"
+            f"{config['password']}@"
+            f"{config['host']}:"
+            f"{config['port']}/"
+            f"{config['database']}"
+        )
+
+    def _create_engine(self) -> Engine:
+        """Crea el engine con el pool configurado"""
+        if self.url.startswith('sqlite'):
+            # SQLite no admite los parámetros de QueuePool ni de timeout de MySQL
+            return create_engine(self.url, connect_args={'check_same_thread': False})
+
+        return create_engine(
+            self.url,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=True,
+            connect_args={'connect_timeout': self.connect_timeout}
+        )
+
+    @property
+    def dialect(self) -> str:
+        return self.engine.dialect.name
+
+    def _record_checkout(self, wait: float):
+        with self._stats_lock:
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    def _record_checkin(self):
+        with self._stats_lock:
+            self._in_use -= 1
+
+    @contextmanager
+    def connect(self):
+        """Obtiene una conexión del pool midiendo el tiempo de espera"""
+        start = time.perf_counter()
+        conn = self.engine.connect()
+        self._record_checkout(time.perf_counter() - start)
+        try:
+            yield conn
+        finally:
+            conn.close()
+            self._record_checkin()
+
+    @contextmanager
+    def begin(self):
+        """Obtiene una conexión del pool dentro de una transacción"""
+        with self.connect() as conn:
+            with conn.begin():
+                yield conn
+
+    def test_connection(self) -> bool:
+        """Verifica que la base de datos responde"""
+        try:
+            with self.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            self.logger.error(f"Error probando conexión a base de datos: {str(e)}")
+            return False
+
+    def get_stats(self) -> Dict:
+        """Retorna métricas de espera y utilización del pool"""
+        with self._stats_lock:
+            stats = {
+                'dialect': f"{self.engine.dialect.name}+{self.engine.dialect.driver}",
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'checkouts': self._checkouts,
+                'in_use': self._in_use,
+                'peak_in_use': self._peak_in_use,
+                'avg_checkout_wait_ms': round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'max_checkout_wait_ms': round(self._max_wait * 1000, 3),
+            }
+
+        capacity = self.pool_size + self.max_overflow
+        stats['utilization'] = round(stats['peak_in_use'] / capacity, 3) if capacity else 0.0
+
+        pool = self.engine.pool
+        if hasattr(pool, 'checkedout'):
+            stats['checked_out'] = pool.checkedout()
+            stats['checked_in'] = pool.checkedin()
+            stats['overflow'] = pool.overflow()
+
+        return stats
+
+    def dispose(self):
+        """Libera todas las conexiones del pool"""
+        self.engine.dispose()
+        self.logger.info("Pool de conexiones cerrado")
@@ -1,11 +1,48 @@
-from mysql.connector import connect, Error
-from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError, DBAPIError
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, TypedDict, List, Dict
+from loaders.connection_pool import ConnectionPool
+from loaders.schema_cache import SchemaCache
+from loaders.ddl_generator import build_create_table
+from utils.metrics import METRICS
+from utils.tracing import TRACER
+from utils.helpers import enable_copy_on_write
 import pandas as pd
 import logging
-import pandas as pd
-import logging
+import random
+import time
+
+enable_copy_on_write()
+
+# Errores MySQL reintentables: deadlock (1213) y lock wait timeout (1205)
+RETRYABLE_ERROR_CODES = (1213, 1205)
+
+# Formato de las fechas en la clave: el de str(Timestamp) sin fracciones de segundo
+KEY_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def _key_values(values: pd.Series, as_datetime: bool = False):
+    """
+    Valores de una columna clave para la clave compuesta. Las fechas se llevan a un único
+    formato: la base devuelve datetime.date (MySQL DATE) o texto (SQLite) y el DataFrame
+    nuevo Timestamp, cuyos str() no coinciden.
+    """
+    if as_datetime or pd.api.types.is_datetime64_any_dtype(values):
+        dates = pd.to_datetime(values, errors='coerce')
+        return dates.dt.strftime(KEY_DATETIME_FORMAT).where(dates.notna(), 'NaT')
+    return values
+
+def _composite_key(df: pd.DataFrame, key_columns: List[str], datetime_columns: List[str] = ()) -> pd.Series:
+    """
+    Clave 'v1|v2|...' de cada fila (str() de cada valor, como al unir la fila convertida a texto).
+    Se construye en una sola pasada: sin columnas de texto intermedias ni una Series por fila.
+    Las columnas datetime (y las indicadas en datetime_columns) se formatean con KEY_DATETIME_FORMAT.
+    """
+    columns = [_key_values(df[col], col in datetime_columns) for col in key_columns]
+    return pd.Series(
+        ['|'.join(map(str, row)) for row in zip(*columns)],
+        index=df.index, dtype=object
+    )
 
 class DBConfig(TypedDict):
     host: str
@@ -14,63 +51,63 @@ class DBConfig(TypedDict):
     port: int
     database: str
 
+class LoaderConfig(DBConfig, total=False):
+    driver: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    connect_timeout: int
+    url: str
+    load_workers: int
+    load_chunk_size: int
+    load_max_retries: int
+
 class DataLoader:
-    def __init__(self, config: DBConfig):
-        self.host = config['host']
-        self.port = config['port']
-        self.username = config['user']
-        self.password = config['password']
-        self.database = config['database']
-        self.connection = None
+    def __init__(self, config: LoaderConfig, pool: Optional[ConnectionPool] = None):
+        self.host = config.get('host')
+        self.port = config.get('port')
+        self.username = config.get('user')
+        self.password = config.get('password')
+        self.database = config.get('database')
+        self.pool = None
         self.engine = None
+        self.schema = None
+        self.load_workers = int(config.get('load_workers', 1))
+        self.load_chunk_size = int(config.get('load_chunk_size', 10000))
+        self.load_max_retries = int(config.get('load_max_retries', 3))
+        self.load_stats = []
         self.logger = logging.getLogger(__name__)
+        # Tablas existentes ya revisadas por _check_unique_key
+        self._checked_tables = set()
         
-        self._create_connection()
-        self._create_engine()
+        self._create_engine(config, pool)
 
-    def _create_connection(self):
-        """Crea la conexión MySQL"""
-        try:
-            self.connection = connect(
-                host=self.host,
-                user=self.username,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                autocommit=True
-            )
-            if self.connection.is_connected():
-                self.logger.info("Conexión MySQL creada exitosamente")
-        except Error as e:
-            self.logger.error(f"Error al conectar con MySQL: {str(e)}")
-            self.connection = None
-
-    def _create_engine(self):
-        """Crea el engine"""
+    def _create_engine(self, config: LoaderConfig, pool: Optional[ConnectionPool] = None):
+        """Obtiene el engine del pool compartido"""
         try:
-            connection_string = (
-                f"mysql+pymysql://{self.username}:"
-                f"{self.password}@"
-                f"{self.host}:"
-                f"{self.port}/"
-                f"{self.database}"
-            )
-            
-            self.engine = create_engine(
-                connection_string,
-                pool_pre_ping=True,
-                pool_recycle=3600
-            )
-            
-            # Probar conexión
-            with self.engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-            
-            self.logger.info("Engine SQLAlchemy creado exitosamente")
+            if pool is None:
+                pool = ConnectionPool.shared(config)
+
+            if not pool.test_connection():
+                raise SQLAlchemyError("La base de datos no respondió a SELECT 1")
+
+            self.pool = pool
+            self.engine = pool.engine
+            self.schema = SchemaCache(self.engine)
+            self.logger.info(f"Engine SQLAlchemy disponible ({self.engine.dialect.name}+{self.engine.dialect.driver})")
             
         except Exception as e:
             self.logger.error(f"Error creando engine SQLAlchemy: {str(e)}")
+            self.pool = None
             self.engine = None
+            self.schema = None
+
+    def get_pool_stats(self) -> Dict:
+        """Retorna métricas de espera y utilización del pool de conexiones"""
+        if self.pool is None:
+            return {}
+        return self.pool.get_stats()
 
     def table_exists(self, table_name: str) -> bool:
         """Verifica si una tabla existe"""
@@ -78,13 +115,112 @@ class DataLoader:
             if self.engine is None:
                 return False
             
-            inspector = inspect(self.engine)
-            return table_name in inspector.get_table_names()
+            return self.schema.has_table(table_name)
             
         except Exception as e:
             self.logger.error(f"Error verificando tabla {table_name}: {str(e)}")
             return False
 
+    def execute_ddl(self, statement: str, table_name: str = None) -> bool:
+        """
+        Ejecuta una sentencia DDL e invalida el caché de esquema
+        
+        Args:
+            statement (str): Sentencia DDL
+            table_name (str): Tabla afectada (None invalida todo el caché)
+            
+        Returns:
+            bool: True si fue exitoso
+        """
+        try:
+            with self.pool.begin() as conn:
+                conn.execute(text(statement))
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error ejecutando DDL sobre {table_name or 'el esquema'}: {str(e)}")
+            return False
+            
+        finally:
+            self.schema.invalidate(table_name)
+
+    def ensure_table(self, table_name: str, column_types: Dict[str, str], key_columns: List[str],
+                     partition_column: str = None) -> bool:
+        """
+        Crea la tabla destino con clave única (y particiones) si no existe
+        
+        Args:
+            table_name (str): Nombre de la tabla
+            column_types (Dict[str, str]): Columnas y tipos MySQL declarados por el procesador
+            key_columns (List[str]): Columnas que forman la clave única
+            partition_column (str): Columna para particionar por año (opcional)
+            
+        Returns:
+            bool: True si la tabla existe o fue creada
+        """
+        try:
+            if self.engine is None:
+                return False
+
+            if self.table_exists(table_name):
+                self._check_unique_key(table_name, column_types, key_columns)
+                return True
+
+            if not column_types:
+                # Sin tipos declarados, to_sql crea la tabla infiriendo tipos
+                return True
+
+            if self.engine.dialect.name != 'mysql':
+                self.logger.info(f"DDL MySQL omitido para {table_name} en {self.engine.dialect.name}")
+                return True
+
+            statement = build_create_table(table_name, column_types, key_columns, partition_column)
+            self.logger.info(f"Creando tabla {table_name} con clave única {key_columns}")
+            self.logger.debug(statement)
+            return self.execute_ddl(statement, table_name)
+            
+        except Exception as e:
+            self.logger.error(f"Error creando tabla {table_name}: {str(e)}")
+            return False
+
+    def drop_batch_duplicates(self, table_name: str, df: pd.DataFrame, key_columns: List[str]) -> pd.DataFrame:
+        """
+        Descarta las filas cuya clave se repite dentro del lote (p. ej. filas solapadas entre
+        libros concatenados), conservando la primera: identify_new_records solo compara con la
+        tabla, y con la clave única uk_<tabla> una clave repetida abortaría toda la carga
+
+        Returns:
+            pd.DataFrame: El mismo DataFrame si no hay claves repetidas
+        """
+        duplicated = df.duplicated(subset=key_columns, keep='first')
+        if not duplicated.any():
+            return df
+        self.logger.warning(
+            f"{int(duplicated.sum())} filas con claves repetidas dentro del lote para {table_name}, "
+            f"se conserva la primera de cada clave"
+        )
+        return df[~duplicated.to_numpy()]
+
+    def _check_unique_key(self, table_name: str, column_types: Dict[str, str], key_columns: List[str]):
+        """
+        Avisa (una vez por tabla) si una tabla MySQL creada antes del DDL declarado no tiene
+        la clave única uk_<tabla>: no se migra automáticamente porque fallaría si la tabla
+        ya contiene claves repetidas
+        """
+        if (not column_types or not key_columns or self.engine.dialect.name != 'mysql'
+                or table_name in self._checked_tables):
+            return
+        self._checked_tables.add(table_name)
+        key_name = f"uk_{table_name}"
+        if key_name in self.schema.get_unique_keys(table_name):
+            return
+        key_list = ", ".join(f"`{col}`" for col in key_columns)
+        self.logger.warning(
+            f"La tabla {table_name} no tiene la clave única {key_name} (ni las particiones del DDL declarado): "
+            f"los duplicados solo se evitan comparando claves. Para migrarla, tras eliminar claves repetidas: "
+            f"ALTER TABLE `{table_name}` ADD UNIQUE KEY `{key_name}` ({key_list})"
+        )
+
     def get_existing_data(self, table_name: str, key_columns: List[str] = None) -> Optional[pd.DataFrame]:
         """
         Obtiene datos existentes de una tabla
@@ -108,7 +244,10 @@ class DataLoader:
             else:
                 query = f"SELECT * FROM `{table_name}`"
             
-            existing_data = pd.read_sql(query, self.engine)
+            start = time.perf_counter()
+            with self.pool.connect() as conn:
+                existing_data = pd.read_sql(query, conn)
+            METRICS.record('read_keys', time.perf_counter() - start, rows_out=len(existing_data), table=table_name)
             self.logger.info(f"Datos existentes en {table_name}: {len(existing_data)} filas")
             return existing_data
             
@@ -146,26 +285,15 @@ class DataLoader:
                 self.logger.warning(f"Columnas clave faltantes en datos existentes: {missing_in_existing}")
                 return new_data
             
-            # Crear clave compuesta para comparación
-            new_data_keys = new_data[key_columns].copy()
-            existing_data_keys = existing_data[key_columns].copy()
-            
-            # Convertir a string para comparación
-            new_data_temp = new_data.copy()
-            existing_data_temp = existing_data.copy()
-            
-            new_data_temp['_temp_key'] = new_data_keys.apply(
-                lambda row: '|'.join(row.astype(str)), axis=1
-            )
-            existing_data_temp['_temp_key'] = existing_data_keys.apply(
-                lambda row: '|'.join(row.astype(str)), axis=1
-            )
+            # Clave compuesta por fila, sin copiar los DataFrames: solo se materializan las claves
+            # Las columnas de fecha del DataFrame nuevo se comparan como fecha también en los existentes
+            datetime_columns = [col for col in key_columns
+                                if pd.api.types.is_datetime64_any_dtype(new_data[col])]
+            new_keys = _composite_key(new_data, key_columns)
+            existing_keys = _composite_key(existing_data, key_columns, datetime_columns)
 
-            # Filtrar solo registros nuevos
-            new_records = new_data_temp[~new_data_temp['_temp_key'].isin(existing_data_temp['_temp_key'])].copy()
-            
-            # Eliminar columna temporal
-            new_records = new_records.drop('_temp_key', axis=1)
+            # Filtrar solo registros nuevos (única copia: las filas seleccionadas)
+            new_records = new_data[~new_keys.isin(existing_keys).to_numpy()]
             
             self.logger.info(f"Registros nuevos identificados: {len(new_records)} de {len(new_data)}")
             
@@ -205,34 +333,42 @@ class DataLoader:
             if key_columns is None:
                 return False
             
+            start = time.perf_counter()
             self.logger.info(f"Procesando {len(df)} registros para tabla {table_name}")
-            self.logger.info(f"Columnas clave para duplicados: {key_columns}")
+            self.logger.debug("Columnas clave para duplicados: %s", key_columns)
             
             # Obtener datos existentes
-            existing_data = self.get_existing_data(table_name, key_columns)
+            table_created = not self.table_exists(table_name)
+            existing_data = None if table_created else self.get_existing_data(table_name, key_columns)
             
             # Identificar solo registros nuevos
-            new_records = self.identify_new_records(df, existing_data, key_columns)
+            with TRACER.span('identify_new_records', table=table_name, rows_in=len(df),
+                             existing_rows=len(existing_data) if existing_data is not None else 0) as span:
+                new_records = self.identify_new_records(df, existing_data, key_columns)
+                span.set(rows_out=len(new_records))
+            # Las claves existentes no se necesitan durante la inserción
+            del existing_data
+
+            new_records = self.drop_batch_duplicates(table_name, new_records, key_columns)
             
             if new_records.empty:
                 self.logger.info("No hay registros nuevos para insertar")
+                METRICS.record('load', time.perf_counter() - start, rows_in=len(df), table=table_name)
                 return True
-        
-            #! Debugging output
-            print("---------------------------------------------------------")
-            print(existing_data)
-            print( new_records)
             
             # Insertar solo registros nuevos
-            new_records.to_sql(
-                name=table_name,
-                con=self.engine,
-                if_exists='append',
-                index=False,
-                chunksize=1000,
-                method='multi'
-            )
+            if self.load_workers > 1 and not table_created:
+                if not self.insert_parallel(table_name, new_records, key_columns):
+                    return False
+            else:
+                self._insert_chunk(table_name, new_records)
+
+            if table_created:
+                # to_sql creó la tabla implícitamente
+                self.schema.invalidate(table_name)
             
+            METRICS.record('load', time.perf_counter() - start, rows_in=len(df),
+                           rows_out=len(new_records), table=table_name)
             self.logger.info(f"Insertados {len(new_records)} registros nuevos en {table_name}")
             return True
             
@@ -240,6 +376,196 @@ class DataLoader:
             self.logger.error(f"Error insertando datos nuevos en {table_name}: {str(e)}")
             return False
 
+    def _is_retryable(self, error: Exception) -> bool:
+        """Indica si el error corresponde a un deadlock o lock wait timeout"""
+        if not isinstance(error, DBAPIError) or error.orig is None:
+            return False
+        args = getattr(error.orig, 'args', ())
+        return bool(args) and args[0] in RETRYABLE_ERROR_CODES
+
+    def _insert_chunk(self, table_name: str, chunk: pd.DataFrame) -> int:
+        """
+        Inserta un bloque en su propia transacción, reintentando ante deadlocks
+        
+        Returns:
+            int: Filas insertadas
+        """
+        attempt = 0
+        while True:
+            try:
+                with TRACER.span('to_sql', table=table_name, rows=len(chunk), attempt=attempt + 1), \
+                        self.pool.begin() as conn:
+                    chunk.to_sql(
+                        name=table_name,
+                        con=conn,
+                        if_exists='append',
+                        index=False,
+                        chunksize=1000,
+                        method='multi'
+                    )
+                return len(chunk)
+            except DBAPIError as e:
+                attempt += 1
+                if not self._is_retryable(e) or attempt > self.load_max_retries:
+                    raise
+                wait = 0.1 * (2 ** attempt) + random.uniform(0, 0.1)
+                self.logger.warning(
+                    f"Deadlock insertando bloque en {table_name} "
+                    f"(intento {attempt}/{self.load_max_retries}), reintentando en {wait:.2f}s"
+                )
+                time.sleep(wait)
+
+    def split_by_key(self, df: pd.DataFrame, key_columns: List[str], n_chunks: int) -> List[pd.DataFrame]:
+        """
+        Divide un DataFrame en bloques disjuntos por clave (hash de las columnas clave)
+        
+        Args:
+            df (pd.DataFrame): Datos a dividir
+            key_columns (List[str]): Columnas que forman la clave única
+            n_chunks (int): Número de bloques
+            
+        Returns:
+            List[pd.DataFrame]: Bloques no vacíos
+        """
+        if n_chunks <= 1:
+            return [df]
+        buckets = pd.util.hash_pandas_object(df[key_columns], index=False) % n_chunks
+        return [chunk for _, chunk in df.groupby(buckets.to_numpy(), sort=False)]
+
+    def insert_parallel(self, table_name: str, df: pd.DataFrame, key_columns: List[str],
+                        workers: int = None) -> bool:
+        """
+        Inserta un lote en bloques disjuntos por clave sobre varias conexiones del pool
+        
+        Args:
+            table_name (str): Nombre de la tabla
+            df (pd.DataFrame): Registros nuevos a insertar
+            key_columns (List[str]): Columnas que forman la clave única
+            workers (int): Conexiones concurrentes (por defecto load_workers)
+            
+        Returns:
+            bool: True si todos los bloques se insertaron
+        """
+        workers = workers or self.load_workers
+        capacity = self.pool.pool_size + self.pool.max_overflow
+        workers = max(1, min(workers, capacity))
+        n_chunks = max(workers, -(-len(df) // self.load_chunk_size))
+        chunks = self.split_by_key(df, key_columns, n_chunks)
+
+        start = time.perf_counter()
+        inserted = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='loader') as executor:
+            insert_chunk = TRACER.wrap(self._insert_chunk)
+            futures = [executor.submit(insert_chunk, table_name, chunk) for chunk in chunks]
+            for future in futures:
+                try:
+                    inserted += future.result()
+                except Exception as e:
+                    failed += 1
+                    self.logger.error(f"Error insertando bloque en {table_name}: {str(e)}")
+        elapsed = time.perf_counter() - start
+
+        stats = {
+            'table_name': table_name,
+            'rows': inserted,
+            'chunks': len(chunks),
+            'failed_chunks': failed,
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': round(inserted / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        self.load_stats.append(stats)
+        self.logger.info(
+            f"Carga paralela en {table_name}: {inserted} filas en {len(chunks)} bloques, "
+            f"{workers} conexiones, {stats['rows_per_sec']:.0f} filas/s"
+        )
+        return failed == 0
+
+    def replace_table(self, table_name: str, df: pd.DataFrame, key_columns: List[str],
+                      column_types: Dict[str, str] = None) -> bool:
+        """
+        Refresca completamente una tabla pequeña (dimensión) con intercambio atómico
+        
+        Carga los datos en una tabla sombra y la intercambia con RENAME TABLE, de
+        forma que los lectores nunca ven la tabla vacía o a medio cargar.
+        
+        Args:
+            table_name (str): Nombre de la tabla
+            df (pd.DataFrame): Contenido completo de la tabla
+            key_columns (List[str]): Columnas que forman la clave única
+            column_types (Dict[str, str]): Tipos declarados, usados si la tabla no existe
+            
+        Returns:
+            bool: True si fue exitoso
+        """
+        try:
+            if self.engine is None:
+                self.logger.error("Engine SQLAlchemy no está disponible")
+                return False
+            
+            if df.empty:
+                self.logger.warning(f"DataFrame vacío, se conserva el contenido actual de {table_name}")
+                return True
+
+            if not self.table_exists(table_name):
+                # Sin lectores posibles: crear y cargar directamente
+                if not self.ensure_table(table_name, column_types, key_columns):
+                    return False
+                return self.insert_new_data(table_name, df, key_columns)
+
+            start = time.perf_counter()
+            df = self.drop_batch_duplicates(table_name, df, key_columns)
+            shadow_table = f"{table_name}__shadow"
+            old_table = f"{table_name}__old"
+            is_mysql = self.engine.dialect.name == 'mysql'
+
+            self.execute_ddl(f"DROP TABLE IF EXISTS `{shadow_table}`", shadow_table)
+            self.execute_ddl(f"DROP TABLE IF EXISTS `{old_table}`", old_table)
+
+            if is_mysql:
+                # Conserva tipos, clave única y particiones de la tabla actual
+                if not self.execute_ddl(f"CREATE TABLE `{shadow_table}` LIKE `{table_name}`", shadow_table):
+                    return False
+                self._insert_chunk(shadow_table, df)
+            else:
+                with TRACER.span('to_sql', table=shadow_table, rows=len(df)), self.pool.begin() as conn:
+                    df.to_sql(name=shadow_table, con=conn, if_exists='replace', index=False,
+                              chunksize=1000, method='multi')
+                self.schema.invalidate(shadow_table)
+
+            self.logger.info(f"Tabla sombra {shadow_table} cargada con {len(df)} filas")
+
+            # Intercambio atómico
+            if is_mysql:
+                swapped = self.execute_ddl(
+                    f"RENAME TABLE `{table_name}` TO `{old_table}`, `{shadow_table}` TO `{table_name}`"
+                )
+            else:
+                try:
+                    with self.pool.begin() as conn:
+                        conn.execute(text(f'ALTER TABLE "{table_name}" RENAME TO "{old_table}"'))
+                        conn.execute(text(f'ALTER TABLE "{shadow_table}" RENAME TO "{table_name}"'))
+                    swapped = True
+                except Exception as e:
+                    self.logger.error(f"Error intercambiando {shadow_table} por {table_name}: {str(e)}")
+                    swapped = False
+                finally:
+                    self.schema.invalidate()
+
+            if not swapped:
+                self.execute_ddl(f"DROP TABLE IF EXISTS `{shadow_table}`", shadow_table)
+                return False
+
+            self.execute_ddl(f"DROP TABLE IF EXISTS `{old_table}`", old_table)
+            METRICS.record('load', time.perf_counter() - start, rows_in=len(df), rows_out=len(df), table=table_name)
+            self.logger.info(f"Tabla {table_name} refrescada completamente: {len(df)} filas")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error refrescando tabla {table_name}: {str(e)}")
+            return False
+
     def overwrite_table(self, table_name: str, df: pd.DataFrame, 
                        key_columns: List[str] = None) -> bool:
         """
@@ -256,43 +582,59 @@ class DataLoader:
         # Para tu caso de uso, "overwrite" realmente significa "insertar solo nuevos"
         return self.insert_new_data(table_name, df, key_columns)
 
-    def get_table_info(self, table_name: str) -> Optional[Dict]:
-        """Obtiene información sobre una tabla"""
+    def get_table_info(self, table_name: str, exact: bool = False) -> Optional[Dict]:
+        """
+        Obtiene información sobre una tabla
+        
+        Args:
+            table_name (str): Nombre de la tabla
+            exact (bool): Si es True ejecuta COUNT(*); si no, usa el conteo
+                aproximado de information_schema (sin escanear la tabla)
+            
+        Returns:
+            Dict: Nombre, conteo de filas y columnas de la tabla
+        """
         try:
             if not self.table_exists(table_name):
                 return None
             
-            with self.engine.connect() as conn:
-                result = conn.execute(text(f"SELECT COUNT(*) as count FROM `{table_name}`"))
-                row_count = result.fetchone()[0]
-                
-                inspector = inspect(self.engine)
-                columns = inspector.get_columns(table_name)
+            row_count = None
+            row_count_exact = exact
+            with self.pool.connect() as conn:
+                if not exact and self.engine.dialect.name == 'mysql':
+                    result = conn.execute(
+                        text(
+                            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+                        ),
+                        {'table_name': table_name}
+                    )
+                    row = result.fetchone()
+                    row_count = row[0] if row else None
+
+                if row_count is None:
+                    result = conn.execute(text(f"SELECT COUNT(*) as count FROM `{table_name}`"))
+                    row_count = result.fetchone()[0]
+                    row_count_exact = True
                 
-                return {
-                    'table_name': table_name,
-                    'row_count': row_count,
-                    'columns': [col['name'] for col in columns]
-                }
+            columns = self.schema.get_columns(table_name)
+            
+            return {
+                'table_name': table_name,
+                'row_count': row_count,
+                'row_count_exact': row_count_exact,
+                'columns': [col['name'] for col in columns]
+            }
                 
         except Exception as e:
             self.logger.error(f"Error obteniendo información de tabla {table_name}: {str(e)}")
             return None
 
     def close_connections(self):
-        """Cierra todas las conexiones"""
+        """Cierra el pool de conexiones (compartido con los demás DataLoader)"""
         try:
-            if self.connection and self.connection.is_connected():
-                self.connection.close()
-                self.logger.info("Conexión MySQL cerrada")
-            
-            if self.engine:
-                self.engine.dispose()
-                self.logger.info("Engine SQLAlchemy cerrado")
+            if self.pool:
+                self.pool.dispose()
                 
         except Exception as e:
             self.logger.error(f"Error cerrando conexiones: {str(e)}")
-
-    def __del__(self):
-        """Destructor para cerrar conexiones"""
-        self.close_connections()
\ No newline at end of file
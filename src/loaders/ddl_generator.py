@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_PARTITION_START_YEAR = 2000
+
+# Tipos cuyo valor ya es un año entero y se puede usar directamente en RANGE
+INTEGER_TYPES = ('TINYINT', 'SMALLINT', 'MEDIUMINT', 'INT', 'INTEGER', 'BIGINT', 'YEAR')
+
+def _quote(identifier: str) -> str:
+    return f"`{identifier}`"
+
+def _partition_expression(column: str, column_type: str) -> str:
+    """Expresión de particionado por año según el tipo de la columna"""
+    base_type = column_type.split('(')[0].strip().upper()
+    if base_type in INTEGER_TYPES:
+        return _quote(column)
+    if base_type in ('DATE', 'DATETIME', 'TIMESTAMP'):
+        return f"YEAR({_quote(column)})"
+    raise ValueError(f"No se puede particionar por año la columna {column} de tipo {column_type}")
+
+def build_year_partitions(column: str, column_type: str, start_year: int = None,
+                          end_year: int = None) -> str:
+    """
+    Construye la cláusula PARTITION BY RANGE por año
+
+    Args:
+        column (str): Columna de particionado
+        column_type (str): Tipo MySQL de la columna
+        start_year (int): Primer año con partición propia
+        end_year (int): Último año con partición propia (por defecto el año siguiente al actual)
+
+    Returns:
+        str: Cláusula PARTITION BY RANGE
+    """
+    start_year = start_year or DEFAULT_PARTITION_START_YEAR
+    end_year = end_year or datetime.now().year + 1
+
+    partitions = [
+        f"    PARTITION p{year} VALUES LESS THAN ({year + 1})"
+        for year in range(start_year, end_year + 1)
+    ]
+    # Años anteriores caen en p{start_year}; posteriores en pmax
+    partitions.append("    PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    return (
+        f"PARTITION BY RANGE ({_partition_expression(column, column_type)}) (\n"
+        + ",\n".join(partitions)
+        + "\n)"
+    )
+
+def build_create_table(table_name: str, column_types: Dict[str, str], key_columns: List[str],
+                       partition_column: Optional[str] = None, start_year: int = None,
+                       end_year: int = None) -> str:
+    """
+    Genera el CREATE TABLE de una tabla destino a partir de la metadata del procesador
+
+    Args:
+        table_name (str): Nombre de la tabla
+        column_types (Dict[str, str]): Columnas y tipos MySQL declarados
+        key_columns (List[str]): Columnas de la clave única compuesta
+        partition_column (str): Columna para particionar por año (opcional)
+        start_year (int): Primer año de particionado
+        end_year (int): Último año de particionado
+
+    Returns:
+        str: Sentencia CREATE TABLE IF NOT EXISTS
+    """
+    missing_keys = [col for col in key_columns if col not in column_types]
+    if missing_keys:
+        raise ValueError(f"Columnas clave sin tipo declarado en {table_name}: {missing_keys}")
+
+    if partition_column:
+        if partition_column not in column_types:
+            raise ValueError(f"Columna de partición sin tipo declarado en {table_name}: {partition_column}")
+        # MySQL exige que toda clave única incluya las columnas de partición
+        if partition_column not in key_columns:
+            raise ValueError(f"La columna de partición {partition_column} debe formar parte de la clave de {table_name}")
+
+    definitions = []
+    for column, column_type in column_types.items():
+        nullability = "NOT NULL" if column in key_columns else "NULL"
+        definitions.append(f"    {_quote(column)} {column_type} {nullability}")
+
+    key_list = ", ".join(_quote(col) for col in key_columns)
+    definitions.append(f"    UNIQUE KEY {_quote('uk_' + table_name)} ({key_list})")
+
+    statement = (
+        f"CREATE TABLE IF NOT EXISTS {_quote(table_name)} (\n"
+        + ",\n".join(definitions)
+        + "\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+    )
+
+    if partition_column:
+        statement += "\n" + build_year_partitions(
+            partition_column, column_types[partition_column], start_year, end_year
+        )
+
+    return statement
@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, text
+from typing import Dict, List, Optional
+import threading
+import logging
+import socket
+import uuid
+import os
+from loaders.connection_pool import ConnectionPool
+
+LEASE_TABLE = 'etl_leases'
+
+# Estados de un lease: pendiente, tomado por un nodo, terminado con éxito o con error
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+
+def default_owner() -> str:
+    """Identificador del nodo: host y proceso"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def new_run_id() -> str:
+    """Identificador único de una ejecución distribuida (fecha y hora más sufijo aleatorio)"""
+    return f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+class LeaseManager:
+    """
+    Coordinación de varios nodos ETL mediante filas de lease en la base de datos destino.
+
+    Cada trabajo de una ejecución (run_id) es una fila en etl_leases. Los nodos toman
+    trabajos pendientes con SELECT ... FOR UPDATE SKIP LOCKED (MySQL 8), de modo que dos
+    nodos nunca toman el mismo. Mientras un nodo trabaja renueva sus leases con un
+    heartbeat; si muere, sus leases expiran y otro nodo los retoma. Un trabajo fallido
+    vuelve a poder tomarse hasta completar max_attempts intentos.
+
+    En SQLite (pruebas locales) no existe SKIP LOCKED: la toma se protege con un
+    UPDATE condicional cuyo rowcount indica si el nodo ganó la carrera.
+    """
+    def __init__(self, pool: ConnectionPool, run_id: str, owner: str = None,
+                 ttl_seconds: int = 300, heartbeat_seconds: int = 60, max_attempts: int = 3):
+        self.pool = pool
+        self.run_id = run_id
+        self.owner = owner or default_owner()
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_mysql(self) -> bool:
+        return self.pool.dialect == 'mysql'
+
+    def _now(self, conn) -> datetime:
+        """Hora actual (UTC); en MySQL la del servidor, común a todos los nodos"""
+        if self.is_mysql:
+            return conn.execute(text("SELECT UTC_TIMESTAMP()")).scalar()
+        return datetime.utcnow().replace(microsecond=0)
+
+    @staticmethod
+    def _format(value: datetime) -> str:
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+
+    def ensure_table(self):
+        """Crea la tabla de leases si no existe"""
+        with self.pool.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {LEASE_TABLE} (
+                    run_id VARCHAR(64) NOT NULL,
+                    lease_key VARCHAR(255) NOT NULL,
+                    priority DOUBLE NOT NULL DEFAULT 0,
+                    status VARCHAR(16) NOT NULL,
+                    owner VARCHAR(128) NULL,
+                    attempts INT NOT NULL DEFAULT 0,
+                    expires_at DATETIME NULL,
+                    heartbeat_at DATETIME NULL,
+                    finished_at DATETIME NULL,
+                    PRIMARY KEY (run_id, lease_key)
+                )
+            """))
+
+    def register(self, priorities: Dict[str, float]):
+        """
+        Registra los trabajos de la ejecución; los ya registrados por otro nodo se conservan
+
+        Args:
+            priorities (Dict[str, float]): Clave del trabajo -> prioridad (mayor se toma antes)
+        """
+        self.ensure_table()
+        insert = 'INSERT IGNORE' if self.is_mysql else 'INSERT OR IGNORE'
+        with self.pool.begin() as conn:
+            conn.execute(
+                text(f"{insert} INTO {LEASE_TABLE} (run_id, lease_key, priority, status) "
+                     f"VALUES (:run_id, :lease_key, :priority, '{PENDING}')"),
+                [
+                    {'run_id': self.run_id, 'lease_key': key, 'priority': priority}
+                    for key, priority in priorities.items()
+                ]
+            )
+
+    def claim(self, keys: List[str]) -> Optional[str]:
+        """
+        Toma el trabajo pendiente (con lease expirado, o fallido con intentos restantes) de
+        mayor prioridad entre keys
+
+        Returns:
+            Optional[str]: Clave del trabajo tomado, o None si no hay trabajos disponibles
+        """
+        claimable = (
+            f"(status = '{PENDING}' OR (status = '{RUNNING}' AND expires_at < :now) "
+            f"OR (status = '{FAILED}' AND attempts < :max_attempts))"
+        )
+        select = (
+            f"SELECT lease_key, owner, status FROM {LEASE_TABLE} "
+            f"WHERE run_id = :run_id AND lease_key IN :keys AND {claimable} "
+            f"ORDER BY priority DESC, lease_key LIMIT 1"
+        )
+        if self.is_mysql:
+            select += " FOR UPDATE SKIP LOCKED"
+        select_stmt = text(select).bindparams(bindparam('keys', expanding=True))
+        update_stmt = text(
+            f"UPDATE {LEASE_TABLE} SET status = '{RUNNING}', owner = :owner, attempts = attempts + 1, "
+            f"expires_at = :expires_at, heartbeat_at = :now "
+            f"WHERE run_id = :run_id AND lease_key = :lease_key AND {claimable}"
+        )
+
+        # Reintentar si otro nodo ganó la carrera por el mismo trabajo (solo sin SKIP LOCKED)
+        for _ in range(len(keys)):
+            with self.pool.begin() as conn:
+                now = self._now(conn)
+                row = conn.execute(select_stmt, {
+                    'run_id': self.run_id,
+                    'keys': keys,
+                    'now': self._format(now),
+                    'max_attempts': self.max_attempts,
+                }).first()
+                if row is None:
+                    return None
+
+                result = conn.execute(update_stmt, {
+                    'owner': self.owner,
+                    'expires_at': self._format(now + self.ttl),
+                    'now': self._format(now),
+                    'max_attempts': self.max_attempts,
+                    'run_id': self.run_id,
+                    'lease_key': row.lease_key,
+                })
+                if result.rowcount == 1:
+                    if row.status == FAILED:
+                        self.logger.warning(f"Lease {row.lease_key} fallido en {row.owner}, se reintenta")
+                    elif row.owner and row.owner != self.owner:
+                        self.logger.warning(f"Lease {row.lease_key} expirado de {row.owner}, se retoma")
+                    return row.lease_key
+        return None
+
+    def complete(self, key: str, success: bool):
+        """Marca el trabajo como terminado; si el lease expiró y otro nodo lo tomó, solo avisa"""
+        with self.pool.begin() as conn:
+            now = self._now(conn)
+            result = conn.execute(
+                text(f"UPDATE {LEASE_TABLE} SET status = :status, finished_at = :now, expires_at = NULL "
+                     f"WHERE run_id = :run_id AND lease_key = :lease_key AND owner = :owner "
+                     f"AND status = '{RUNNING}'"),
+                {
+                    'status': DONE if success else FAILED,
+                    'now': self._format(now),
+                    'run_id': self.run_id,
+                    'lease_key': key,
+                    'owner': self.owner,
+                }
+            )
+        if result.rowcount != 1:
+            self.logger.warning(f"El lease {key} ya no pertenecía a {self.owner} al terminar")
+
+    def remaining(self, keys: List[str]) -> int:
+        """Trabajos de keys aún pendientes, en curso en algún nodo o fallidos con intentos restantes"""
+        with self.pool.connect() as conn:
+            return conn.execute(
+                text(f"SELECT COUNT(*) FROM {LEASE_TABLE} WHERE run_id = :run_id "
+                     f"AND lease_key IN :keys AND (status IN ('{PENDING}', '{RUNNING}') "
+                     f"OR (status = '{FAILED}' AND attempts < :max_attempts))")
+                .bindparams(bindparam('keys', expanding=True)),
+                {'run_id': self.run_id, 'keys': keys, 'max_attempts': self.max_attempts}
+            ).scalar()
+
+    def heartbeat(self) -> int:
+        """Renueva los leases en curso de este nodo; retorna cuántos se renovaron"""
+        with self.pool.begin() as conn:
+            now = self._now(conn)
+            result = conn.execute(
+                text(f"UPDATE {LEASE_TABLE} SET expires_at = :expires_at, heartbeat_at = :now "
+                     f"WHERE run_id = :run_id AND owner = :owner AND status = '{RUNNING}'"),
+                {
+                    'expires_at': self._format(now + self.ttl),
+                    'now': self._format(now),
+                    'run_id': self.run_id,
+                    'owner': self.owner,
+                }
+            )
+        return result.rowcount
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                self.logger.error(f"Error renovando leases de {self.owner}: {str(e)}")
+
+    def start_heartbeat(self):
+        """Inicia la renovación periódica de leases en segundo plano"""
+        if self._heartbeat_thread is None:
+            self._stop.clear()
+            self._heartbeat_thread = threading.Thread(
+                target=self._heartbeat_loop, name='lease-heartbeat', daemon=True
+            )
+            self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        """Detiene la renovación de leases"""
+        if self._heartbeat_thread is not None:
+            self._stop.set()
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
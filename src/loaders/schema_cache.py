@@ -0,0 +1,64 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from typing import Dict, List, Optional, Set
+import threading
+import logging
+
+class SchemaCache:
+    """
+    Caché de metadatos del esquema de la base de datos.
+
+    Refleja la lista de tablas una sola vez por ejecución y las columnas de cada
+    tabla bajo demanda. Debe invalidarse después de cualquier DDL.
+    """
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._tables: Optional[Set[str]] = None
+        self._columns: Dict[str, List[Dict]] = {}
+        self._unique_keys: Dict[str, Set[str]] = {}
+
+    def _load_tables(self) -> Set[str]:
+        if self._tables is None:
+            self._tables = set(inspect(self.engine).get_table_names())
+            self.logger.debug(f"Esquema reflejado: {len(self._tables)} tablas")
+        return self._tables
+
+    def has_table(self, table_name: str) -> bool:
+        """Indica si la tabla existe según el caché"""
+        with self._lock:
+            return table_name in self._load_tables()
+
+    def get_columns(self, table_name: str) -> List[Dict]:
+        """Retorna las columnas reflejadas de la tabla"""
+        with self._lock:
+            if table_name not in self._columns:
+                self._columns[table_name] = inspect(self.engine).get_columns(table_name)
+            return self._columns[table_name]
+
+    def get_unique_keys(self, table_name: str) -> Set[str]:
+        """Retorna los nombres de las claves e índices únicos de la tabla"""
+        with self._lock:
+            if table_name not in self._unique_keys:
+                inspector = inspect(self.engine)
+                names = {index['name'] for index in inspector.get_indexes(table_name) if index.get('unique')}
+                names.update(constraint['name'] for constraint in inspector.get_unique_constraints(table_name))
+                self._unique_keys[table_name] = {name for name in names if name}
+            return self._unique_keys[table_name]
+
+    def invalidate(self, table_name: str = None):
+        """
+        Invalida el caché después de un cambio de esquema
+
+        Args:
+            table_name (str): Tabla afectada; None invalida todo el caché
+        """
+        with self._lock:
+            self._tables = None
+            if table_name is None:
+                self._columns.clear()
+                self._unique_keys.clear()
+            else:
+                self._columns.pop(table_name, None)
+                self._unique_keys.pop(table_name, None)
@@ -1,14 +1,184 @@
 import sys
+import os
+import argparse
 from utils.helpers import setup_logging, validate_config, log_etl_step
-from etl_manager import ETLManager
+from utils.memory_profiler import MEMORY, MemoryBudgetExceeded
+from utils.cpu_profiler import PROFILER
+from utils.tracing import TRACER
 from config.settings import *
 
-def main():
+# Los módulos con dependencias pesadas (pandas, SQLAlchemy, office365) se importan
+# dentro de main() para que --list y --validate arranquen sin cargarlas
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Argumentos de línea de comandos del ETL"""
+    parser = argparse.ArgumentParser(description="ETL de archivos Excel de SharePoint a MySQL")
+    parser.add_argument(
+        '--list', action='store_true',
+        help="Lista las carpetas y procesadores registrados y termina"
+    )
+    parser.add_argument(
+        '--validate', action='store_true',
+        help="Valida la configuración y el registro de procesadores y termina"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="Reprocesa todos los archivos aunque el manifiesto indique que no cambiaron"
+    )
+    parser.add_argument(
+        '--run-id',
+        help="Ejecución cuyos checkpoints se retoman (por defecto la última incompleta)"
+    )
+    parser.add_argument(
+        '--no-resume', action='store_true',
+        help="Descarta los checkpoints de ejecuciones fallidas y empieza desde cero"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="Modo vigilancia: mantiene las conexiones abiertas y procesa las carpetas que cambian"
+    )
+    parser.add_argument(
+        '--once', action='store_true',
+        help="Realiza una sola pasada de puesta al día del modo vigilancia y termina"
+    )
+    parser.add_argument(
+        '--interval', type=int, default=WATCH_INTERVAL_SECONDS,
+        help="Segundos entre revisiones en modo vigilancia"
+    )
+    parser.add_argument(
+        '--shard', action='store_true',
+        help="Modo distribuido: reparte los trabajos con otros nodos mediante leases en la base de datos"
+    )
+    parser.add_argument(
+        '--shard-run-id',
+        help="Identificador de la ejecución distribuida, común a todos los nodos (por defecto uno nuevo por invocación)"
+    )
+    parser.add_argument(
+        '--memory-profile', action='store_true',
+        help="Registra RSS y tracemalloc por etapa de cada procesador en el reporte de la ejecución"
+    )
+    parser.add_argument(
+        '--memory-budget', type=int, default=MEMORY_BUDGET_MB,
+        help="Detiene la ejecución si la memoria residente supera estos MB (0: sin límite)"
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Perfila cada procesador con cProfile y muestreo de pila (.pstats y .collapsed por trabajo)"
+    )
+    parser.add_argument(
+        '--trace', action='store_true',
+        help="Registra spans por etapa y archivo en TRACING_PATH/<run_id>.jsonl"
+    )
+    parser.add_argument(
+        '--folder', action='append', default=[],
+        help="Procesa solo esta subcarpeta de SharePoint (puede repetirse)"
+    )
+    parser.add_argument(
+        '--processor', action='append', default=[],
+        help="Ejecuta solo este procesador, por nombre de clase (puede repetirse)"
+    )
+    parser.add_argument(
+        '--file', action='append', default=[], dest='files',
+        help="Procesa solo los archivos cuyo nombre coincide con el patrón glob (puede repetirse)"
+    )
+    parser.add_argument(
+        '--modified-since', type=_parse_date,
+        help="Procesa solo los archivos modificados desde esta fecha (ISO, p. ej. 2024-01-31)"
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help="Muestra qué archivos se descargarían y cargarían, sin descargar ni cargar nada"
+    )
+    return parser.parse_args(argv)
+
+def _parse_date(value: str):
+    from utils.file_filter import parse_datetime
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"fecha inválida: {value}")
+    return parsed
+
+def write_metrics(etl_manager, results, logger, run_id=None):
+    """
+    Guarda el reporte JSON de la ejecución y las métricas para node_exporter
+
+    Args:
+        run_id (str): Identificador en el historial de rendimiento (por defecto, el de la invocación)
+    """
+    from utils.metrics import METRICS
+    from utils.validation import VALIDATION
+    report = METRICS.build_report(
+        mode=etl_manager.mode,
+        results=results,
+        pool=etl_manager.loader.get_pool_stats(),
+        pipeline=etl_manager.pipeline_stats,
+        parallel_loads=etl_manager.loader.load_stats,
+        memory=MEMORY.get_report(),
+        profile=PROFILER.get_report(),
+        trace=TRACER.path if TRACER.enabled else None,
+        validation=VALIDATION.get_report(),
+    )
+    for stage in report['stages']:
+        logger.info(f"Métricas de etapa: {stage}")
+    if PERF_HISTORY_PATH:
+        from utils.perf_history import PerfHistory
+        history = PerfHistory(
+            PERF_HISTORY_PATH, PERF_HISTORY_WINDOW, PERF_REGRESSION_PERCENTILE,
+            PERF_REGRESSION_MIN_RUNS, PERF_REGRESSION_MIN_SECONDS
+        )
+        try:
+            report['regressions'] = history.record(run_id or etl_manager.run_id, report)
+        except Exception as e:
+            logger.error(f"Error actualizando el historial de rendimiento: {str(e)}")
+    try:
+        if METRICS_REPORT_PATH:
+            METRICS.write_report(METRICS_REPORT_PATH, report)
+        if METRICS_TEXTFILE_PATH:
+            METRICS.write_textfile(METRICS_TEXTFILE_PATH, report)
+    except Exception as e:
+        logger.error(f"Error guardando métricas: {str(e)}")
+
+def reset_metrics(etl_manager):
+    """Reinicia las métricas acumuladas, para que cada reporte cubra solo su revisión"""
+    from utils.metrics import METRICS
+    from utils.validation import VALIDATION
+    METRICS.reset()
+    MEMORY.reset()
+    PROFILER.reset()
+    VALIDATION.reset()
+    etl_manager.pipeline_stats = []
+    etl_manager.loader.load_stats.clear()
+
+def print_plan(plan):
+    """Imprime el plan de una simulación (--dry-run)"""
+    for item in plan:
+        rows = item['estimated_rows'] if item['estimated_rows'] is not None else '?'
+        print(
+            f"{item['folder']} | {item['processor']} -> {item['table']} | {item['file']} "
+            f"| {item['bytes'] or 0} bytes | ~{rows} filas"
+        )
+    total_bytes = sum(item['bytes'] or 0 for item in plan)
+    total_rows = sum(item['estimated_rows'] or 0 for item in plan)
+    print(f"Total: {len(plan)} archivos, {total_bytes} bytes, ~{total_rows} filas estimadas")
+
+def main(args: argparse.Namespace = None):
     """
     Función principal del ETL para extraer, transformar y cargar datos de SharePoint
     """
+    args = args or parse_args([])
+
+    if args.list:
+        from processors import ProcessorFactory
+        for folder, paths in ProcessorFactory.list_processors().items():
+            print(folder)
+            for path in paths:
+                print(f"  {path}")
+        return True
+
     # Configurar logging
-    logger = setup_logging(LOGGING_LEVEL, LOGGING_FILE)
+    logger = setup_logging(
+        LOGGING_LEVEL, LOGGING_FILE, LOGGING_FORMAT, LOGGING_RATE_LIMIT_BURST, LOGGING_RATE_LIMIT_SECONDS
+    )
     
     try:
         # Validar configuración
@@ -16,32 +186,146 @@ def main():
             'SHAREPOINT_SITE_URL': SHAREPOINT_SITE_URL,
             'SHAREPOINT_USERNAME': SHAREPOINT_USERNAME,
             'SHAREPOINT_PASSWORD': SHAREPOINT_PASSWORD,
+            'SHAREPOINT_MAX_CONCURRENT_REQUESTS': SHAREPOINT_MAX_CONCURRENT_REQUESTS,
+            'SHAREPOINT_MAX_RETRIES': SHAREPOINT_MAX_RETRIES,
+            'SHAREPOINT_AUTH': SHAREPOINT_AUTH,
+            'ETL_MAX_WORKERS': ETL_MAX_WORKERS,
+            'ETL_MODE': ETL_MODE,
+            'PIPELINE_QUEUE_SIZE': PIPELINE_QUEUE_SIZE,
+            'PIPELINE_PARSE_WORKERS': PIPELINE_PARSE_WORKERS,
+            'ETL_SHARDED': args.shard or ETL_SHARDED,
+            'SHARD_RUN_ID': args.shard_run_id or SHARD_RUN_ID,
+            'LEASE_TTL_SECONDS': LEASE_TTL_SECONDS,
+            'LEASE_HEARTBEAT_SECONDS': LEASE_HEARTBEAT_SECONDS,
+            'LEASE_MAX_ATTEMPTS': LEASE_MAX_ATTEMPTS,
+            'MANIFEST_PATH': MANIFEST_PATH,
+            'FORCE': args.force,
+            'CHECKPOINT_PATH': CHECKPOINT_PATH,
+            'JOB_HISTORY_PATH': JOB_HISTORY_PATH,
+            'RUN_ID': args.run_id,
+            'RESUME': not args.no_resume,
+            'PROCESSOR_NAMES': args.processor,
+            'FILE_GLOBS': args.files,
+            'MODIFIED_SINCE': args.modified_since,
             'DATABASE_CONFIG': {
                 'host': DATABASE_HOST,
                 'database': DATABASE_NAME,
                 'port': DATABASE_PORT,
                 'user': DATABASE_USER,
-                'password': DATABASE_PASSWORD
+                'password': DATABASE_PASSWORD,
+                'driver': DATABASE_DRIVER,
+                'pool_size': DATABASE_POOL_SIZE,
+                'max_overflow': DATABASE_MAX_OVERFLOW,
+                'pool_timeout': DATABASE_POOL_TIMEOUT,
+                'pool_recycle': DATABASE_POOL_RECYCLE,
+                'connect_timeout': DATABASE_CONNECT_TIMEOUT,
+                'url': DATABASE_URL_OVERRIDE,
+                'load_workers': LOAD_WORKERS,
+                'load_chunk_size': LOAD_CHUNK_SIZE,
+                'load_max_retries': LOAD_MAX_RETRIES
             }
         }
         
         if not validate_config(config):
             return False
+
+        if args.validate:
+            from processors import ProcessorFactory
+            errors = ProcessorFactory.validate()
+            for error in errors:
+                logger.error(error)
+            if not errors:
+                logger.info("Configuración y registro de procesadores válidos")
+            return not errors
         
+        MEMORY.configure(
+            enabled=args.memory_profile or MEMORY_PROFILE,
+            budget_mb=args.memory_budget,
+            top=MEMORY_PROFILE_TOP
+        )
+
+        from etl_manager import ETLManager
         etl_manager = ETLManager(config)
-        results = etl_manager.process_all_folders(SHAREPOINT_BASE_FOLDER)
+        # Perfiles, trazas y cuarentena se guardan por invocación
+        PROFILER.configure(
+            enabled=args.profile or CPU_PROFILE,
+            output_dir=os.path.join(CPU_PROFILE_PATH, etl_manager.run_id),
+            top=CPU_PROFILE_TOP,
+            interval_ms=CPU_PROFILE_INTERVAL_MS,
+            # cProfile perfila todo el proceso (Python 3.12+): solo con un trabajo a la vez
+            deterministic=etl_manager.max_workers <= 1
+        )
+        TRACER.configure(
+            enabled=args.trace or TRACING_ENABLED,
+            path=os.path.join(TRACING_PATH, f"{etl_manager.run_id}.jsonl"),
+            run_id=etl_manager.run_id,
+            otel=TRACING_OTEL
+        )
+        from utils.validation import VALIDATION
+        VALIDATION.configure(
+            quarantine_dir=os.path.join(VALIDATION_QUARANTINE_PATH, etl_manager.run_id),
+            sample_size=VALIDATION_QUARANTINE_SAMPLE
+        )
+
+        if args.watch or args.once:
+            from watcher import FolderWatcher
+            polls = [0]
+
+            def report_poll(results):
+                # Reporte, textfile e historial de rendimiento por revisión: el proceso no termina
+                polls[0] += 1
+                write_metrics(etl_manager, results, logger, run_id=f"{etl_manager.run_id}.{polls[0]}")
+                reset_metrics(etl_manager)
+
+            watcher = FolderWatcher(etl_manager, SHAREPOINT_BASE_FOLDER, args.interval, on_poll=report_poll)
+            watcher.run(once=args.once)
+            etl_manager.close()
+            TRACER.close()
+            return True
+
+        folders = [
+            (folder, f"{SHAREPOINT_BASE_FOLDER}/{folder}" if SHAREPOINT_BASE_FOLDER else folder)
+            for folder in args.folder
+        ]
+
+        if args.dry_run:
+            if not folders:
+                folder_details = etl_manager.extractor.get_folder_details(SHAREPOINT_BASE_FOLDER)
+                folders = [(sub.name, sub.path) for sub in folder_details.subfolders] if folder_details else []
+            print_plan(etl_manager.plan_folders(folders))
+            etl_manager.close()
+            TRACER.close()
+            return True
+
+        if folders:
+            results = etl_manager.process_folders(folders)
+        else:
+            results = etl_manager.process_all_folders(SHAREPOINT_BASE_FOLDER)
+        etl_manager.close()
+        TRACER.close()
 
 
         successful = sum(1 for success in results.values() if success)
         total = len(results)
         
         logger.info(f"Procesamiento completado: {successful}/{total} carpetas exitosas")
-        
-
-        
+        logger.info(f"Pool de conexiones: {etl_manager.loader.get_pool_stats()}")
+        for stats in etl_manager.pipeline_stats:
+            logger.info(f"Etapa del pipeline: {stats}")
+        for stats in etl_manager.loader.load_stats:
+            logger.info(f"Carga paralela: {stats}")
+        write_metrics(etl_manager, results, logger)
 
         return True
         
+    except MemoryBudgetExceeded as e:
+        log_etl_step("ETL_PROCESS", "ERROR", str(e))
+        logger.critical(str(e))
+        etl_manager.close()
+        TRACER.close()
+        write_metrics(etl_manager, {}, logger)
+        return False
+
     except Exception as e:
         log_etl_step("ETL_PROCESS", "ERROR", f"Error general: {str(e)}")
         logger.error(f"Error en el proceso ETL: {str(e)}", exc_info=True)
@@ -52,7 +336,7 @@ if __name__ == "__main__":
     # test_connections()
     
     # Ejecutar ETL principal
-    success = main()
+    success = main(parse_args())
     
     if success:
         print("ETL completado exitosamente. Revisar logs para detalles.")
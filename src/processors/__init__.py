@@ -1,20 +1,101 @@
-from .comercio_bienes_exportaciones_processor import ComercioBienesExportacionesProcessor
-from .comercio_servicios_processor import ComercioServiciosProcessor
-from .inversion_ied_pais_origen import IedPaisOrigenProcessor
-from .inversion_idce_pais_destino import IdcePaisDestinoProcessor
-from .turismo_processor_salida_colombianos import TurismoSalidaColombianosProcessor
-from .turismo_processor_visitantes_pais import TurismoVisitantesPaisProcessor
-from .pais_acuerdos import PaisAcuerdosProcessor
+from importlib import import_module
+from importlib.metadata import entry_points
+from importlib.util import find_spec
+from typing import Dict, List, Optional
+import logging
+import threading
+
+# Grupo de entry points para registrar procesadores desde paquetes externos:
+#   [project.entry-points."etl_sharepoint.processors"]
+#   "5-Mi-Carpeta" = "mi_paquete.mi_modulo:MiProcessor"
+ENTRY_POINT_GROUP = 'etl_sharepoint.processors'
+
+# Carpeta de SharePoint -> rutas 'modulo:Clase' de sus procesadores (se importan al primer uso)
+PROCESSOR_REGISTRY: Dict[str, List[str]] = {
+    # '1-Comercio-Bienes': ['processors.comercio_bienes_exportaciones_processor:ComercioBienesExportacionesProcessor'],
+    '2-Comercio-Servicios': ['processors.comercio_servicios_processor:ComercioServiciosProcessor'],
+    '3-Inversion': [
+        'processors.inversion_ied_pais_origen:IedPaisOrigenProcessor',
+        'processors.inversion_idce_pais_destino:IdcePaisDestinoProcessor',
+    ],
+    '4-Turismo': [
+        'processors.turismo_processor_salida_colombianos:TurismoSalidaColombianosProcessor',
+        'processors.turismo_processor_visitantes_pais:TurismoVisitantesPaisProcessor',
+    ],
+    'Ajustes': ['processors.pais_acuerdos:PaisAcuerdosProcessor'],
+}
+
+# Acceso por nombre de clase (from processors import PaisAcuerdosProcessor) sin importar todo el paquete
+_CLASS_PATHS = {
+    'ComercioBienesExportacionesProcessor': 'processors.comercio_bienes_exportaciones_processor:ComercioBienesExportacionesProcessor',
+    'ComercioServiciosProcessor': 'processors.comercio_servicios_processor:ComercioServiciosProcessor',
+    'IedPaisOrigenProcessor': 'processors.inversion_ied_pais_origen:IedPaisOrigenProcessor',
+    'IdcePaisDestinoProcessor': 'processors.inversion_idce_pais_destino:IdcePaisDestinoProcessor',
+    'TurismoSalidaColombianosProcessor': 'processors.turismo_processor_salida_colombianos:TurismoSalidaColombianosProcessor',
+    'TurismoVisitantesPaisProcessor': 'processors.turismo_processor_visitantes_pais:TurismoVisitantesPaisProcessor',
+    'PaisAcuerdosProcessor': 'processors.pais_acuerdos:PaisAcuerdosProcessor',
+}
+
+def load_class(path: str):
+    """Importa una clase a partir de su ruta 'modulo:Clase'"""
+    module_name, class_name = path.split(':')
+    return getattr(import_module(module_name), class_name)
+
+def __getattr__(name: str):
+    if name in _CLASS_PATHS:
+        return load_class(_CLASS_PATHS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class ProcessorFactory:
-    @staticmethod
-    def get_processor(folder_name: str):
-        processors = {
-            # '1-Comercio-Bienes': [ComercioBienesExportacionesProcessor],
-            '2-Comercio-Servicios': [ComercioServiciosProcessor],
-            '3-Inversion': [IedPaisOrigenProcessor, IdcePaisDestinoProcessor],
-            '4-Turismo': [TurismoSalidaColombianosProcessor,TurismoVisitantesPaisProcessor],
-            'Ajustes': [PaisAcuerdosProcessor],
-        }
-
-        return processors.get(folder_name, None)
\ No newline at end of file
+    _registry: Optional[Dict[str, List[str]]] = None
+    _cache: Dict[str, List] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_registry(cls) -> Dict[str, List[str]]:
+        """Registro interno más los procesadores de otros paquetes (entry points), construido una vez"""
+        if cls._registry is None:
+            registry = {folder: list(paths) for folder, paths in PROCESSOR_REGISTRY.items()}
+            try:
+                for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                    registry.setdefault(entry_point.name, []).append(entry_point.value)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Error descubriendo plugins de procesadores: {str(e)}")
+            cls._registry = registry
+        return cls._registry
+
+    @classmethod
+    def list_processors(cls) -> Dict[str, List[str]]:
+        """Carpeta -> rutas de sus procesadores, sin importar ningún módulo"""
+        return {folder: list(paths) for folder, paths in cls._get_registry().items()}
+
+    @classmethod
+    def validate(cls) -> List[str]:
+        """
+        Verifica que los módulos registrados existan, sin ejecutarlos
+
+        Returns:
+            List[str]: Errores encontrados (vacía si todo es válido)
+        """
+        errors = []
+        for folder, paths in cls.list_processors().items():
+            for path in paths:
+                module_name = path.split(':')[0]
+                try:
+                    found = find_spec(module_name) is not None
+                except (ImportError, ValueError):
+                    found = False
+                if ':' not in path or not found:
+                    errors.append(f"{folder}: no se encontró el procesador {path}")
+        return errors
+
+    @classmethod
+    def get_processor(cls, folder_name: str) -> Optional[List]:
+        paths = cls._get_registry().get(folder_name)
+        if not paths:
+            return None
+
+        with cls._lock:
+            if folder_name not in cls._cache:
+                cls._cache[folder_name] = [load_class(path) for path in paths]
+            return cls._cache[folder_name]
@@ -1,13 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from utils.metrics import METRICS, processor_metrics
+from utils.memory_profiler import MEMORY, MemoryBudgetExceeded
+from utils.tracing import TRACER, file_id
+from utils.helpers import enable_copy_on_write
+from utils.validation import VALIDATION, Rule
 import pandas as pd
+import time
+
+# Copy-on-write también en pandas < 3 (ver enable_copy_on_write)
+enable_copy_on_write()
 
 class BaseProcessor(ABC):
-    def __init__(self, extractor, transformer, loader, logger):
+    def __init__(self, extractor, transformer, loader, logger, manifest=None, checkpoint=None,
+                 file_filter=None, history=None, listings=None):
         self.extractor = extractor
         self.transformer = transformer
         self.loader = loader
         self.logger = logger
+        # Manifiesto de ejecuciones anteriores (opcional) para omitir archivos sin cambios
+        self.manifest = manifest
+        # Checkpoint de etapas (opcional) para retomar una ejecución fallida
+        self.checkpoint = checkpoint
+        # Filtro adicional por nombre (glob) y fecha de modificación (opcional)
+        self.file_filter = file_filter
+        # Historial de duraciones por archivo y etapa (opcional)
+        self.history = history
+        # Listados de carpetas ya obtenidos en esta ejecución: folder_path -> metadatos (opcional)
+        self.listings = listings
+        # Archivos y bytes descargados por esta instancia (un trabajo sin archivos no entra en el historial)
+        self.files_downloaded = 0
+        self.bytes_downloaded = 0
         
     @abstractmethod
     def get_table_name(self) -> str:
@@ -31,105 +54,327 @@ class BaseProcessor(ABC):
     
     @abstractmethod
     def transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Transformaciones específicas del tipo de datos"""
+        """
+        Transformaciones específicas del tipo de datos
+
+        No debe modificar df: con copy-on-write basta partir de df.copy(deep=False), que
+        comparte los datos y solo copia las columnas que se reasignan
+        """
         pass
     
+    def get_column_types(self) -> Dict[str, str]:
+        """Retorna los tipos MySQL de las columnas de la tabla destino (vacío: inferidos por to_sql)"""
+        return {}
+
+    def get_validation_rules(self) -> List[Rule]:
+        """Reglas de validación de los datos normalizados (utils.validation), aplicadas con apply_validation_rules"""
+        return []
+
+    def apply_validation_rules(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Descarta en una sola pasada las filas que incumplen alguna regla de get_validation_rules"""
+        return VALIDATION.apply(df, self.get_validation_rules(), type(self).__name__, self.get_table_name())
+
+    def get_partition_column(self) -> Optional[str]:
+        """Retorna la columna por la que se particiona la tabla por año (None: sin particiones)"""
+        return None
+
+    def get_load_strategy(self) -> str:
+        """
+        Retorna la estrategia de carga:
+        - 'incremental': inserta solo registros con claves nuevas
+        - 'full_refresh': reemplaza la tabla completa con intercambio atómico (tablas de dimensión)
+        """
+        return 'incremental'
+
     def process_folder(self, folder_path: str) -> bool:
-        """Proceso ETL completo para la carpeta"""
+        """Proceso ETL completo para la carpeta, retomando desde el último checkpoint si existe"""
         try:
             self.logger.info(f"Iniciando procesamiento de carpeta: {folder_path}")
             
-            # 1. Extraer archivos
-            files = self.extract_files(folder_path)
-            if not files:
-                self.logger.info(f"No hay archivos para procesar en {folder_path}")
-                return True
+            stage = self.checkpoint.get_stage() if self.checkpoint else None
+            if stage:
+                self.logger.info(f"Retomando {type(self).__name__} desde la etapa '{stage}'")
             
-            # 2. Transformar datos
-            transformed_data = self.transform_files(files)
-            if transformed_data.empty:
-                self.logger.warning(f"No hay datos válidos en {folder_path}")
-                return True
+            if stage == 'transformed':
+                files = self.checkpoint.get_files_info()
+                transformed_data = self.checkpoint.load_frame()
+            else:
+                # 1. Extraer archivos
+                if stage == 'extracted':
+                    files = self.checkpoint.load_files()
+                else:
+                    files = self.extract_files(folder_path)
+                    if not files:
+                        self.logger.info(f"No hay archivos para procesar en {folder_path}")
+                        return True
+                    self._save_checkpoint('save_files', files)
+                
+                # 2. Transformar datos
+                transformed_data = self.transform_files(files)
+                if transformed_data.empty:
+                    self.logger.warning(f"No hay datos válidos en {folder_path}")
+                    if self.checkpoint:
+                        self.checkpoint.clear()
+                    return True
+                self._save_checkpoint('save_frame', transformed_data, files)
             
             # 3. Cargar a base de datos (sobrescribir)
-            success = self.load_data(transformed_data)
+            with TRACER.files(*[file_id(f['path'], f['metadata']) for f in files if f.get('metadata')]):
+                success = self.load_data(transformed_data)
             
             if success:
+                for file_info in files:
+                    self.record_loaded(folder_path, file_info['metadata'], file_info.get('rows', 0))
+                if self.checkpoint:
+                    self.checkpoint.clear()
                 self.logger.info(f"Carpeta {folder_path} procesada exitosamente")
             else:
                 self.logger.error(f"Error cargando datos de {folder_path}")
             
             return success
             
+        except MemoryBudgetExceeded:
+            raise
         except Exception as e:
             self.logger.error(f"Error procesando {folder_path}: {str(e)}")
             return False
+
+    def process_folder_streaming(self, folder_path: str) -> bool:
+        """
+        Proceso ETL archivo por archivo: descarga, transforma y carga cada archivo antes
+        de pasar al siguiente, liberando su contenido. La memoria queda acotada por el
+        archivo más grande en lugar del tamaño de la carpeta; los duplicados entre archivos
+        los descarta el loader al comparar con las claves ya cargadas en la tabla.
+
+        Returns:
+            bool: True si todos los archivos se cargaron con éxito
+        """
+        if self.get_load_strategy() == 'full_refresh':
+            # El reemplazo atómico necesita la tabla completa en un solo DataFrame
+            return self.process_folder(folder_path)
+
+        try:
+            self.logger.info(f"Iniciando procesamiento por archivo de carpeta: {folder_path}")
+
+            files = self.list_matching_files(folder_path)
+            if not files:
+                self.logger.info(f"No hay archivos para procesar en {folder_path}")
+                return True
+
+            success = True
+            for metadata in files:
+                file_info = self.download_file(folder_path, metadata)
+                if not file_info:
+                    # Como en el pipeline: la carpeta no queda al día y no debe reportarse como exitosa
+                    success = False
+                    continue
+
+                df = self.transform_file(file_info)
+                # Liberar el archivo descargado antes de cargar
+                file_info['data'].close()
+                del file_info
+
+                if df.empty:
+                    continue
+                rows = len(df)
+                # El manifiesto registra cada archivo cargado: si la ejecución falla, se retoma en el siguiente
+                with TRACER.files(file_id(folder_path, metadata)):
+                    loaded = self.load_data(df)
+                if loaded:
+                    self.record_loaded(folder_path, metadata, rows)
+                else:
+                    self.logger.error(f"Error cargando {metadata['name']} de {folder_path}")
+                    success = False
+                del df
+
+            if success:
+                self.logger.info(f"Carpeta {folder_path} procesada exitosamente")
+            return success
+
+        except MemoryBudgetExceeded:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error procesando {folder_path}: {str(e)}")
+            return False
+
+    def _save_checkpoint(self, method: str, *args):
+        """Guarda un checkpoint sin interrumpir el proceso si falla"""
+        if not self.checkpoint:
+            return
+        try:
+            getattr(self.checkpoint, method)(*args)
+        except Exception as e:
+            self.logger.warning(f"No se pudo guardar el checkpoint de {type(self).__name__}: {str(e)}")
     
+    @processor_metrics
+    def list_matching_files(self, folder_path: str) -> List[Dict]:
+        """
+        Lista los archivos de la carpeta que coinciden con los patrones del procesador,
+        omitiendo los que no cambiaron desde su última carga según el manifiesto
+        
+        Returns:
+            List[Dict]: Metadatos (name, modified, etag, size) de los archivos a procesar
+        """
+        all_files = self.listings.get(folder_path) if self.listings else None
+        if all_files is None:
+            all_files = self.extractor.list_files_metadata(folder_path)
+        self.logger.info(f"Archivos encontrados en total: {len(all_files)}")
+        
+        patterns = self.get_file_patterns()
+        self.logger.info(f"Patrones de búsqueda: {patterns}")
+
+        file_filter = self.file_filter
+        if file_filter and self.get_load_strategy() == 'full_refresh':
+            # Reemplazar la tabla con un subconjunto de archivos borraría el resto de los datos
+            self.logger.warning(
+                f"{type(self).__name__} reemplaza la tabla completa: se ignora el filtro de archivos "
+                f"(--file/--modified-since) y se cargan todos"
+            )
+            file_filter = None
+        
+        matching_files = []
+        for metadata in all_files:
+            file_name = metadata['name']
+            matches = any(pattern.lower() in file_name.lower() for pattern in patterns)
+            self.logger.debug("Archivo: %s - Coincide: %s", file_name, matches)
+            if matches and file_filter and not file_filter.matches(metadata):
+                self.logger.info(f"Archivo {file_name} excluido por el filtro de archivos")
+                continue
+            if matches:
+                matching_files.append(metadata)
+
+        if not self.manifest:
+            return matching_files
+
+        processor_name = type(self).__name__
+        changed_files = [
+            metadata for metadata in matching_files
+            if not self.manifest.is_unchanged(folder_path, metadata, processor_name)
+        ]
+        if changed_files and self.get_load_strategy() == 'full_refresh':
+            # El refresco completo reemplaza la tabla: requiere todos los archivos
+            return matching_files
+
+        skipped = len(matching_files) - len(changed_files)
+        if skipped:
+            self.logger.info(f"{skipped} archivos sin cambios desde la última carga, se omiten")
+        return changed_files
+
+    @processor_metrics
+    @MEMORY.profile('download')
+    def download_file(self, folder_path: str, metadata: Dict) -> Optional[Dict]:
+        """Descarga un archivo y retorna su información, o None si falla"""
+        file_name = metadata['name']
+        self.logger.info(f"Extrayendo archivo: {file_name}")
+        
+        start = time.perf_counter()
+        with TRACER.span('download_file', file=file_name, folder=folder_path,
+                         **{'etl.file_id': file_id(folder_path, metadata)}) as span:
+            file_data = self.extractor.download_file(folder_path, file_name)
+            span.set(bytes=file_data.getbuffer().nbytes if file_data else 0, success=bool(file_data))
+        if not file_data:
+            self.logger.error(f"Error descargando archivo {file_name}")
+            return None
+        
+        self._record_timing(metadata, 'download', time.perf_counter() - start)
+        self.files_downloaded += 1
+        self.bytes_downloaded += file_data.getbuffer().nbytes
+        self.logger.info(f"Archivo {file_name} extraído exitosamente")
+        return {
+            'name': file_name,
+            'path': folder_path,
+            'data': file_data,
+            'metadata': metadata
+        }
+
+    def _record_timing(self, metadata: Dict, stage: str, seconds: float):
+        if self.history:
+            self.history.record_file(type(self).__name__, metadata, stage, seconds)
+
+    def record_loaded(self, folder_path: str, metadata: Dict, rows: int):
+        """Registra en el manifiesto un archivo cargado con éxito"""
+        if self.manifest and rows > 0:
+            self.manifest.record_load(folder_path, metadata, type(self).__name__,
+                                      self.get_table_name(), rows)
+
     def extract_files(self, folder_path: str) -> List[Dict]:
         """Extrae archivos de la carpeta según patrones específicos"""
         try:
             self.logger.info(f"Extrayendo archivos de: {folder_path}")
             
-            all_files = self.extractor.list_files(folder_path)
-            self.logger.info(f"Archivos encontrados en total: {len(all_files)} - {all_files}")
-            
-            patterns = self.get_file_patterns()
-            self.logger.info(f"Patrones de búsqueda: {patterns}")
-            
             matching_files = []
-            for file_name in all_files:
-                matches = any(pattern.lower() in file_name.lower() for pattern in patterns)
-                self.logger.info(f"Archivo: {file_name} - Coincide: {matches}")
-                
-                if matches:
-                    self.logger.info(f"Extrayendo archivo: {file_name}")
-                    
-                    file_data = self.extractor.download_file(folder_path, file_name)
-                    if file_data:
-                        matching_files.append({
-                            'name': file_name,
-                            'path': folder_path,
-                            'data': file_data
-                        })
-                        self.logger.info(f"Archivo {file_name} extraído exitosamente")
-                    else:
-                        self.logger.error(f"Error descargando archivo {file_name}")
+            for metadata in self.list_matching_files(folder_path):
+                file_info = self.download_file(folder_path, metadata)
+                if file_info:
+                    matching_files.append(file_info)
             
             self.logger.info(f"Archivos extraídos: {len(matching_files)}")
             return matching_files
             
+        except MemoryBudgetExceeded:
+            raise
         except Exception as e:
             self.logger.error(f"Error extrayendo archivos de {folder_path}: {str(e)}")
             return []
+
+    @processor_metrics
+    @MEMORY.profile('transform_file')
+    def transform_file(self, file_info: Dict) -> pd.DataFrame:
+        """Lee y transforma un archivo; retorna un DataFrame vacío si no hay datos válidos"""
+        try:
+            start = time.perf_counter()
+            fid = file_id(file_info['path'], file_info.get('metadata') or {'name': file_info['name']})
+            with TRACER.files(fid):
+                # Usar transformer genérico con parámetros específicos
+                df = self.transformer.process_file(file_info, **self.get_read_params())
+                
+                if df is None or df.empty:
+                    return pd.DataFrame()
+                
+                # Aplicar transformación específica del dominio
+                transform_start = time.perf_counter()
+                with MEMORY.stage('transform_data'), \
+                        TRACER.span('transform_data', file=file_info['name'], table=self.get_table_name(),
+                                    rows_in=len(df), **{'etl.file_id': fid}) as span:
+                    df_transformed = self.transform_data(df)
+                    span.set(rows_out=len(df_transformed))
+            now = time.perf_counter()
+            METRICS.record('transform', now - transform_start, rows_in=len(df), rows_out=len(df_transformed),
+                           table=self.get_table_name())
+            self._record_timing(file_info.get('metadata') or {'name': file_info['name']},
+                                'transform', now - start)
+            
+            if not df_transformed.empty:
+                self.logger.info(f"Archivo {file_info['name']} transformado: {len(df_transformed)} filas")
+            return df_transformed
+                
+        except MemoryBudgetExceeded:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error transformando {file_info['name']}: {str(e)}")
+            return pd.DataFrame()
     
+    @processor_metrics
     def transform_files(self, files: List[Dict]) -> pd.DataFrame:
         """Transforma todos los archivos y los consolida"""
         all_dataframes = []
-        read_params = self.get_read_params()
         
         for file_info in files:
-            try:
-                # Usar transformer genérico con parámetros específicos
-                df = self.transformer.process_file(file_info, **read_params)
-                
-                if df is not None and not df.empty:
-                    # Aplicar transformación específica del dominio
-                    df_transformed = self.transform_data(df)
-                    
-                    if not df_transformed.empty:
-                        all_dataframes.append(df_transformed)
-                        self.logger.info(f"Archivo {file_info['name']} transformado: {len(df_transformed)} filas")
-                    
-            except Exception as e:
-                self.logger.error(f"Error transformando {file_info['name']}: {str(e)}")
+            df_transformed = self.transform_file(file_info)
+            file_info['rows'] = len(df_transformed)
+            if not df_transformed.empty:
+                all_dataframes.append(df_transformed)
         
         if all_dataframes:
-            result_df = pd.concat(all_dataframes, ignore_index=True)
+            with MEMORY.stage('concat'):
+                result_df = pd.concat(all_dataframes, ignore_index=True)
             self.logger.info(f"Total datos consolidados: {len(result_df)} filas")
             return result_df
         else:
             return pd.DataFrame()
     
+    @processor_metrics
+    @MEMORY.profile('load')
     def load_data(self, df: pd.DataFrame) -> bool:
         """Carga datos a la base de datos evitando duplicados"""
         try:
@@ -138,12 +383,19 @@ class BaseProcessor(ABC):
             # Si el processor define columnas clave, úsalas
             if hasattr(self, 'get_key_columns'):
                 key_columns = self.get_key_columns()
+                if self.get_load_strategy() == 'full_refresh':
+                    return self.loader.replace_table(table_name, df, key_columns, self.get_column_types())
+                if not self.loader.ensure_table(table_name, self.get_column_types(), key_columns,
+                                                self.get_partition_column()):
+                    return False
                 return self.loader.insert_new_data(table_name, df, key_columns)
             else:
                 # Usar todas las columnas excepto metadatos como clave
                 key_columns = [col for col in df.columns if col not in ['fecha_actualizacion', 'id']]
                 return self.loader.insert_new_data(table_name, df, key_columns)
                 
+        except MemoryBudgetExceeded:
+            raise
         except Exception as e:
             self.logger.error(f"Error cargando datos: {str(e)}")
             return False
\ No newline at end of file
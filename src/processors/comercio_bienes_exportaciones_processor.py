@@ -1,8 +1,9 @@
 from .base_processor import BaseProcessor
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 import traceback
 import re
+from utils.log_handlers import lazy
 
 class ComercioBienesExportacionesProcessor(BaseProcessor):
     def get_table_name(self) -> str:
@@ -14,6 +15,33 @@ class ComercioBienesExportacionesProcessor(BaseProcessor):
     def get_key_columns(self) -> List[str]:
         return ["nandina", "partida", "cod_pais", "deporig", "metrica", "anio", "periodo"]
 
+    def get_column_types(self) -> Dict[str, str]:
+        return {
+            'nandina': 'VARCHAR(20)',
+            'partida': 'VARCHAR(20)',
+            'tecnologia': 'VARCHAR(100)',
+            'clas_min': 'VARCHAR(20)',
+            'des_clas_min': 'VARCHAR(500)',
+            'grupos_clas_min': 'VARCHAR(100)',
+            'mineros_no_mineros': 'VARCHAR(50)',
+            'cuci_agregado': 'VARCHAR(100)',
+            'cod_pais': 'VARCHAR(10)',
+            'pais': 'VARCHAR(100)',
+            'grupo1': 'VARCHAR(100)',
+            'grupo2': 'VARCHAR(100)',
+            'grupo3': 'VARCHAR(100)',
+            'deporig': 'VARCHAR(10)',
+            'departamento': 'VARCHAR(100)',
+            'region': 'VARCHAR(100)',
+            'valor': 'DECIMAL(20,2)',
+            'metrica': 'VARCHAR(10)',
+            'anio': 'SMALLINT',
+            'periodo': 'VARCHAR(10)',
+        }
+
+    def get_partition_column(self) -> Optional[str]:
+        return "anio"
+
     def get_read_params(self) -> Dict[str, Any]:
         return {
             'header': 0, 
@@ -43,9 +71,9 @@ class ComercioBienesExportacionesProcessor(BaseProcessor):
                 self.logger.warning("No se encontraron columnas de valor para dinamizar.")
                 return pd.DataFrame()
 
-            self.logger.info(f"Columnas originales del archivo: {list(df.columns)}")
-            self.logger.info(f"Columnas dinámicas encontradas: {value_columns}")
-            self.logger.info(f"Columnas fijas encontradas: {excel_columns}")
+            self.logger.debug("Columnas originales del archivo: %s", lazy(lambda: list(df.columns)))
+            self.logger.debug("Columnas dinámicas encontradas: %s", value_columns)
+            self.logger.debug("Columnas fijas encontradas: %s", excel_columns)
 
             # Transformar a formato largo usando melt
             df_melted = df.melt(
@@ -68,11 +96,11 @@ class ComercioBienesExportacionesProcessor(BaseProcessor):
                     return metrica, anio, periodo
                 return None, None, None
 
-            # Aplicar la función para crear nuevas columnas
-            df_melted[['metrica', 'anio', 'periodo']] = pd.DataFrame(
-                df_melted['metrica_periodo'].apply(parse_metrica_periodo).tolist(),
-                index=df_melted.index
-            )
+            # Crear las nuevas columnas: se analiza cada columna original una sola vez y se mapea,
+            # en lugar de construir una tupla por fila del DataFrame largo
+            parsed = {col: parse_metrica_periodo(col) for col in value_columns}
+            for position, name in enumerate(['metrica', 'anio', 'periodo']):
+                df_melted[name] = df_melted['metrica_periodo'].map({col: values[position] for col, values in parsed.items()})
 
             # Verificar si hay filas con métricas no procesadas correctamente
             invalid_rows = df_melted[df_melted['metrica'].isna()]
@@ -117,7 +145,8 @@ class ComercioBienesExportacionesProcessor(BaseProcessor):
             key_columns = self.get_key_columns()
             duplicates = df_melted[df_melted.duplicated(subset=key_columns, keep=False)]
             if not duplicates.empty:
-                self.logger.warning(f"Duplicados encontrados en el DataFrame:\n{duplicates[key_columns]}")
+                self.logger.warning(f"Duplicados encontrados en el DataFrame: {len(duplicates)} filas")
+                self.logger.debug("Filas duplicadas:\n%s", lazy(lambda: duplicates[key_columns].head(50)))
             else:
                 self.logger.info("No se encontraron duplicados en el DataFrame.")
 
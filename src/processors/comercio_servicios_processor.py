@@ -2,6 +2,8 @@ from .base_processor import BaseProcessor
 from typing import Dict, Any, List
 import pandas as pd
 import traceback
+from utils.log_handlers import lazy
+from utils.validation import NotNull, NotEmpty, InSet, Rule
 
 class ComercioServiciosProcessor(BaseProcessor):
     def get_table_name(self) -> str:
@@ -18,6 +20,19 @@ class ComercioServiciosProcessor(BaseProcessor):
             'pais', 
             'departamento'
         ]
+
+    def get_column_types(self) -> Dict[str, str]:
+        return {
+            'flujo_comercial': 'VARCHAR(20)',
+            'periodo_mes': 'VARCHAR(20)',
+            'codigo': 'VARCHAR(20)',
+            'descripcion_cabps': 'VARCHAR(500)',
+            'pais': 'VARCHAR(10)',
+            'nombre_pais': 'VARCHAR(100)',
+            'departamento': 'VARCHAR(10)',
+            'nombre_departamento': 'VARCHAR(100)',
+            'total_miles_dolares': 'DECIMAL(20,4)',
+        }
     
     def get_read_params(self) -> Dict[str, Any]:
         """Parámetros específicos para leer archivos de comercio de servicios"""
@@ -26,6 +41,15 @@ class ComercioServiciosProcessor(BaseProcessor):
             'skipfooter': 0, 
         }
 
+    def get_validation_rules(self) -> List[Rule]:
+        # Flujo comercial: Exportación o Importación
+        valid_flows = ['EXPORTACIONES', 'IMPORTACIONES', 'EXPORTACIÓN', 'IMPORTACIÓN', 'EXPORTACION', 'IMPORTACION']
+        return [
+            NotNull('total_miles_dolares'),
+            NotEmpty('codigo'),
+            InSet('flujo_comercial', valid_flows),
+        ]
+
     def transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Transformación específica para comercio de servicios
@@ -33,10 +57,10 @@ class ComercioServiciosProcessor(BaseProcessor):
         - Limpiar y validar datos específicos del dominio
         """
         try:
-            df_clean = df.copy()
+            df_clean = df.copy(deep=False)
             
             # DEBUG: Mostrar columnas originales
-            self.logger.info(f"Columnas originales del archivo: {list(df_clean.columns)}")
+            self.logger.debug("Columnas originales del archivo: %s", lazy(lambda: list(df_clean.columns)))
 
             # Eliminar filas donde la primera columna esté vacía (texto al final)
             if not df_clean.empty:
@@ -80,7 +104,7 @@ class ComercioServiciosProcessor(BaseProcessor):
                 'total_miles_dolares'
             ]
             existing_columns = [col for col in required_columns if col in df_clean.columns]
-            self.logger.info(f"Columnas disponibles después del mapeo: {existing_columns}")
+            self.logger.debug("Columnas disponibles después del mapeo: %s", existing_columns)
             
             if not existing_columns:
                 self.logger.error("No se encontraron columnas válidas después del mapeo")
@@ -188,49 +212,26 @@ class ComercioServiciosProcessor(BaseProcessor):
     def _validate_comercio_servicios_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Validaciones específicas para datos de comercio de servicios"""
         try:
-            df_copy = df.copy()
-            # Limpiar valores numéricos
-            if 'total_miles_dolares' in df.columns:
-                # Reemplazar comas por puntos si es necesario
-                df_copy['total_miles_dolares'] = df_copy['total_miles_dolares'].astype(str).str.replace(',', '.')
+            df_copy = df.copy(deep=False)
+            # Limpiar valores numéricos (reemplazar comas por puntos si es necesario)
+            if 'total_miles_dolares' in df_copy.columns:
                 df_copy['total_miles_dolares'] = pd.to_numeric(
-                    df_copy['total_miles_dolares'], 
+                    df_copy['total_miles_dolares'].astype(str).str.replace(',', '.'),
                     errors='coerce'
                 )
-                # Eliminar filas con valores nulos en total_miles_dolares
-                original_count = len(df_copy)
-                df_copy = df_copy.dropna(subset=['total_miles_dolares'])
-                filtered_count = len(df_copy)
-                if filtered_count < original_count:
-                    self.logger.info(f"Filtradas {original_count - filtered_count} filas por valores nulos en total_miles_dolares")
-            
-            # Validar códigos
-            if 'codigo' in df.columns:
-                df_copy.loc[:, 'codigo'] = df_copy['codigo'].astype(str).str.strip()
-                # Eliminar filas con códigos vacíos
-                original_count = len(df_copy)
-                df_copy = df_copy[df_copy['codigo'] != '']
-                df_copy = df_copy[df_copy['codigo'] != 'nan']
-                df_copy = df_copy[df_copy['codigo'] != 'None']
-                filtered_count = len(df_copy)
-                if filtered_count < original_count:
-                    self.logger.info(f"Filtradas {original_count - filtered_count} filas por códigos vacíos")
+            
+            # Limpiar códigos
+            if 'codigo' in df_copy.columns:
+                df_copy['codigo'] = df_copy['codigo'].astype(str).str.strip()
             
             # Limpiar texto
             text_columns = ['flujo_comercial', 'descripcion_cabps', 'nombre_pais', 'nombre_departamento']
             for col in text_columns:
                 if col in df_copy.columns:
-                    df_copy[col] = df_copy[col].astype(str).str.strip()
-                    df_copy[col] = df_copy[col].str.upper()  # Normalizar a mayúsculas
+                    df_copy[col] = df_copy[col].astype(str).str.strip().str.upper()  # Normalizar a mayúsculas
 
-            # Validar flujo comercial (debe ser Exportación o Importación)
-            if 'flujo_comercial' in df_copy.columns:
-                valid_flows = ['EXPORTACIONES', 'IMPORTACIONES', 'EXPORTACIÓN', 'IMPORTACIÓN', 'EXPORTACION', 'IMPORTACION']
-                original_count = len(df_copy)
-                df_copy = df_copy[df_copy['flujo_comercial'].isin(valid_flows)]
-                filtered_count = len(df_copy)
-                if filtered_count < original_count:
-                    self.logger.info(f"Filtradas {original_count - filtered_count} filas por flujo comercial inválido")
+            # Descartar valores nulos, códigos vacíos y flujos comerciales inválidos en una sola pasada
+            df_copy = self.apply_validation_rules(df_copy)
 
             return df_copy
 
@@ -1,5 +1,5 @@
 from .base_processor import BaseProcessor
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 import traceback
 
@@ -13,6 +13,18 @@ class IedPaisOrigenProcessor(BaseProcessor):
     def get_key_columns(self) -> List[str]:
         return ["cod_pais", "serie", "fecha", "flujo"]
 
+    def get_column_types(self) -> Dict[str, str]:
+        return {
+            'cod_pais': 'VARCHAR(10)',
+            'serie': 'VARCHAR(255)',
+            'fecha': 'DATE',
+            'valor': 'DECIMAL(20,2)',
+            'flujo': 'VARCHAR(20)',
+        }
+
+    def get_partition_column(self) -> Optional[str]:
+        return "fecha"
+
     def get_read_params(self) -> Dict[str, Any]:
         return {
             'header': None, 
@@ -27,7 +39,8 @@ class IedPaisOrigenProcessor(BaseProcessor):
         try:
             dates = df.iloc[1, 2:].tolist()  # Columnas desde la tercera (índice 2)
 
-            df.columns = ['COD País', 'Serie'] + dates
+            # set_axis en lugar de df.columns = ...: no modifica el DataFrame recibido ni copia sus datos
+            df = df.set_axis(['COD País', 'Serie'] + dates, axis=1)
 
             # Eliminar las primeras tres filas (filas 0, 1 y 2) ya que contienen metadatos
             df = df.iloc[3:].reset_index(drop=True)
@@ -52,9 +65,7 @@ class IedPaisOrigenProcessor(BaseProcessor):
             df_melted = df_melted.rename(columns={'COD País': 'cod_pais', 'Serie': 'serie'})
             df_melted['flujo'] = 'Ext en Col'
 
-            # Limpiar nuevamente 'cod_pais' y 'serie' después del melt
-            df_melted['cod_pais'] = df_melted['cod_pais'].astype(str).str.strip()
-            df_melted['serie'] = df_melted['serie'].astype(str).str.strip()
+            # 'cod_pais' y 'serie' ya se limpiaron antes del melt, que solo repite sus valores
 
             # Convertir 'fecha' a formato datetime
             df_melted['fecha'] = pd.to_datetime(df_melted['fecha'], format='%d/%m/%Y')
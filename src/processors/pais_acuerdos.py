@@ -2,6 +2,8 @@ from .base_processor import BaseProcessor
 from typing import Dict, Any, List
 import pandas as pd
 import traceback
+from utils.log_handlers import lazy
+from utils.validation import NotEmpty, Rule
 
 class PaisAcuerdosProcessor(BaseProcessor):
     def get_table_name(self) -> str:
@@ -12,7 +14,26 @@ class PaisAcuerdosProcessor(BaseProcessor):
 
     def get_key_columns(self) -> List[str]:
         return ["codigo_pais"]
+
+    def get_load_strategy(self) -> str:
+        # Tabla de referencia pequeña: los cambios en banderas de acuerdos deben reflejarse
+        return 'full_refresh'
+
+    def get_column_types(self) -> Dict[str, str]:
+        return {
+            'codigo_pais': 'VARCHAR(10)',
+            'pais': 'VARCHAR(100)',
+            'grupos_die': 'VARCHAR(100)',
+            'ap': 'VARCHAR(50)',
+            'aec': 'VARCHAR(50)',
+            'acuerdos': 'VARCHAR(50)',
+            'aladi': 'VARCHAR(50)',
+            'celac': 'VARCHAR(50)',
+        }
     
+    def get_validation_rules(self) -> List[Rule]:
+        return [NotEmpty('pais', empty=('', 'Nan'))]
+
     def get_read_params(self) -> Dict[str, Any]:
         return { 
             'header': 1,  
@@ -21,10 +42,10 @@ class PaisAcuerdosProcessor(BaseProcessor):
 
     def transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
         try: 
-            df_clean = df.copy()
+            df_clean = df.copy(deep=False)
 
             # Debbug: Mostrar columnas originales
-            self.logger.info(f"Columnas originales del archivo: {list(df_clean.columns)}")
+            self.logger.debug("Columnas originales del archivo: %s", lazy(lambda: list(df_clean.columns)))
             column_mapping = { # Mapa de columnas a estructura de base de datos
                 'Cod. Pais': 'codigo_pais',
                 'País': 'pais',
@@ -56,7 +77,7 @@ class PaisAcuerdosProcessor(BaseProcessor):
                 df_clean = df_clean.rename(columns=existing_mappings)
 
             existing_columns = [col for col in required_columns if col in df_clean.columns]
-            self.logger.info(f"Columnas existentes después del mapeo: {existing_columns}")
+            self.logger.debug("Columnas existentes después del mapeo: %s", existing_columns)
 
             if not existing_columns:
                 self.logger.error("No se encontraron columnas requeridas después del mapeo.")
@@ -75,19 +96,16 @@ class PaisAcuerdosProcessor(BaseProcessor):
     
     def _validate_data(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
-            df_clean = df.copy()
+            df_clean = df.copy(deep=False)
             
             # 1. Normalizar código de país (eliminar ceros a la izquierda para coincidir con la base de datos)
             if 'codigo_pais' in df_clean.columns:
-                df_clean['codigo_pais'] = df_clean['codigo_pais'].astype(str).str.strip().str.lstrip('0')
-
-                df_clean['codigo_pais'] = df_clean['codigo_pais'].replace('', '0')
+                df_clean['codigo_pais'] = df_clean['codigo_pais'].astype(str).str.strip().str.lstrip('0').replace('', '0')
             
             # 2. Normalizar nombre de país
             if 'pais' in df_clean.columns:
                 df_clean['pais'] = df_clean['pais'].astype(str).str.strip().str.title()
-                df_clean = df_clean[df_clean['pais'] != '']
-                df_clean = df_clean[df_clean['pais'] != 'Nan']
+                df_clean = self.apply_validation_rules(df_clean)
 
             # 3. Manejar registros con codigo_pais = '0'
             if 'codigo_pais' in df_clean.columns:
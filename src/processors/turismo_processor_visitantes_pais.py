@@ -2,6 +2,19 @@ from .base_processor import BaseProcessor
 from typing import Dict, Any, List
 import pandas as pd
 import traceback
+from utils.log_handlers import lazy
+from utils.validation import NotEmpty, InSet, NumericRange, NonNegative, Rule
+
+# Nombres y abreviaturas de meses -> nombre normalizado
+MESES_NORMALIZACION = {
+    'enero': 'enero', 'febrero': 'febrero', 'marzo': 'marzo', 'abril': 'abril',
+    'mayo': 'mayo', 'junio': 'junio', 'julio': 'julio', 'agosto': 'agosto',
+    'septiembre': 'septiembre', 'octubre': 'octubre', 'noviembre': 'noviembre', 'diciembre': 'diciembre',
+    # Versiones abreviadas
+    'ene': 'enero', 'feb': 'febrero', 'mar': 'marzo', 'abr': 'abril',
+    'may': 'mayo', 'jun': 'junio', 'jul': 'julio', 'ago': 'agosto',
+    'sep': 'septiembre', 'oct': 'octubre', 'nov': 'noviembre', 'dic': 'diciembre'
+}
 
 class TurismoVisitantesPaisProcessor(BaseProcessor): 
     def get_table_name(self) -> str:
@@ -10,6 +23,15 @@ class TurismoVisitantesPaisProcessor(BaseProcessor):
     def get_key_columns(self) -> List[str]:
         return ["anio", "mes", "pais", "flujo"]
 
+    def get_column_types(self) -> Dict[str, str]:
+        return {
+            'anio': 'VARCHAR(4)',
+            'mes': 'VARCHAR(20)',
+            'pais': 'VARCHAR(100)',
+            'viajeros': 'BIGINT',
+            'flujo': 'VARCHAR(20)',
+        }
+
     def get_file_patterns(self) -> List[str]:
         return ["OEE", "EC", "TURISMO", "xlsx"]
 
@@ -20,12 +42,21 @@ class TurismoVisitantesPaisProcessor(BaseProcessor):
             'sheet_name': 'Extranjeros Pais de Residencia',
         }
 
+    def get_validation_rules(self) -> List[Rule]:
+        return [
+            NumericRange('anio', 2000, 2030),
+            InSet('mes', set(MESES_NORMALIZACION.values())),
+            NonNegative('viajeros'),
+            NotEmpty('continente_omt', empty=('', 'Nan')),
+            NotEmpty('pais', empty=('', 'Nan')),
+        ]
+
     def transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
-            df_clean = df.copy()
+            df_clean = df.copy(deep=False)
 
             # Debug: Mostrar columnas originales
-            self.logger.info(f"Columnas originales del archivo: {list(df_clean.columns)}")
+            self.logger.debug("Columnas originales del archivo: %s", lazy(lambda: list(df_clean.columns)))
             column_mapping = {
                 'Año': 'anio',
                 'Mes': 'mes',
@@ -50,7 +81,7 @@ class TurismoVisitantesPaisProcessor(BaseProcessor):
 
             # Columnas finales requeridas
             existing_columns = [col for col in required_columns if col in df_clean.columns]
-            self.logger.info(f"Columnas existentes después del procesamiento: {existing_columns}")
+            self.logger.debug("Columnas existentes después del procesamiento: %s", existing_columns)
 
             if not existing_columns:
                 self.logger.error("No se encontraron columnas requeridas después del mapeo.")
@@ -75,87 +106,31 @@ class TurismoVisitantesPaisProcessor(BaseProcessor):
     def _validate_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Validaciones específicas para datos de turismo"""
         try:
-            df_clean = df.copy()
-            
-                        # 1. Validar y limpiar año
+            df_clean = df.copy(deep=False)
+
+            # 1. Normalizar columnas (las filas inválidas se descartan después, en una sola pasada)
             if 'anio' in df_clean.columns:
-                self.logger.info(f"Valores únicos de año antes de limpieza: {sorted(df_clean['anio'].dropna().unique())}")
-                
-                # Convertir a numérico
+                self.logger.debug("Valores únicos de año antes de limpieza: %s", lazy(lambda: sorted(df_clean['anio'].dropna().unique())))
                 df_clean['anio'] = pd.to_numeric(df_clean['anio'], errors='coerce')
-                
-                # Eliminar filas con años nulos o fuera de rango
-                initial_count = len(df_clean)
-                df_clean = df_clean.dropna(subset=['anio'])
-                df_clean = df_clean[(df_clean['anio'] >= 2000) & (df_clean['anio'] <= 2030)]
-                
-                if len(df_clean) < initial_count:
-                    removed = initial_count - len(df_clean)
-                    self.logger.info(f"Eliminadas {removed} filas con años inválidos")
-            
-            # 2. Validar y normalizar mes
+
             if 'mes' in df_clean.columns:
-                self.logger.info(f"Valores únicos de mes antes de limpieza: {sorted(df_clean['mes'].dropna().unique())}")
-                
-                # Limpiar valores de mes
-                df_clean['mes'] = df_clean['mes'].astype(str).str.strip().str.lower()
-                
-                # Diccionario para normalizar meses
-                meses_normalizacion = {
-                    'enero': 'enero', 'febrero': 'febrero', 'marzo': 'marzo', 'abril': 'abril',
-                    'mayo': 'mayo', 'junio': 'junio', 'julio': 'julio', 'agosto': 'agosto',
-                    'septiembre': 'septiembre', 'octubre': 'octubre', 'noviembre': 'noviembre', 'diciembre': 'diciembre',
-                    # Versiones abreviadas
-                    'ene': 'enero', 'feb': 'febrero', 'mar': 'marzo', 'abr': 'abril',
-                    'may': 'mayo', 'jun': 'junio', 'jul': 'julio', 'ago': 'agosto',
-                    'sep': 'septiembre', 'oct': 'octubre', 'nov': 'noviembre', 'dic': 'diciembre'
-                }
-                
-                # Aplicar normalización
-                df_clean['mes'] = df_clean['mes'].map(meses_normalizacion).fillna(df_clean['mes'])
-                
-                # Eliminar filas con meses no válidos
-                meses_validos = list(set(meses_normalizacion.values()))
-                initial_count = len(df_clean)
-                df_clean = df_clean[df_clean['mes'].isin(meses_validos)]
-                
-                if len(df_clean) < initial_count:
-                    removed = initial_count - len(df_clean)
-                    self.logger.info(f"Eliminadas {removed} filas con meses inválidos")
-            
-            # 3. Validar campo de viajeros (debe ser numérico)
+                self.logger.debug("Valores únicos de mes antes de limpieza: %s", lazy(lambda: sorted(df_clean['mes'].dropna().unique())))
+                mes = df_clean['mes'].astype(str).str.strip().str.lower()
+                df_clean['mes'] = mes.map(MESES_NORMALIZACION).fillna(mes)
+
             if 'viajeros' in df_clean.columns:
                 # Convertir a numérico, forzando errores a NaN
                 df_clean['viajeros'] = pd.to_numeric(df_clean['viajeros'], errors='coerce')
-                
-                # Eliminar filas con viajeros nulos o negativos
-                initial_count = len(df_clean)
-                df_clean = df_clean.dropna(subset=['viajeros'])
-                df_clean = df_clean[df_clean['viajeros'] >= 0]
-                final_count = len(df_clean)
-                
-                if final_count < initial_count:
-                    removed = initial_count - final_count
-                    self.logger.info(f"Eliminadas {removed} filas con valores de viajeros inválidos")
-            
-            # 5. Validar continente OMT
+
             if 'continente_omt' in df_clean.columns:
-                # Normalizar nombres de continentes
                 df_clean['continente_omt'] = df_clean['continente_omt'].astype(str).str.strip().str.title()
-                
-                # Eliminar continentes vacíos
-                df_clean = df_clean[df_clean['continente_omt'] != '']
-                df_clean = df_clean[df_clean['continente_omt'] != 'Nan']
 
-            # 6. Normalizar nombres de países
             if 'pais' in df_clean.columns:
-                df_clean['pais'] = df_clean['pais'].astype(str).str.strip()
-                df_clean['pais'] = df_clean['pais'].str.title()  # Capitalizar apropiadamente
-                
-                # Eliminar países vacíos
-                df_clean = df_clean[df_clean['pais'] != '']
-                df_clean = df_clean[df_clean['pais'] != 'Nan']
-            
+                df_clean['pais'] = df_clean['pais'].astype(str).str.strip().str.title()  # Capitalizar apropiadamente
+
+            # 2. Descartar años fuera de rango, meses inválidos, viajeros nulos o negativos y países vacíos
+            df_clean = self.apply_validation_rules(df_clean)
+
             self.logger.info(f"Datos de turismo validados: {len(df_clean)} filas")
             return df_clean
             
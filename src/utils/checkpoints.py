@@ -0,0 +1,151 @@
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, List, Optional
+import pandas as pd
+import logging
+import shutil
+import json
+import os
+from utils.helpers import atomic_write
+
+class ProcessorCheckpoint:
+    """
+    Checkpoints de las etapas de un procesador dentro de una ejecución.
+
+    Etapas: 'extracted' (archivos descargados en raw/) y 'transformed'
+    (DataFrame consolidado en Parquet). Se eliminan cuando la carga termina bien.
+    El estado guarda las opciones de la ejecución (filtro de archivos y --force): un
+    checkpoint creado con otras opciones no corresponde a lo pedido y se descarta.
+    """
+    def __init__(self, directory: str, options: Dict = None):
+        self.directory = directory
+        self.options = options or {}
+        self.state_path = os.path.join(directory, 'state.json')
+        self.raw_dir = os.path.join(directory, 'raw')
+        self.logger = logging.getLogger(__name__)
+
+    def _read_state(self) -> Dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Estado de checkpoint ilegible en {self.directory}: {str(e)}")
+            return {}
+
+    def _write_state(self, state: Dict):
+        state = {**state, 'options': self.options}
+        atomic_write(self.state_path, json.dumps(state, ensure_ascii=False, indent=2))
+
+    @staticmethod
+    def _describe(file_info: Dict) -> Dict:
+        return {key: value for key, value in file_info.items() if key != 'data'}
+
+    def get_stage(self) -> Optional[str]:
+        """Última etapa completada ('extracted', 'transformed') o None"""
+        state = self._read_state()
+        if state and state.get('options', {}) != self.options:
+            self.logger.warning(
+                f"Checkpoint de {os.path.basename(self.directory)} creado con otras opciones "
+                f"({state.get('options', {})} en vez de {self.options}), se descarta"
+            )
+            self.clear()
+            return None
+        return state.get('stage')
+
+    def save_files(self, files: List[Dict]):
+        """Persiste los archivos descargados"""
+        os.makedirs(self.raw_dir, exist_ok=True)
+        for index, file_info in enumerate(files):
+            with open(os.path.join(self.raw_dir, str(index)), 'wb') as f:
+                f.write(file_info['data'].getbuffer())
+        self._write_state({'stage': 'extracted', 'files': [self._describe(f) for f in files]})
+
+    def load_files(self) -> List[Dict]:
+        """Recupera los archivos descargados, con su contenido en BytesIO"""
+        files = []
+        for index, file_info in enumerate(self._read_state().get('files', [])):
+            with open(os.path.join(self.raw_dir, str(index)), 'rb') as f:
+                files.append({**file_info, 'data': BytesIO(f.read())})
+        return files
+
+    def get_files_info(self) -> List[Dict]:
+        """Información de los archivos (sin contenido) registrada en el checkpoint"""
+        return self._read_state().get('files', [])
+
+    def save_frame(self, df: pd.DataFrame, files: List[Dict]):
+        """Persiste el DataFrame transformado y libera los archivos descargados"""
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            df.to_parquet(os.path.join(self.directory, 'transformed.parquet'), index=False)
+            frame_format = 'parquet'
+        except Exception as e:
+            # Sin pyarrow/fastparquet o con columnas de tipos mixtos
+            self.logger.debug(f"Parquet no disponible para checkpoint ({str(e)}), usando pickle")
+            df.to_pickle(os.path.join(self.directory, 'transformed.pkl'))
+            frame_format = 'pickle'
+
+        self._write_state({
+            'stage': 'transformed',
+            'format': frame_format,
+            'files': [self._describe(f) for f in files]
+        })
+        shutil.rmtree(self.raw_dir, ignore_errors=True)
+
+    def load_frame(self) -> pd.DataFrame:
+        """Recupera el DataFrame transformado"""
+        if self._read_state().get('format') == 'pickle':
+            return pd.read_pickle(os.path.join(self.directory, 'transformed.pkl'))
+        return pd.read_parquet(os.path.join(self.directory, 'transformed.parquet'))
+
+    def clear(self):
+        """Elimina el checkpoint del procesador"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class CheckpointStore:
+    """Checkpoints de una ejecución, bajo base_dir/<run_id>/<procesador>"""
+    def __init__(self, base_dir: str, run_id: str, options: Dict = None):
+        self.base_dir = base_dir
+        self.run_id = run_id
+        self.options = options or {}
+        self.run_dir = os.path.join(base_dir, run_id)
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def resume_or_create(cls, base_dir: str, run_id: str = None, resume: bool = True,
+                         options: Dict = None) -> 'CheckpointStore':
+        """
+        Retoma la ejecución indicada o la última incompleta; si no hay, crea una nueva
+
+        Args:
+            base_dir (str): Directorio raíz de checkpoints
+            run_id (str): Ejecución a retomar (opcional)
+            resume (bool): Si es False descarta checkpoints previos y crea una ejecución nueva
+            options (Dict): Opciones de la ejecución (filtro de archivos, force); los checkpoints
+                retomados con otras opciones se descartan
+        """
+        logger = logging.getLogger(__name__)
+        if run_id:
+            return cls(base_dir, run_id, options)
+
+        previous_runs = sorted(os.listdir(base_dir)) if os.path.isdir(base_dir) else []
+        if previous_runs and resume:
+            logger.info(f"Retomando ejecución incompleta {previous_runs[-1]}")
+            return cls(base_dir, previous_runs[-1], options)
+
+        for previous_run in previous_runs:
+            shutil.rmtree(os.path.join(base_dir, previous_run), ignore_errors=True)
+        return cls(base_dir, datetime.now().strftime('%Y%m%d_%H%M%S'), options)
+
+    def for_processor(self, processor_name: str) -> ProcessorCheckpoint:
+        return ProcessorCheckpoint(os.path.join(self.run_dir, processor_name), self.options)
+
+    def finish(self):
+        """Elimina el directorio de la ejecución si ya no quedan checkpoints pendientes"""
+        if os.path.isdir(self.run_dir) and not os.listdir(self.run_dir):
+            os.rmdir(self.run_dir)
+        if not os.path.isdir(self.run_dir):
+            self.logger.info(f"Ejecución {self.run_id} completada, checkpoints eliminados")
+        else:
+            self.logger.warning(f"Ejecución {self.run_id} con checkpoints pendientes en {self.run_dir}")
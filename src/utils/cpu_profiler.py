@@ -0,0 +1,171 @@
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import threading
+import cProfile
+import logging
+import pstats
+import time
+import sys
+import os
+import re
+
+class StackSampler:
+    """
+    Muestreo periódico de la pila de un hilo (sys._current_frames) para construir un
+    flame graph en formato de pilas colapsadas ('a;b;c muestras'), sin dependencias externas
+    """
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class CpuProfiler:
+    """
+    Perfil de CPU por trabajo (carpeta y procesador), opt-in con CPU_PROFILE o --profile.
+
+    Cada trabajo se ejecuta bajo cProfile (estadísticas exactas por función, archivo .pstats)
+    y un muestreo de pila del mismo hilo (archivo .collapsed, para flamegraph.pl o speedscope).
+    Ambos se guardan en el directorio de la ejecución y el reporte incluye las funciones con
+    mayor tiempo acumulado por procesador y en toda la ejecución.
+
+    cProfile solo se activa con un trabajo a la vez (deterministic): en Python 3.12+ perfila
+    todos los hilos del proceso, y con varios workers el .pstats de un trabajo mezclaría el
+    tiempo de los demás. Con varios workers queda el muestreo de pila, que es por hilo.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = None
+        self.top = 20
+        self.interval = 0.005
+        self.deterministic = True
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = {}
+        self._stats_files: List[str] = []
+
+    def configure(self, enabled: bool = False, output_dir: str = None, top: int = 20, interval_ms: float = 5,
+                  deterministic: bool = True):
+        """
+        Activa el perfil de CPU
+
+        Args:
+            enabled (bool): Perfilar cada trabajo
+            output_dir (str): Directorio de la ejecución donde se guardan .pstats y .collapsed
+            top (int): Funciones a incluir en el resumen del reporte
+            interval_ms (float): Intervalo del muestreo de pila en milisegundos
+            deterministic (bool): Usar cProfile; solo si los trabajos se ejecutan de a uno
+        """
+        self.enabled = enabled and bool(output_dir)
+        self.output_dir = output_dir
+        self.top = top
+        self.interval = interval_ms / 1000
+        self.deterministic = deterministic
+        if self.enabled:
+            os.makedirs(output_dir, exist_ok=True)
+            if not deterministic:
+                self.logger.info("Perfil de CPU con varios workers: solo muestreo de pila por hilo, sin cProfile")
+
+    @contextmanager
+    def profile(self, job: str):
+        """Perfila el bloque como el trabajo job (p. ej. '3-Inversion/IedPaisOrigenProcessor')"""
+        if not self.enabled:
+            yield
+            return
+
+        profiler = cProfile.Profile() if self.deterministic else None
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: un solo cProfile activo por proceso (p. ej. otro perfil ya activo)
+                profiler = None
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+            self._save(job, profiler, sampler, elapsed)
+
+    def _save(self, job: str, profiler: Optional[cProfile.Profile], sampler: StackSampler, elapsed: float):
+        base = os.path.join(self.output_dir, re.sub(r'[^\w.-]+', '__', job))
+        entry = {'seconds': round(elapsed, 3), 'samples': sum(sampler.stacks.values()), 'collapsed': f"{base}.collapsed"}
+        try:
+            sampler.write_collapsed(entry['collapsed'])
+            if profiler is not None:
+                entry['pstats'] = f"{base}.pstats"
+                profiler.dump_stats(entry['pstats'])
+                entry['top'] = _top_functions(pstats.Stats(profiler), self.top)
+        except Exception as e:
+            self.logger.error(f"Error guardando el perfil de {job}: {str(e)}")
+        with self._lock:
+            self._jobs[job] = entry
+            if 'pstats' in entry:
+                self._stats_files.append(entry['pstats'])
+
+    def reset(self):
+        """Descarta los perfiles acumulados (p. ej. tras el reporte de cada revisión del modo vigilancia)"""
+        with self._lock:
+            self._jobs.clear()
+            self._stats_files.clear()
+
+    def get_report(self) -> Optional[Dict]:
+        """Archivos y funciones más costosas por trabajo y de toda la ejecución (None si está desactivado)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            jobs = dict(self._jobs)
+            stats_files = list(self._stats_files)
+        top = []
+        if stats_files:
+            try:
+                top = _top_functions(pstats.Stats(*stats_files), self.top)
+            except Exception as e:
+                self.logger.error(f"Error combinando perfiles: {str(e)}")
+        return {'run_dir': self.output_dir, 'top_cumulative': top, 'jobs': jobs}
+
+def _top_functions(stats: pstats.Stats, count: int) -> List[Dict]:
+    """Funciones con mayor tiempo acumulado"""
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f"{name} ({os.path.basename(filename)}:{line})" if line else name,
+            'calls': calls,
+            'tottime': round(tottime, 4),
+            'cumtime': round(cumtime, 4),
+        })
+    rows.sort(key=lambda row: row['cumtime'], reverse=True)
+    return rows[:count]
+
+# Perfil del proceso, configurado desde main
+PROFILER = CpuProfiler()
@@ -1,7 +1,10 @@
 from typing import Dict, Optional
 from io import BytesIO
+from utils.metrics import METRICS
+from utils.tracing import TRACER
 import pandas as pd
 import logging
+import time
 
 class ExcelTransformer:
     def __init__(self):
@@ -20,15 +23,18 @@ class ExcelTransformer:
             DataFrame o None si hay error
         """
         try:
-            if file_name.endswith('.xlsx') or file_name.endswith('.xls'):
-                df = pd.read_excel(file_data, **kwargs)
-            elif file_name.endswith('.xlsb'):
-                df = pd.read_excel(file_data, engine='pyxlsb', **kwargs)
-            elif file_name.endswith('.csv'):
-                df = pd.read_csv(file_data, **kwargs)
-            else:
-                self.logger.warning(f"Tipo de archivo no soportado: {file_name}")
-                return None
+            with TRACER.span('read_excel_file', file=file_name,
+                             bytes=file_data.getbuffer().nbytes if isinstance(file_data, BytesIO) else None) as span:
+                if file_name.endswith('.xlsx') or file_name.endswith('.xls'):
+                    df = pd.read_excel(file_data, **kwargs)
+                elif file_name.endswith('.xlsb'):
+                    df = pd.read_excel(file_data, engine='pyxlsb', **kwargs)
+                elif file_name.endswith('.csv'):
+                    df = pd.read_csv(file_data, **kwargs)
+                else:
+                    self.logger.warning(f"Tipo de archivo no soportado: {file_name}")
+                    return None
+                span.set(rows=len(df), columns=len(df.columns))
             
             self.logger.info(f"Archivo {file_name} leído correctamente. Shape: {df.shape}")
             return df
@@ -70,6 +76,7 @@ class ExcelTransformer:
             DataFrame procesado o None
         """
         try:
+            start = time.perf_counter()
             # Leer archivo
             df = self.read_excel_file(
                 file_info['data'], 
@@ -78,11 +85,16 @@ class ExcelTransformer:
             )
             
             if df is None:
+                METRICS.record('parse', time.perf_counter() - start, error=True)
                 return None
             
             # Aplicar limpieza básica
             df_clean = self.clean_basic_data(df)
             
+            data = file_info['data']
+            METRICS.record('parse', time.perf_counter() - start,
+                           bytes=data.getbuffer().nbytes if isinstance(data, BytesIO) else 0,
+                           rows_out=len(df_clean))
             return df_clean
             
         except Exception as e:
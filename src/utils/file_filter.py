@@ -0,0 +1,47 @@
+from datetime import datetime
+from fnmatch import fnmatch
+from typing import Dict, List, Optional
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Convierte una fecha ISO (como TimeLastModified de SharePoint) a datetime sin zona horaria"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=None)
+
+class FileFilter:
+    """Filtro de archivos por patrones glob sobre el nombre y fecha mínima de modificación"""
+    def __init__(self, globs: List[str] = None, modified_since: datetime = None):
+        self.globs = [glob.lower() for glob in globs or []]
+        self.modified_since = modified_since.replace(tzinfo=None) if modified_since else None
+
+    def __bool__(self) -> bool:
+        return bool(self.globs or self.modified_since)
+
+    def to_dict(self) -> Dict:
+        """Patrones y fecha mínima del filtro, serializables en JSON"""
+        return {
+            'files': sorted(self.globs),
+            'modified_since': self.modified_since.isoformat() if self.modified_since else None,
+        }
+
+    def matches(self, metadata: Dict) -> bool:
+        """
+        Indica si el archivo cumple el filtro
+
+        Args:
+            metadata (Dict): Metadatos del archivo (name, modified, ...)
+
+        Returns:
+            bool: True si el archivo debe procesarse
+        """
+        if self.globs and not any(fnmatch(metadata['name'].lower(), glob) for glob in self.globs):
+            return False
+        if self.modified_since:
+            modified = parse_datetime(metadata.get('modified'))
+            if modified is None or modified < self.modified_since:
+                return False
+        return True
@@ -1,31 +1,49 @@
 from datetime import datetime
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
 import logging
+import atexit
+import queue
 import os
+from utils.log_handlers import ContextFilter, JsonFormatter, RateLimitFilter
 
-def setup_logging(log_level: str = 'INFO', log_file: str = None) -> logging.Logger:
+# Listener que escribe en consola y archivo desde su propio hilo (uno por proceso)
+_listener: Optional[QueueListener] = None
+
+def setup_logging(log_level: str = 'INFO', log_file: str = None, log_format: str = 'text',
+                  rate_limit_burst: int = 50, rate_limit_interval: float = 10.0) -> logging.Logger:
     """
     Configura el sistema de logging
     
+    Los hilos del ETL solo encolan los registros (QueueHandler); un QueueListener los escribe
+    en consola y archivo, de modo que la E/S de los logs no bloquea descargas ni cargas.
+    
     Args:
         log_level (str): Nivel de logging
         log_file (str): Archivo de log (opcional)
+        log_format (str): 'text' o 'json' (un objeto JSON por línea en el archivo de log)
+        rate_limit_burst (int): Mensajes por punto del código y ventana antes de omitirlos (0: sin límite)
+        rate_limit_interval (float): Duración de la ventana del límite en segundos
     
     Returns:
         logging.Logger: Logger configurado
     """
+    global _listener
+    stop_logging()
+
     # Crear directorio de logs si no existe
-    if log_file:
+    if log_file and os.path.dirname(log_file):
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
     
     # Configurar formato
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    level = getattr(logging, log_level.upper())
     
     # Configurar logger principal
     logger = logging.getLogger()
-    logger.setLevel(getattr(logging, log_level.upper()))
+    logger.setLevel(level)
     
     # Limpiar handlers existentes
     for handler in logger.handlers[:]:
@@ -33,19 +51,70 @@ def setup_logging(log_level: str = 'INFO', log_file: str = None) -> logging.Logg
     
     # Handler para consola
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # Handler para archivo si se especifica
     if log_file:
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(getattr(logging, log_level.upper()))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setLevel(level)
+        file_handler.setFormatter(JsonFormatter() if log_format == 'json' else formatter)
+        handlers.append(file_handler)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    if rate_limit_burst:
+        queue_handler.addFilter(RateLimitFilter(rate_limit_burst, rate_limit_interval))
+    logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     return logger
 
+def stop_logging():
+    """Escribe los registros pendientes y detiene el listener de logging"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(stop_logging)
+
+def enable_copy_on_write():
+    """
+    Activa copy-on-write de pandas (siempre activo desde pandas 3.0).
+
+    Con copy-on-write, seleccionar columnas o filas, renombrar o hacer una copia
+    superficial (copy(deep=False)) no duplica los datos: solo se copia una columna
+    cuando se modifica. Los procesadores y el loader dependen de ello para no
+    modificar el DataFrame recibido sin hacer copias defensivas completas.
+    """
+    import pandas as pd
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+def atomic_write(path: str, content: str):
+    """
+    Escribe un archivo de texto de forma atómica: primero en <path>.tmp y luego lo
+    reemplaza, para que una interrupción no deje el archivo a medio escribir
+    
+    Args:
+        path (str): Archivo destino (se crea su directorio si no existe)
+        content (str): Contenido completo del archivo
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
 def validate_config(config: Dict[str, Any]) -> bool:
     """
     Valida la configuración del ETL
@@ -61,6 +130,9 @@ def validate_config(config: Dict[str, Any]) -> bool:
         'SHAREPOINT_USERNAME', 
         'SHAREPOINT_PASSWORD'
     ]
+    # El SharePoint local de pruebas no requiere credenciales
+    if config.get('SHAREPOINT_AUTH') == 'none':
+        required_keys = ['SHAREPOINT_SITE_URL']
     
     for key in required_keys:
         if not config.get(key):
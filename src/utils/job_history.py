@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Dict, Optional
+import threading
+import logging
+import json
+import os
+from utils.helpers import atomic_write
+
+class JobHistory:
+    """
+    Historial persistente (JSON) de duraciones de ejecución.
+
+    Guarda por procesador la duración de sus trabajos y los segundos por byte
+    descargado y, por archivo, el tamaño y los segundos de descarga y transformación.
+    Las duraciones se suavizan con una media móvil exponencial para que una ejecución
+    anómala no domine la predicción.
+    """
+    # Peso de la última ejecución en la media móvil
+    SMOOTHING = 0.5
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        data = self._read()
+        self.jobs: Dict[str, Dict] = data.get('jobs', {})
+        self.files: Dict[str, Dict] = data.get('files', {})
+
+    def _read(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Historial {self.path} ilegible, se ignora: {str(e)}")
+            return {}
+
+    def _smooth(self, previous: Optional[float], seconds: float) -> float:
+        if previous is None:
+            return seconds
+        return self.SMOOTHING * seconds + (1 - self.SMOOTHING) * previous
+
+    def _seconds_per_byte(self, processor_name: str) -> Optional[float]:
+        """Segundos por byte del procesador: de sus trabajos o, sin ellos, de sus archivos"""
+        entry = self.jobs.get(processor_name)
+        if entry and entry.get('seconds_per_byte'):
+            return entry['seconds_per_byte']
+        prefix = f"{processor_name}/"
+        size = seconds = 0
+        for key, file_entry in self.files.items():
+            if key.startswith(prefix) and file_entry.get('size'):
+                size += file_entry['size']
+                seconds += file_entry.get('download', 0) + file_entry.get('transform', 0)
+        return seconds / size if size and seconds else None
+
+    def predict(self, processor_name: str, pending_bytes: int = None) -> Optional[float]:
+        """
+        Duración esperada de un trabajo del procesador
+
+        Args:
+            processor_name (str): Nombre del procesador
+            pending_bytes (int): Tamaño de los archivos pendientes del trabajo (opcional);
+                con él la predicción es pending_bytes por los segundos por byte del historial
+
+        Returns:
+            Optional[float]: Segundos estimados, o None si no hay historial
+        """
+        with self._lock:
+            if pending_bytes is not None:
+                seconds_per_byte = self._seconds_per_byte(processor_name)
+                if seconds_per_byte is not None:
+                    return pending_bytes * seconds_per_byte
+            entry = self.jobs.get(processor_name)
+            return entry['seconds'] if entry else None
+
+    def record_job(self, processor_name: str, seconds: float, files: int = None, bytes_processed: int = 0):
+        """
+        Registra la duración de un trabajo completo del procesador
+
+        Args:
+            processor_name (str): Nombre del procesador
+            seconds (float): Duración del trabajo
+            files (int): Archivos procesados; un trabajo sin archivos (todos omitidos por el
+                manifiesto) no se registra, para no arrastrar la media hacia cero
+            bytes_processed (int): Bytes descargados, para los segundos por byte
+        """
+        if files == 0:
+            self.logger.debug(f"{processor_name} sin archivos procesados, no se registra en el historial")
+            return
+        with self._lock:
+            entry = self.jobs.setdefault(processor_name, {'runs': 0})
+            entry['seconds'] = round(self._smooth(entry.get('seconds'), seconds), 3)
+            entry['last_seconds'] = round(seconds, 3)
+            if bytes_processed:
+                entry['seconds_per_byte'] = self._smooth(entry.get('seconds_per_byte'), seconds / bytes_processed)
+            entry['runs'] += 1
+            entry['updated_at'] = datetime.now().isoformat(timespec='seconds')
+
+    def record_file(self, processor_name: str, metadata: Dict, stage: str, seconds: float):
+        """
+        Registra la duración de una etapa ('download', 'transform') para un archivo
+
+        Args:
+            processor_name (str): Nombre del procesador
+            metadata (Dict): Metadatos del archivo (name, size)
+            stage (str): Etapa medida
+            seconds (float): Duración en segundos
+        """
+        key = f"{processor_name}/{metadata['name']}"
+        with self._lock:
+            entry = self.files.setdefault(key, {})
+            if metadata.get('size'):
+                entry['size'] = metadata['size']
+            entry[stage] = round(self._smooth(entry.get(stage), seconds), 3)
+
+    def save(self):
+        """Guarda el historial de forma atómica"""
+        with self._lock:
+            data = {'jobs': self.jobs, 'files': self.files}
+            try:
+                atomic_write(self.path, json.dumps(data, ensure_ascii=False, indent=2))
+            except Exception as e:
+                self.logger.error(f"Error guardando historial {self.path}: {str(e)}")
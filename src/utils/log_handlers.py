@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+import threading
+import logging
+import json
+import time
+from utils.metrics import current_processor
+
+class lazy:
+    """
+    Argumento de logging que solo se calcula si el mensaje se emite:
+        logger.debug("Columnas: %s", lazy(lambda: list(df.columns)))
+    """
+    __slots__ = ('func',)
+
+    def __init__(self, func: Callable):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
+
+    __repr__ = __str__
+
+class ContextFilter(logging.Filter):
+    """Añade al registro el procesador en curso (se evalúa en el hilo que registra, no en el listener)"""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.processor = current_processor() or None
+        return True
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita los mensajes repetidos de un mismo punto del código (archivo y línea): como mucho
+    burst mensajes por ventana de interval segundos. Al abrirse la siguiente ventana, el primer
+    mensaje indica cuántos se omitieron. Los errores nunca se limitan.
+    """
+    def __init__(self, burst: int = 50, interval: float = 10.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        # (archivo, línea) -> [inicio de la ventana, emitidos, omitidos]
+        self._windows: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg} (+{suppressed} mensajes similares omitidos)"
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea con hora, nivel, logger, procesador, hilo, ubicación y mensaje"""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'processor': getattr(record, 'processor', None),
+            'thread': record.threadName,
+            'location': f"{record.module}:{record.lineno}",
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
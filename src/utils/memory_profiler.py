@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+import threading
+import tracemalloc
+import sys
+import os
+from utils.metrics import current_processor
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_MB = 1024 * 1024
+
+class MemoryBudgetExceeded(Exception):
+    """La memoria del proceso superó MEMORY_BUDGET_MB: la ejecución se detiene antes de un OOM kill"""
+
+def current_rss() -> int:
+    """Memoria residente actual del proceso, en bytes"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # Sin /proc (macOS, Windows): pico del proceso como aproximación
+        return peak_rss()
+
+def peak_rss() -> int:
+    """Pico de memoria residente del proceso desde su inicio, en bytes"""
+    if resource is None:
+        return psutil.Process().memory_info().peak_wset if psutil is not None else 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class MemoryProfiler:
+    """
+    Perfil de memoria por etapa de los procesadores (opt-in, MEMORY_PROFILE).
+
+    Alrededor de cada etapa registra la memoria residente antes y después, el pico
+    de RSS del proceso y, con tracemalloc, el pico de memoria asignada por Python
+    durante la etapa y los principales puntos de asignación. Con varios workers el
+    pico de tracemalloc incluye las asignaciones de etapas simultáneas.
+
+    Las etapas pueden anidarse (transform_data dentro de transform_file): cada etapa
+    reinicia el pico de tracemalloc para medirse, y al terminar traslada su pico a la
+    etapa que la contiene, cuyo pico es el máximo del suyo y el de sus etapas internas.
+
+    Con MEMORY_BUDGET_MB > 0 (aun sin perfil) cada límite de etapa verifica la RSS
+    y lanza MemoryBudgetExceeded si se superó el presupuesto.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.budget_bytes = 0
+        self.top = 5
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, str], Dict] = {}
+        # Etapas abiertas del hilo: [memoria al empezar, pico acumulado antes de reiniciar el de tracemalloc]
+        self._local = threading.local()
+
+    def configure(self, enabled: bool = False, budget_mb: int = 0, top: int = 5):
+        """
+        Activa el perfil de memoria y/o el presupuesto
+
+        Args:
+            enabled (bool): Registrar RSS y tracemalloc por etapa
+            budget_mb (int): Presupuesto de memoria residente en MB (0: sin límite)
+            top (int): Número de puntos de asignación a reportar por etapa
+        """
+        self.enabled = enabled
+        self.budget_bytes = int(budget_mb) * _MB
+        self.top = top
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or self.budget_bytes > 0
+
+    def check_budget(self, stage: str, rss: int = None):
+        """Lanza MemoryBudgetExceeded si la memoria residente supera el presupuesto"""
+        if not self.budget_bytes:
+            return
+        rss = current_rss() if rss is None else rss
+        if rss > self.budget_bytes:
+            processor = current_processor() or '-'
+            raise MemoryBudgetExceeded(
+                f"Presupuesto de memoria excedido en {processor}/{stage}: "
+                f"RSS {rss / _MB:.0f} MB > MEMORY_BUDGET_MB={self.budget_bytes // _MB}. "
+                f"Revisar la etapa en el reporte de memoria o usar ETL_MODE=streaming"
+            )
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mide la memoria de una etapa y verifica el presupuesto al inicio y al final"""
+        if not self.active:
+            yield
+            return
+
+        rss_before = current_rss()
+        self.check_budget(name, rss_before)
+        if self.enabled:
+            open_stages = self._open_stages()
+            current, peak = tracemalloc.get_traced_memory()
+            if open_stages:
+                # El pico de la etapa externa hasta ahora se conserva antes de reiniciarlo
+                open_stages[-1][1] = max(open_stages[-1][1], peak)
+            tracemalloc.reset_peak()
+            frame = [current, current]
+            open_stages.append(frame)
+        try:
+            yield
+        finally:
+            if self.enabled:
+                open_stages.pop()
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                if open_stages:
+                    open_stages[-1][1] = max(open_stages[-1][1], peak)
+        rss_after = current_rss()
+        if self.enabled:
+            self._record(name, rss_before, rss_after, peak - frame[0])
+        self.check_budget(name, rss_after)
+
+    def _open_stages(self) -> List[List[int]]:
+        if not hasattr(self._local, 'stages'):
+            self._local.stages = []
+        return self._local.stages
+
+    def profile(self, name: str):
+        """Decorador de métodos de BaseProcessor que mide su memoria como la etapa name"""
+        def decorator(method):
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return method(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _record(self, name: str, rss_before: int, rss_after: int, traced_peak: int):
+        key = (current_processor(), name)
+        with self._lock:
+            entry = self._stages.setdefault(key, {
+                'calls': 0, 'max_rss_mb': 0.0, 'max_rss_growth_mb': 0.0,
+                'max_traced_peak_mb': 0.0, 'top_allocations': []
+            })
+            entry['calls'] += 1
+            entry['max_rss_mb'] = max(entry['max_rss_mb'], round(rss_after / _MB, 1))
+            entry['max_rss_growth_mb'] = max(entry['max_rss_growth_mb'], round((rss_after - rss_before) / _MB, 1))
+            if traced_peak / _MB > entry['max_traced_peak_mb'] or not entry['top_allocations']:
+                entry['max_traced_peak_mb'] = round(max(traced_peak, 0) / _MB, 1)
+                entry['top_allocations'] = self._top_allocations()
+
+    def _top_allocations(self) -> List[Dict]:
+        """Principales líneas con memoria asignada al terminar la etapa"""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        return [
+            {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             'size_mb': round(stat.size / _MB, 2), 'blocks': stat.count}
+            for stat in snapshot.statistics('lineno')[:self.top]
+        ]
+
+    def reset(self):
+        """Descarta el perfil acumulado (p. ej. tras el reporte de cada revisión del modo vigilancia)"""
+        with self._lock:
+            self._stages.clear()
+
+    def get_report(self) -> Optional[Dict]:
+        """Perfil por procesador y etapa, más el pico de RSS del proceso (None si está desactivado)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            stages = [
+                {'processor': processor or None, 'stage': stage, **entry}
+                for (processor, stage), entry in sorted(self._stages.items())
+            ]
+        return {
+            'peak_rss_mb': round(peak_rss() / _MB, 1),
+            'budget_mb': self.budget_bytes // _MB or None,
+            'stages': stages,
+        }
+
+# Perfil del proceso, configurado desde main
+MEMORY = MemoryProfiler()
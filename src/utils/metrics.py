@@ -0,0 +1,159 @@
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+import threading
+import json
+
+# Procesador en curso: lo fija BaseProcessor para etiquetar las métricas de extractor, transformer y loader
+_current_processor: ContextVar[str] = ContextVar('etl_processor', default='')
+
+def current_processor() -> str:
+    """Procesador en curso en el hilo actual ('' fuera de un procesador)"""
+    return _current_processor.get()
+
+def processor_metrics(method):
+    """Decorador de métodos de BaseProcessor: etiqueta con el procesador las métricas registradas dentro"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        token = _current_processor.set(type(self).__name__)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _current_processor.reset(token)
+    return wrapper
+
+class StageMetric:
+    """Acumulado de una etapa para un procesador y tabla"""
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.rows_in = 0
+        self.rows_out = 0
+
+    def to_dict(self) -> Dict:
+        rows = self.rows_out or self.rows_in
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'seconds': round(self.seconds, 3),
+            'bytes': self.bytes,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_sec': round(rows / self.seconds, 1) if self.seconds else None,
+            'mb_per_sec': round(self.bytes / 1_048_576 / self.seconds, 3) if self.seconds and self.bytes else None,
+        }
+
+class MetricsRegistry:
+    """
+    Métricas por etapa (list, download, parse, transform, read_keys, load), procesador y tabla.
+
+    Las etapas se registran desde SharePointExtractor, ExcelTransformer, BaseProcessor y
+    DataLoader; el procesador se toma del contexto fijado por processor_metrics.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, str, str], StageMetric] = {}
+        self.started_at = datetime.now()
+
+    def record(self, stage: str, seconds: float, bytes: int = 0, rows_in: int = 0,
+               rows_out: int = 0, table: Optional[str] = None, error: bool = False):
+        """
+        Registra una ejecución de una etapa
+
+        Args:
+            stage (str): Nombre de la etapa
+            seconds (float): Duración en segundos
+            bytes (int): Bytes procesados
+            rows_in (int): Filas recibidas
+            rows_out (int): Filas producidas
+            table (str): Tabla destino (opcional)
+            error (bool): La etapa terminó con error
+        """
+        key = (stage, current_processor(), table or '')
+        with self._lock:
+            metric = self._stages.get(key)
+            if metric is None:
+                metric = self._stages[key] = StageMetric()
+            metric.calls += 1
+            metric.errors += int(error)
+            metric.seconds += seconds
+            metric.bytes += bytes or 0
+            metric.rows_in += rows_in or 0
+            metric.rows_out += rows_out or 0
+
+    def get_stages(self) -> List[Dict]:
+        """Métricas acumuladas, una entrada por etapa, procesador y tabla"""
+        with self._lock:
+            return [
+                {'stage': stage, 'processor': processor or None, 'table': table or None, **metric.to_dict()}
+                for (stage, processor, table), metric in sorted(self._stages.items())
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started_at = datetime.now()
+
+    def build_report(self, **extra) -> Dict:
+        """Reporte de la ejecución: duración, métricas por etapa y datos adicionales (resultados, pool...)"""
+        finished_at = datetime.now()
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': finished_at.isoformat(timespec='seconds'),
+            'duration_seconds': round((finished_at - self.started_at).total_seconds(), 3),
+            'stages': self.get_stages(),
+            **extra,
+        }
+
+    def write_report(self, path: str, report: Dict):
+        """Guarda el reporte de la ejecución en JSON"""
+        # utils.helpers importa (vía log_handlers) este módulo: se importa al usarlo
+        from utils.helpers import atomic_write
+        atomic_write(path, json.dumps(report, ensure_ascii=False, indent=2, default=str))
+
+    def write_textfile(self, path: str, report: Dict):
+        """
+        Guarda las métricas en formato de texto de Prometheus para el textfile collector
+        de node_exporter (escritura atómica, como exige el collector)
+        """
+        counters = [
+            ('etl_stage_calls_total', 'calls', 'Ejecuciones de la etapa'),
+            ('etl_stage_errors_total', 'errors', 'Ejecuciones de la etapa con error'),
+            ('etl_stage_seconds_total', 'seconds', 'Segundos en la etapa'),
+            ('etl_stage_bytes_total', 'bytes', 'Bytes procesados por la etapa'),
+            ('etl_stage_rows_in_total', 'rows_in', 'Filas recibidas por la etapa'),
+            ('etl_stage_rows_out_total', 'rows_out', 'Filas producidas por la etapa'),
+        ]
+        lines = []
+        for name, field, help_text in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for stage in report['stages']:
+                labels = _labels(stage=stage['stage'], processor=stage['processor'], table=stage['table'])
+                lines.append(f"{name}{{{labels}}} {stage[field]}")
+
+        results = report.get('results') or {}
+        lines += [
+            "# HELP etl_run_duration_seconds Duración de la última ejecución",
+            "# TYPE etl_run_duration_seconds gauge",
+            f"etl_run_duration_seconds {report['duration_seconds']}",
+            "# HELP etl_run_timestamp_seconds Fin de la última ejecución (epoch)",
+            "# TYPE etl_run_timestamp_seconds gauge",
+            f"etl_run_timestamp_seconds {datetime.fromisoformat(report['finished_at']).timestamp():.0f}",
+            "# HELP etl_folder_success Resultado de la última ejecución por carpeta (1 = éxito)",
+            "# TYPE etl_folder_success gauge",
+        ]
+        lines += [f"etl_folder_success{{{_labels(folder=folder)}}} {int(bool(ok))}" for folder, ok in results.items()]
+        from utils.helpers import atomic_write
+        atomic_write(path, "\n".join(lines) + "\n")
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value or '').replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+# Registro del proceso, compartido por todos los componentes y workers
+METRICS = MetricsRegistry()
@@ -0,0 +1,250 @@
+"""
+Historial de rendimiento por ejecución y alarmas de regresión por procesador y tabla.
+
+Cada ejecución añade una línea JSON con la duración, filas, bytes y filas/s de cada
+etapa, procesador y tabla del reporte de métricas, más el total por procesador. Una
+serie (procesador, tabla, etapa) se marca como regresión cuando la ejecución es más lenta
+que el percentil configurado de sus últimas ejecuciones: en milisegundos por fila si
+procesó filas (el volumen varía según los archivos que deja pasar el manifiesto) y en
+segundos si no.
+
+Tendencias y regresiones (desde src/):
+    python -m utils.perf_history --path data/metrics/perf_history.jsonl --processor TurismoVisitantesPaisProcessor
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import threading
+import argparse
+import logging
+import math
+import json
+import sys
+import os
+
+SeriesKey = Tuple[Optional[str], Optional[str], str]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil con interpolación lineal (como numpy.percentile por defecto)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def run_series(report: Dict) -> List[Dict]:
+    """
+    Series de una ejecución a partir del reporte de METRICS: una por etapa, procesador y
+    tabla, y una etapa 'total' por procesador con la suma de sus etapas
+    """
+    series = []
+    totals: Dict[str, Dict] = {}
+    for stage in report.get('stages', []):
+        rows = stage['rows_out'] or stage['rows_in']
+        series.append({
+            'processor': stage['processor'],
+            'table': stage['table'],
+            'stage': stage['stage'],
+            'seconds': stage['seconds'],
+            'rows': rows,
+            'bytes': stage['bytes'],
+            'rows_per_sec': stage['rows_per_sec'],
+        })
+        if stage['processor'] and stage['stage'] != 'throttled':
+            total = totals.setdefault(stage['processor'], {'seconds': 0.0, 'rows': 0, 'bytes': 0, 'table': None})
+            total['seconds'] += stage['seconds']
+            total['bytes'] += stage['bytes']
+            if stage['stage'] == 'load':
+                total['rows'] += rows
+                total['table'] = stage['table']
+    for processor, total in totals.items():
+        series.append({
+            'processor': processor,
+            'table': total['table'],
+            'stage': 'total',
+            'seconds': round(total['seconds'], 3),
+            'rows': total['rows'],
+            'bytes': total['bytes'],
+            'rows_per_sec': round(total['rows'] / total['seconds'], 1) if total['seconds'] else None,
+        })
+    return series
+
+def _key(entry: Dict) -> SeriesKey:
+    return (entry['processor'], entry['table'], entry['stage'])
+
+def cost(entry: Dict) -> Tuple[str, float]:
+    """Medida comparable de una ejecución: ('ms_per_row', ms por fila) con filas, si no ('seconds', s)"""
+    if entry.get('rows'):
+        return 'ms_per_row', entry['seconds'] * 1000 / entry['rows']
+    return 'seconds', entry['seconds']
+
+def previous_costs(entry: Dict, points: List[Dict], window: int) -> Tuple[str, float, List[float]]:
+    """Medida de la ejecución y la misma medida de las últimas window ejecuciones de su serie"""
+    metric, value = cost(entry)
+    previous = [point_value for point_metric, point_value in map(cost, points) if point_metric == metric]
+    return metric, value, previous[-window:] if window else previous
+
+class PerfHistory:
+    """
+    Historial local (JSONL, una línea por ejecución) de las métricas por etapa
+
+    Args:
+        path (str): Archivo del historial
+        window (int): Ejecuciones recientes de cada serie con las que se compara
+        pct (float): Percentil del historial a partir del cual una ejecución es regresión
+        min_runs (int): Ejecuciones previas necesarias para evaluar una serie
+        min_seconds (float): Duración mínima para evaluar (evita alarmas por etapas triviales)
+    """
+    def __init__(self, path: str, window: int = 20, pct: float = 90,
+                 min_runs: int = 5, min_seconds: float = 1.0):
+        self.path = path
+        self.window = window
+        self.pct = pct
+        self.min_runs = min_runs
+        self.min_seconds = min_seconds
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict]:
+        """Ejecuciones del historial, de la más antigua a la más reciente"""
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    # Una línea truncada (p. ej. por un corte durante la escritura) no invalida el resto
+                    self.logger.warning(f"Línea {number} del historial {self.path} ilegible, se ignora")
+        return runs
+
+    def history(self, runs: List[Dict] = None) -> Dict[SeriesKey, List[Dict]]:
+        """Puntos de cada serie (con run_id y fecha), en orden cronológico"""
+        series: Dict[SeriesKey, List[Dict]] = {}
+        for run in self.load() if runs is None else runs:
+            for entry in run['series']:
+                series.setdefault(_key(entry), []).append(
+                    {'run_id': run['run_id'], 'finished_at': run['finished_at'], **entry}
+                )
+        return series
+
+    def check(self, current: List[Dict], history: Dict[SeriesKey, List[Dict]]) -> List[Dict]:
+        """
+        Compara las series de una ejecución con su historial reciente
+
+        Args:
+            current (List[Dict]): Series de la ejecución (run_series)
+            history (Dict): Historial previo, sin la ejecución evaluada
+
+        Returns:
+            List[Dict]: Series más lentas que el percentil configurado de su historial, con
+                la medida comparada (metric: 'ms_per_row' o 'seconds') y su valor
+        """
+        regressions = []
+        for entry in current:
+            metric, value, previous = previous_costs(entry, history.get(_key(entry), []), self.window)
+            if len(previous) < self.min_runs or entry['seconds'] < self.min_seconds:
+                continue
+            threshold = percentile(previous, self.pct)
+            if value > threshold:
+                median = percentile(previous, 50)
+                regressions.append({
+                    'processor': entry['processor'],
+                    'table': entry['table'],
+                    'stage': entry['stage'],
+                    'seconds': entry['seconds'],
+                    'rows': entry.get('rows'),
+                    'metric': metric,
+                    'value': round(value, 4),
+                    f'p{self.pct:g}': round(threshold, 4),
+                    'p50': round(median, 4),
+                    'slowdown': round(value / median, 2) if median else None,
+                    'runs': len(previous),
+                })
+        return regressions
+
+    def record(self, run_id: str, report: Dict) -> List[Dict]:
+        """
+        Añade la ejecución al historial y devuelve sus regresiones frente a las anteriores
+
+        Args:
+            run_id (str): Identificador de la ejecución
+            report (Dict): Reporte de METRICS.build_report
+
+        Returns:
+            List[Dict]: Regresiones detectadas (ver check)
+        """
+        series = run_series(report)
+        with self._lock:
+            regressions = self.check(series, self.history())
+            run = {
+                'run_id': run_id,
+                'finished_at': report.get('finished_at') or datetime.now().isoformat(timespec='seconds'),
+                'duration_seconds': report.get('duration_seconds'),
+                'series': series,
+            }
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run, ensure_ascii=False, default=str) + '\n')
+        for regression in regressions:
+            self.logger.warning(
+                f"Regresión de rendimiento en {regression['processor'] or '-'}/{regression['table'] or '-'}"
+                f" ({regression['stage']}): {regression['metric']}={regression['value']} frente a p{self.pct:g}="
+                f"{regression[f'p{self.pct:g}']} de las últimas {regression['runs']} ejecuciones"
+            )
+        return regressions
+
+def parse_args(argv=None) -> argparse.Namespace:
+    from config.settings import (PERF_HISTORY_PATH, PERF_HISTORY_WINDOW, PERF_REGRESSION_PERCENTILE,
+                                 PERF_REGRESSION_MIN_RUNS, PERF_REGRESSION_MIN_SECONDS)
+    parser = argparse.ArgumentParser(description="Tendencias y regresiones de rendimiento por procesador y tabla")
+    parser.add_argument('--path', default=PERF_HISTORY_PATH, help="Historial JSONL")
+    parser.add_argument('--processor', action='append', default=[], help="Solo este procesador (puede repetirse)")
+    parser.add_argument('--table', action='append', default=[], help="Solo esta tabla (puede repetirse)")
+    parser.add_argument('--stage', action='append', default=[], help="Solo esta etapa (por defecto 'total' y 'load')")
+    parser.add_argument('--all-stages', action='store_true', help="Muestra todas las etapas")
+    parser.add_argument('--last', type=int, default=10, help="Ejecuciones recientes a mostrar por serie")
+    parser.add_argument('--window', type=int, default=PERF_HISTORY_WINDOW)
+    parser.add_argument('--percentile', type=float, default=PERF_REGRESSION_PERCENTILE)
+    parser.add_argument('--min-runs', type=int, default=PERF_REGRESSION_MIN_RUNS)
+    parser.add_argument('--min-seconds', type=float, default=PERF_REGRESSION_MIN_SECONDS)
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Sale con código 1 si la última ejecución de alguna serie es una regresión")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    store = PerfHistory(args.path, args.window, args.percentile, args.min_runs, args.min_seconds)
+    stages = set(args.stage) or (None if args.all_stages else {'total', 'load'})
+
+    regressions = 0
+    label = f"p{args.percentile:g}"
+    print(f"{'procesador':<40} {'tabla':<32} {'etapa':<10} {'ejec':>5} {'medida':>10} {'p50':>8} {label:>8} "
+          f"{'última':>9} {'última s':>9} {'filas/s':>10}  tendencia")
+    for (processor, table, stage), points in sorted(store.history().items(), key=lambda item: tuple(map(str, item[0]))):
+        if args.processor and processor not in args.processor:
+            continue
+        if args.table and table not in args.table:
+            continue
+        if stages and stage not in stages:
+            continue
+        last = points[-1]
+        previous = points[:-1]
+        metric, value, window = previous_costs(last, previous, args.window)
+        flagged = store.check([last], {(processor, table, stage): previous})
+        regressions += len(flagged)
+        p50 = f"{percentile(window, 50):.4g}" if window else '-'
+        threshold = f"{percentile(window, args.percentile):.4g}" if window else '-'
+        trend = ' '.join(f"{cost(point)[1]:.4g}" for point in points[-args.last:])
+        print(f"{processor or '-':<40} {table or '-':<32} {stage:<10} {len(points):>5} {metric:>10} {p50:>8} "
+              f"{threshold:>8} {value:>9.4g} {last['seconds']:>9.3f} {last['rows_per_sec'] or '-':>10}  {trend}"
+              f"{'  << REGRESIÓN (' + last['run_id'] + ')' if flagged else ''}")
+    if regressions:
+        print(f"{regressions} series con regresión en su última ejecución")
+    return 1 if regressions and args.fail_on_regression else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
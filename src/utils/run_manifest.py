@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Dict, Optional
+import threading
+import logging
+import json
+import os
+from utils.helpers import atomic_write
+
+class RunManifest:
+    """
+    Manifiesto persistente (JSON) de los archivos cargados en ejecuciones anteriores.
+
+    Por cada archivo guarda fecha de modificación, ETag y tamaño, junto con los
+    procesadores/tablas en los que se cargó con éxito. Un archivo cuyo ETag (o fecha
+    y tamaño) no cambió y que ya fue cargado por el procesador se omite por completo.
+    """
+    def __init__(self, path: str, force: bool = False):
+        self.path = path
+        self.force = force
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.files: Dict[str, Dict] = self._read()
+
+    def _read(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except Exception as e:
+            self.logger.warning(f"Manifiesto {self.path} ilegible, se ignora: {str(e)}")
+            return {}
+
+    def _save(self):
+        # Reemplazo atómico para no dejar el manifiesto a medio escribir
+        atomic_write(self.path, json.dumps({'files': self.files}, ensure_ascii=False, indent=2))
+
+    @staticmethod
+    def _key(folder_path: str, file_name: str) -> str:
+        return f"{folder_path}/{file_name}" if folder_path else file_name
+
+    @staticmethod
+    def _same_version(entry: Dict, metadata: Dict) -> bool:
+        if metadata.get('etag') and entry.get('etag'):
+            return metadata['etag'] == entry['etag']
+        if metadata.get('modified') is None:
+            return False
+        return (metadata.get('modified'), metadata.get('size')) == (entry.get('modified'), entry.get('size'))
+
+    def get_entry(self, folder_path: str, file_name: str) -> Optional[Dict]:
+        with self._lock:
+            return self.files.get(self._key(folder_path, file_name))
+
+    def is_unchanged(self, folder_path: str, metadata: Dict, processor_name: str) -> bool:
+        """
+        Indica si el archivo no cambió desde que el procesador lo cargó
+
+        Args:
+            folder_path (str): Carpeta del archivo
+            metadata (Dict): Metadatos actuales (name, modified, etag, size)
+            processor_name (str): Nombre del procesador
+
+        Returns:
+            bool: True si puede omitirse
+        """
+        if self.force:
+            return False
+        entry = self.get_entry(folder_path, metadata['name'])
+        if not entry or processor_name not in entry.get('loads', {}):
+            return False
+        return self._same_version(entry, metadata)
+
+    def rows_per_byte(self, processor_name: str) -> Optional[float]:
+        """Filas cargadas por byte de archivo en cargas anteriores del procesador (para estimaciones)"""
+        total_rows = 0
+        total_bytes = 0
+        with self._lock:
+            for entry in self.files.values():
+                load = entry.get('loads', {}).get(processor_name)
+                if load and entry.get('size'):
+                    total_rows += load.get('rows', 0)
+                    total_bytes += entry['size']
+        return total_rows / total_bytes if total_bytes else None
+
+    def record_load(self, folder_path: str, metadata: Dict, processor_name: str,
+                    table_name: str, rows: int):
+        """Registra que el archivo se cargó con éxito en la tabla del procesador"""
+        key = self._key(folder_path, metadata['name'])
+        with self._lock:
+            entry = self.files.get(key)
+            if entry is None or not self._same_version(entry, metadata):
+                # Nueva versión del archivo: las cargas anteriores ya no aplican
+                entry = {'loads': {}}
+            entry.update({
+                'modified': metadata.get('modified'),
+                'etag': metadata.get('etag'),
+                'size': metadata.get('size'),
+            })
+            entry['loads'][processor_name] = {
+                'table': table_name,
+                'rows': rows,
+                'loaded_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self.files[key] = entry
+            try:
+                self._save()
+            except Exception as e:
+                self.logger.error(f"Error guardando manifiesto {self.path}: {str(e)}")
@@ -0,0 +1,247 @@
+"""
+Trazas ligeras por etapa (spans) con identificadores de ejecución y de archivo.
+
+Cada span se escribe como una línea JSON con los campos de OpenTelemetry (trace_id,
+span_id, parent_span_id, tiempos en nanosegundos, atributos y estado). Todos los spans
+de una ejecución comparten trace_id y los que procesan un archivo llevan su etl.file_id,
+de modo que su descarga, lectura, transformación y carga se pueden reunir aunque
+ocurran en hilos distintos. Con TRACING_OTEL y opentelemetry-api instalado, los spans
+también se envían al TracerProvider configurado (OTLP, Jaeger, etc.).
+
+Resumen por archivo de una traza (desde src/):
+    python -m utils.tracing data/traces/<run_id>.jsonl
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import wraps
+from typing import Dict, List, Optional
+import threading
+import hashlib
+import logging
+import json
+import time
+import uuid
+import sys
+import os
+from utils.metrics import current_processor
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('etl_span', default=None)
+# Archivos cuyos datos procesa el bloque actual (un archivo al transformar, varios al cargar un lote)
+_current_files: ContextVar[tuple] = ContextVar('etl_files', default=())
+
+def file_id(folder_path: str, metadata: Dict) -> str:
+    """Identificador estable de una versión de un archivo: carpeta, nombre y ETag (o fecha)"""
+    version = metadata.get('etag') or metadata.get('modified') or ''
+    return hashlib.sha1(f"{folder_path}/{metadata['name']}|{version}".encode('utf-8')).hexdigest()[:16]
+
+class Span:
+    __slots__ = ('name', 'span_id', 'parent_id', 'attributes', 'start_ns', 'end_ns', 'error')
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set(self, **attributes):
+        """Añade atributos conocidos al terminar la etapa (bytes, filas...)"""
+        self.attributes.update(attributes)
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.run_id = None
+        self.trace_id = None
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._file = None
+        self._otel = None
+
+    def configure(self, enabled: bool = False, path: str = None, run_id: str = None, otel: bool = False):
+        """
+        Activa las trazas de la ejecución
+
+        Args:
+            enabled (bool): Registrar spans
+            path (str): Archivo JSONL de la ejecución
+            run_id (str): Identificador de la ejecución (etl.run_id en cada span)
+            otel (bool): Enviar también los spans a OpenTelemetry si está instalado
+        """
+        self.close()
+        self.enabled = enabled and bool(path)
+        if not self.enabled:
+            return
+        self.path = path
+        self.run_id = run_id
+        self.trace_id = uuid.uuid4().hex
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        if otel:
+            if otel_trace is None:
+                self.logger.warning("TRACING_OTEL activo pero opentelemetry-api no está instalado")
+            else:
+                self._otel = otel_trace.get_tracer('etl_sharepoint')
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Registra el bloque como un span hijo del span actual del hilo
+
+        Args:
+            name (str): Nombre de la etapa (download_file, read_excel_file, to_sql...)
+            **attributes: Atributos iniciales (file, table, rows...)
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        files = _current_files.get()
+        if files and 'etl.file_id' not in attributes:
+            attributes['etl.file_ids'] = list(files)
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        otel_cm = self._otel.start_as_current_span(name) if self._otel else None
+        otel_span = otel_cm.__enter__() if otel_cm else None
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            if otel_cm:
+                otel_span.set_attributes(_otel_attributes(span.attributes))
+                if span.error:
+                    otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, span.error))
+                otel_cm.__exit__(None, None, None)
+            self._export(span)
+
+    @contextmanager
+    def files(self, *file_ids: str):
+        """Asocia a los spans del bloque los archivos cuyos datos se procesan"""
+        token = _current_files.set(tuple(file_id for file_id in file_ids if file_id))
+        try:
+            yield
+        finally:
+            _current_files.reset(token)
+
+    def wrap(self, func):
+        """Ejecuta func en otro hilo conservando el span y los archivos actuales como contexto"""
+        if not self.enabled:
+            return func
+        context = copy_context()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Un mismo Context no puede usarse en dos hilos a la vez: una copia por llamada
+            return context.copy().run(func, *args, **kwargs)
+        return wrapper
+
+    def _export(self, span: Span):
+        record = {
+            'trace_id': self.trace_id,
+            'span_id': span.span_id,
+            'parent_span_id': span.parent_id,
+            'name': span.name,
+            'start_time_unix_nano': span.start_ns,
+            'end_time_unix_nano': span.end_ns,
+            'duration_ms': round((span.end_ns - span.start_ns) / 1e6, 3),
+            'status': 'ERROR' if span.error else 'OK',
+            'error': span.error,
+            'thread': threading.current_thread().name,
+            'attributes': {'etl.run_id': self.run_id, 'etl.processor': current_processor() or None, **span.attributes},
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class _NoopSpan:
+    def set(self, **attributes):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+def _otel_attributes(attributes: Dict) -> Dict:
+    """OpenTelemetry solo admite atributos primitivos o listas de primitivos"""
+    result = {}
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = [str(item) for item in value]
+        elif not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+        result[key] = value
+    return result
+
+def file_paths(path: str) -> Dict[tuple, Dict]:
+    """
+    Reconstruye por archivo y procesador la secuencia de etapas de una traza JSONL
+
+    Returns:
+        Dict[tuple, Dict]: (file_id, procesador) -> nombre, segundos por etapa e inicio/fin de su recorrido
+    """
+    files: Dict[tuple, Dict] = {}
+    by_id = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+    for span in spans:
+        by_id[span['span_id']] = span
+
+    def ids_of(span) -> List[str]:
+        attributes = span['attributes']
+        if attributes.get('etl.file_id'):
+            return [attributes['etl.file_id']]
+        if attributes.get('etl.file_ids'):
+            return attributes['etl.file_ids']
+        parent = by_id.get(span['parent_span_id'])
+        return ids_of(parent) if parent else []
+
+    for span in spans:
+        processor = span['attributes'].get('etl.processor')
+        for fid in ids_of(span):
+            entry = files.setdefault((fid, processor), {'file': None, 'stages': defaultdict(float), 'start': None, 'end': None})
+            entry['file'] = entry['file'] or span['attributes'].get('file')
+            entry['stages'][span['name']] += span['duration_ms'] / 1000
+            start, end = span['start_time_unix_nano'], span['end_time_unix_nano']
+            entry['start'] = start if entry['start'] is None else min(entry['start'], start)
+            entry['end'] = end if entry['end'] is None else max(entry['end'], end)
+    return files
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Uso: python -m utils.tracing <traza.jsonl>")
+        return 1
+    files = file_paths(argv[0])
+    for (fid, processor), entry in sorted(files.items(), key=lambda item: item[1]['end'] - item[1]['start'], reverse=True):
+        elapsed = (entry['end'] - entry['start']) / 1e9
+        stages = ', '.join(f"{name} {seconds:.3f}s" for name, seconds in entry['stages'].items())
+        print(f"{entry['file'] or fid} [{processor}]: {elapsed:.3f}s de principio a fin | {stages}")
+    return 0
+
+# Trazas del proceso, configuradas desde main
+TRACER = Tracer()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Reglas de validación declarativas por procesador.
+
+Cada procesador declara sus reglas (get_validation_rules) y las aplica con
+apply_validation_rules: todas se evalúan sobre el mismo DataFrame, se combinan en una
+sola máscara y se filtra una única vez, en lugar de encadenar un filtro (y una copia)
+por condición. Se registra cuántas filas rechaza cada regla y, con
+VALIDATION_QUARANTINE_PATH, una muestra de las filas rechazadas con las reglas que
+incumplen.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+import threading
+import logging
+import time
+import os
+import numpy as np
+import pandas as pd
+from utils.metrics import METRICS
+
+class Rule(ABC):
+    """Regla sobre una columna; las reglas de columnas ausentes se omiten"""
+    def __init__(self, column: str):
+        self.column = column
+
+    @abstractmethod
+    def invalid(self, values: pd.Series) -> np.ndarray:
+        """Máscara de filas que incumplen la regla"""
+        pass
+
+    def __str__(self) -> str:
+        return f"{type(self).__name__}({self.column})"
+
+class NotNull(Rule):
+    """La columna no puede ser nula"""
+    def invalid(self, values: pd.Series) -> np.ndarray:
+        return values.isna().to_numpy()
+
+    def __str__(self) -> str:
+        return f"{self.column} no nulo"
+
+class NotEmpty(Rule):
+    """La columna no puede ser nula ni uno de los valores que representan vacío"""
+    def __init__(self, column: str, empty: Iterable[str] = ('', 'nan', 'None')):
+        super().__init__(column)
+        self.empty = list(empty)
+
+    def invalid(self, values: pd.Series) -> np.ndarray:
+        return (values.isna() | values.isin(self.empty)).to_numpy()
+
+    def __str__(self) -> str:
+        return f"{self.column} no vacío"
+
+class InSet(Rule):
+    """La columna debe tomar uno de los valores permitidos"""
+    def __init__(self, column: str, values: Iterable):
+        super().__init__(column)
+        self.values = list(values)
+
+    def invalid(self, values: pd.Series) -> np.ndarray:
+        return (~values.isin(self.values)).to_numpy()
+
+    def __str__(self) -> str:
+        return f"{self.column} en conjunto válido"
+
+class NumericRange(Rule):
+    """La columna debe ser numérica y estar en [minimum, maximum] (límites opcionales)"""
+    def __init__(self, column: str, minimum: float = None, maximum: float = None):
+        super().__init__(column)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def invalid(self, values: pd.Series) -> np.ndarray:
+        numbers = pd.to_numeric(values, errors='coerce').astype(float)
+        invalid = numbers.isna()
+        if self.minimum is not None:
+            invalid |= numbers < self.minimum
+        if self.maximum is not None:
+            invalid |= numbers > self.maximum
+        return invalid.to_numpy()
+
+    def __str__(self) -> str:
+        low = '' if self.minimum is None else self.minimum
+        high = '' if self.maximum is None else self.maximum
+        return f"{self.column} en [{low}, {high}]"
+
+class NonNegative(NumericRange):
+    """La columna debe ser numérica y mayor o igual que cero"""
+    def __init__(self, column: str):
+        super().__init__(column, minimum=0)
+
+    def __str__(self) -> str:
+        return f"{self.column} >= 0"
+
+class ValidationEngine:
+    """
+    Aplica reglas en una sola pasada y acumula los rechazos por procesador y regla.
+
+    Con cuarentena activa, una muestra de hasta sample_size filas rechazadas por
+    llamada se añade a <quarantine_dir>/<procesador>.csv con la columna _rules.
+    """
+    def __init__(self):
+        self.quarantine_dir = None
+        self.sample_size = 100
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._rejections: Dict[str, Dict[str, int]] = {}
+        self._quarantined: Dict[str, int] = {}
+
+    def configure(self, quarantine_dir: str = None, sample_size: int = 100):
+        """
+        Configura la cuarentena de filas rechazadas
+
+        Args:
+            quarantine_dir (str): Directorio de la ejecución para las muestras (None: sin cuarentena)
+            sample_size (int): Filas rechazadas a guardar por llamada (0: sin cuarentena)
+        """
+        self.quarantine_dir = quarantine_dir if sample_size > 0 else None
+        self.sample_size = sample_size
+
+    def apply(self, df: pd.DataFrame, rules: List[Rule], processor: str,
+              table: Optional[str] = None) -> pd.DataFrame:
+        """
+        Filtra las filas que incumplen alguna regla
+
+        Args:
+            df (pd.DataFrame): Datos ya normalizados
+            rules (List[Rule]): Reglas a aplicar (se omiten las de columnas ausentes)
+            processor (str): Procesador, para el log, el reporte y la cuarentena
+            table (str): Tabla destino, para las métricas
+
+        Returns:
+            pd.DataFrame: Filas válidas (el mismo DataFrame si no se rechaza ninguna)
+        """
+        active = [rule for rule in rules if rule.column in df.columns]
+        if df.empty or not active:
+            return df
+
+        start = time.perf_counter()
+        rows_in = len(df)
+        rejected = np.zeros(rows_in, dtype=bool)
+        masks = []
+        for rule in active:
+            invalid = rule.invalid(df[rule.column])
+            masks.append((rule, invalid))
+            rejected |= invalid
+
+        counts = {str(rule): int(invalid.sum()) for rule, invalid in masks}
+        for rule, count in counts.items():
+            if count:
+                self.logger.info(f"Filtradas {count} filas por la regla {rule}")
+
+        total = int(rejected.sum())
+        if total:
+            self._quarantine(df, rejected, masks, processor)
+            df = df[~rejected]
+        METRICS.record('validate', time.perf_counter() - start, rows_in=rows_in, rows_out=len(df), table=table)
+
+        with self._lock:
+            entry = self._rejections.setdefault(processor, {})
+            for rule, count in counts.items():
+                entry[rule] = entry.get(rule, 0) + count
+        return df
+
+    def _quarantine(self, df: pd.DataFrame, rejected: np.ndarray, masks: List, processor: str):
+        if not self.quarantine_dir:
+            return
+        positions = np.flatnonzero(rejected)
+        if len(positions) > self.sample_size:
+            positions = np.sort(np.random.default_rng(0).choice(positions, self.sample_size, replace=False))
+        sample = df.iloc[positions].assign(
+            _rules=['; '.join(str(rule) for rule, invalid in masks if invalid[position]) for position in positions]
+        )
+        path = os.path.join(self.quarantine_dir, f"{processor}.csv")
+        try:
+            with self._lock:
+                os.makedirs(self.quarantine_dir, exist_ok=True)
+                sample.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+                self._quarantined[path] = self._quarantined.get(path, 0) + len(sample)
+        except Exception as e:
+            self.logger.warning(f"No se pudo escribir la cuarentena {path}: {str(e)}")
+
+    def reset(self):
+        """Descarta los rechazos acumulados (p. ej. tras el reporte de cada revisión del modo vigilancia)"""
+        with self._lock:
+            self._rejections.clear()
+            self._quarantined.clear()
+
+    def get_report(self) -> Optional[Dict]:
+        """Filas rechazadas por procesador y regla, y archivos de cuarentena (None si no hubo validación)"""
+        with self._lock:
+            if not self._rejections:
+                return None
+            return {
+                'rejections': {processor: dict(rules) for processor, rules in self._rejections.items()},
+                'quarantine': dict(self._quarantined),
+            }
+
+# Validación del proceso, configurada desde main
+VALIDATION = ValidationEngine()
@@ -0,0 +1,102 @@
+import logging
+import time
+from typing import Callable, Dict, Tuple
+from processors import ProcessorFactory
+from utils.memory_profiler import MemoryBudgetExceeded
+
+class FolderWatcher:
+    """
+    Modo de vigilancia: mantiene la sesión de SharePoint y el pool de la BD abiertos
+    y consulta periódicamente los metadatos de las carpetas, ejecutando solo los
+    procesadores de las carpetas que cambiaron.
+    """
+    def __init__(self, etl_manager, base_folder: str, interval: int = 300,
+                 on_poll: Callable[[Dict[str, bool]], None] = None):
+        self.etl_manager = etl_manager
+        self.base_folder = base_folder
+        self.interval = interval
+        # Se llama tras cada revisión que procesó carpetas, con sus resultados (p. ej. para el reporte)
+        self.on_poll = on_poll
+        self.logger = logging.getLogger(__name__)
+        # Última versión observada de cada carpeta: folder_path -> firma de sus archivos
+        self.snapshots: Dict[str, Tuple] = {}
+        # Último resultado de cada carpeta procesada
+        self.results: Dict[str, bool] = {}
+
+    def _folder_signature(self, folder_path: str) -> Tuple:
+        """Firma de la carpeta a partir de nombre, ETag, fecha y tamaño de sus archivos"""
+        files = self.etl_manager.extractor.list_files_metadata(folder_path)
+        return tuple(sorted(
+            (f['name'], f.get('etag') or '', f.get('modified') or '', f.get('size') or 0)
+            for f in files
+        ))
+
+    def poll_once(self) -> Dict[str, bool]:
+        """
+        Revisa las carpetas una vez y procesa las que cambiaron desde la última revisión.
+        En la primera pasada todas las carpetas se consideran cambiadas; el manifiesto
+        de ejecuciones omite los archivos que ya estaban cargados.
+
+        Returns:
+            Dict[str, bool]: Resultado por carpeta procesada
+        """
+        extractor = self.etl_manager.extractor
+        folder_details = extractor.get_folder_details(self.base_folder)
+        if not folder_details:
+            self.logger.error("No se pudo obtener la estructura de carpetas, se reconectará en la próxima revisión")
+            self.etl_manager.reset_connections()
+            return {}
+
+        registered = ProcessorFactory.list_processors()
+        changed = []
+        for subfolder in folder_details.subfolders:
+            if subfolder.name not in registered:
+                continue
+            signature = self._folder_signature(subfolder.path)
+            if signature != self.snapshots.get(subfolder.path):
+                changed.append((subfolder.name, subfolder.path, signature))
+
+        if not changed:
+            self.logger.info("Sin cambios en las carpetas vigiladas")
+            return {}
+
+        self.logger.info(f"Carpetas con cambios: {[name for name, _, _ in changed]}")
+        results = self.etl_manager.process_folders([(name, path) for name, path, _ in changed])
+        self.results.update(results)
+
+        # Solo se actualiza la firma de las carpetas procesadas con éxito, para reintentar las fallidas
+        for name, path, signature in changed:
+            if results.get(name):
+                self.snapshots[path] = signature
+
+        return results
+
+    def run(self, once: bool = False):
+        """
+        Ejecuta el ciclo de vigilancia
+
+        Args:
+            once (bool): Realiza una sola pasada de puesta al día y termina
+        """
+        self.logger.info(
+            f"Vigilando {self.base_folder} " + ("(pasada única)" if once else f"cada {self.interval}s")
+        )
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    results = self.poll_once()
+                    if results and self.on_poll:
+                        self.on_poll(results)
+                except MemoryBudgetExceeded:
+                    # Reintentar en la siguiente revisión volvería a exceder el presupuesto
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Error en la revisión de carpetas: {str(e)}", exc_info=True)
+                    self.etl_manager.reset_connections()
+
+                if once:
+                    return
+                time.sleep(max(0.0, self.interval - (time.monotonic() - start)))
+        except KeyboardInterrupt:
+            self.logger.info("Vigilancia detenida")
@@ -0,0 +1,10 @@
+"""
+Configuración común de las pruebas: los módulos se importan desde src/, como al ejecutar
+python src/main.py.
+"""
+import sys
+import os
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,42 @@
+import logging
+from processors.comercio_servicios_processor import ComercioServiciosProcessor
+from processors.pais_acuerdos import PaisAcuerdosProcessor
+from utils.file_filter import FileFilter
+
+FILES = [
+    {'name': 'Código País Acuerdos 2023.xlsx', 'modified': '2023-01-10T00:00:00Z', 'size': 100},
+    {'name': 'Código País Acuerdos 2024.xlsx', 'modified': '2024-01-10T00:00:00Z', 'size': 100},
+    {'name': 'DANE Datos_EMCES 2023.xlsx', 'modified': '2023-01-10T00:00:00Z', 'size': 100},
+    {'name': 'DANE Datos_EMCES 2024.xlsx', 'modified': '2024-01-10T00:00:00Z', 'size': 100},
+]
+
+class FakeExtractor:
+    """Carpeta de SharePoint en memoria: lista FILES y no descarga nada"""
+    def list_files_metadata(self, folder_path):
+        return [dict(metadata) for metadata in FILES]
+
+    def download_file(self, folder_path, file_name):
+        return None
+
+def _processor(processor_class, file_filter=None):
+    return processor_class(FakeExtractor(), None, None, logging.getLogger('tests'), file_filter=file_filter)
+
+def test_file_filter_applies_to_incremental_processors():
+    processor = _processor(ComercioServiciosProcessor, FileFilter(['*2024*']))
+
+    names = [metadata['name'] for metadata in processor.list_matching_files('folder')]
+
+    # El patrón 'xlsx' de ComercioServicios coincide con todos los libros; el filtro deja los de 2024
+    assert names == ['Código País Acuerdos 2024.xlsx', 'DANE Datos_EMCES 2024.xlsx']
+
+def test_file_filter_is_ignored_for_full_refresh_processors():
+    processor = _processor(PaisAcuerdosProcessor, FileFilter(['*2024*']))
+
+    names = [metadata['name'] for metadata in processor.list_matching_files('folder')]
+
+    assert names == ['Código País Acuerdos 2023.xlsx', 'Código País Acuerdos 2024.xlsx']
+
+def test_streaming_reports_failure_when_a_download_fails():
+    processor = _processor(ComercioServiciosProcessor)
+
+    assert processor.process_folder_streaming('folder') is False
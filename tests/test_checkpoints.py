@@ -0,0 +1,29 @@
+from io import BytesIO
+from utils.checkpoints import CheckpointStore
+
+def _files():
+    return [{'name': 'libro.xlsx', 'path': '/Turismo', 'data': BytesIO(b'contenido')}]
+
+def test_checkpoint_is_resumed_with_the_same_options(tmp_path):
+    options = {'files': ['*2024*'], 'modified_since': None, 'force': False}
+    store = CheckpointStore.resume_or_create(str(tmp_path), options=options)
+    store.for_processor('TurismoProcessor').save_files(_files())
+
+    resumed = CheckpointStore.resume_or_create(str(tmp_path), options=dict(options))
+    checkpoint = resumed.for_processor('TurismoProcessor')
+
+    assert resumed.run_id == store.run_id
+    assert checkpoint.get_stage() == 'extracted'
+    assert checkpoint.load_files()[0]['data'].read() == b'contenido'
+
+def test_checkpoint_with_other_options_is_discarded(tmp_path):
+    options = {'files': ['*2024*'], 'modified_since': None, 'force': False}
+    store = CheckpointStore.resume_or_create(str(tmp_path), options=options)
+    store.for_processor('TurismoProcessor').save_files(_files())
+
+    # Misma ejecución retomada con --force
+    resumed = CheckpointStore.resume_or_create(str(tmp_path), options={**options, 'force': True})
+    checkpoint = resumed.for_processor('TurismoProcessor')
+
+    assert checkpoint.get_stage() is None
+    assert not (tmp_path / store.run_id / 'TurismoProcessor').exists()
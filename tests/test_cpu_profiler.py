@@ -0,0 +1,26 @@
+from utils.cpu_profiler import CpuProfiler
+
+def _busy():
+    return sum(index * index for index in range(20000))
+
+def test_single_worker_profile_writes_pstats(tmp_path):
+    profiler = CpuProfiler()
+    profiler.configure(enabled=True, output_dir=str(tmp_path))
+
+    with profiler.profile('4-Turismo/TurismoProcessor'):
+        _busy()
+
+    entry = profiler.get_report()['jobs']['4-Turismo/TurismoProcessor']
+    assert (tmp_path / '4-Turismo__TurismoProcessor.pstats').exists()
+    assert 'top' in entry
+
+def test_several_workers_use_only_the_stack_sampler(tmp_path):
+    profiler = CpuProfiler()
+    profiler.configure(enabled=True, output_dir=str(tmp_path), deterministic=False)
+
+    with profiler.profile('4-Turismo/TurismoProcessor'):
+        _busy()
+
+    entry = profiler.get_report()['jobs']['4-Turismo/TurismoProcessor']
+    assert 'pstats' not in entry
+    assert (tmp_path / '4-Turismo__TurismoProcessor.collapsed').exists()
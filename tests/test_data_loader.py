@@ -0,0 +1,81 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+from loaders.connection_pool import ConnectionPool
+from loaders.data_loader import DataLoader, _composite_key
+
+KEY_COLUMNS = ['cod_pais', 'serie', 'fecha', 'flujo']
+
+def _ied_frame() -> pd.DataFrame:
+    """Salida con la forma de IedPaisOrigenProcessor: 'fecha' como Timestamp"""
+    return pd.DataFrame({
+        'cod_pais': ['CO', 'CO', 'US'],
+        'serie': ['Total', 'Total', 'Total'],
+        'fecha': pd.to_datetime(['31/03/2020', '30/06/2020', '31/03/2020'], format='%d/%m/%Y'),
+        'valor': [10.5, 20.25, 30.0],
+        'flujo': ['Ext en Col'] * 3,
+    })
+
+@pytest.fixture
+def loader(tmp_path):
+    loader = DataLoader({'url': f"sqlite:///{tmp_path / 'etl.db'}"})
+    yield loader
+    ConnectionPool.dispose_all()
+
+def test_second_load_of_same_frame_inserts_nothing(loader):
+    df = _ied_frame()
+    assert loader.insert_new_data('ban_rep_inversion', df, KEY_COLUMNS)
+
+    existing = loader.get_existing_data('ban_rep_inversion', KEY_COLUMNS)
+    assert len(existing) == len(df)
+    assert loader.identify_new_records(df, existing, KEY_COLUMNS).empty
+
+    assert loader.insert_new_data('ban_rep_inversion', df, KEY_COLUMNS)
+    assert len(loader.get_existing_data('ban_rep_inversion', KEY_COLUMNS)) == len(df)
+
+def test_timestamp_keys_match_date_values_from_database(loader):
+    # MySQL devuelve las columnas DATE como datetime.date
+    df = _ied_frame()
+    existing = df[KEY_COLUMNS].astype({'fecha': object})
+    existing['fecha'] = [date(2020, 3, 31), date(2020, 6, 30), date(2020, 3, 31)]
+
+    new_records = loader.identify_new_records(df, existing.iloc[:2], KEY_COLUMNS)
+
+    assert new_records['cod_pais'].tolist() == ['US']
+
+def _apply_key(df: pd.DataFrame, key_columns) -> list:
+    """
+    Clave de la implementación anterior: cada fila convertida a texto con apply. Con pandas 3
+    row.astype(str) conserva los nulos (y join falla), así que se convierte con numpy, que
+    da 'nan' como hacía pandas 2.
+    """
+    return df[key_columns].apply(lambda row: '|'.join(row.to_numpy().astype(str)), axis=1).tolist()
+
+@pytest.mark.parametrize('df, key_columns', [
+    (_ied_frame(), KEY_COLUMNS),
+    (pd.DataFrame({
+        'anio': ['2023', '2023', None],
+        'mes': ['enero', 'febrero', 'marzo'],
+        'pais': ['Perú', np.nan, 'Chile'],
+        'flujo': ['Col en Ext'] * 3,
+    }), ['anio', 'mes', 'pais', 'flujo']),
+    (pd.DataFrame({
+        'periodo_mes': ['2023-01', '2023-02', '2023-02'],
+        'codigo': [101, 102, 103],
+        'pais': ['CO', 'US', 'CO'],
+        'total_miles_dolares': [1.5, np.nan, 3.25],
+    }), ['periodo_mes', 'codigo', 'pais', 'total_miles_dolares']),
+], ids=['ied', 'turismo', 'servicios'])
+def test_composite_key_matches_previous_apply_key(df, key_columns):
+    assert _composite_key(df, key_columns).tolist() == _apply_key(df, key_columns)
+
+def test_repeated_keys_within_a_batch_keep_the_first_row(loader):
+    # Dos libros concatenados con un trimestre en común
+    df = pd.concat([_ied_frame(), _ied_frame().iloc[[0]].assign(valor=99.0)], ignore_index=True)
+
+    assert loader.insert_new_data('ban_rep_inversion', df, KEY_COLUMNS)
+
+    existing = loader.get_existing_data('ban_rep_inversion', None)
+    assert len(existing) == 3
+    assert 99.0 not in existing['valor'].tolist()
@@ -0,0 +1,45 @@
+import re
+import pytest
+from loaders.ddl_generator import build_create_table, build_year_partitions
+from processors import _CLASS_PATHS, load_class
+
+PROCESSOR_CLASSES = [load_class(path) for path in _CLASS_PATHS.values()]
+
+@pytest.mark.parametrize('processor_class', PROCESSOR_CLASSES, ids=lambda cls: cls.__name__)
+def test_create_table_per_processor(processor_class):
+    processor = processor_class(None, None, None, None)
+    table = processor.get_table_name()
+    column_types = processor.get_column_types()
+    key_columns = processor.get_key_columns()
+    partition_column = processor.get_partition_column()
+
+    statement = build_create_table(table, column_types, key_columns, partition_column,
+                                   start_year=2020, end_year=2022)
+
+    assert statement.startswith(f"CREATE TABLE IF NOT EXISTS `{table}` (")
+    for column, column_type in column_types.items():
+        nullability = 'NOT NULL' if column in key_columns else 'NULL'
+        assert f"    `{column}` {column_type} {nullability}" in statement
+    key_list = ', '.join(f"`{column}`" for column in key_columns)
+    assert f"UNIQUE KEY `uk_{table}` ({key_list})" in statement
+    if partition_column:
+        # DATE: YEAR(columna); columnas enteras de año: la columna directamente
+        expression = (f"YEAR(`{partition_column}`)" if column_types[partition_column] == 'DATE'
+                      else f"`{partition_column}`")
+        assert f"PARTITION BY RANGE ({expression})" in statement
+        assert re.findall(r"PARTITION (p\w+)", statement) == ['p2020', 'p2021', 'p2022', 'pmax']
+    else:
+        assert 'PARTITION' not in statement
+
+def test_key_columns_without_type_are_rejected():
+    with pytest.raises(ValueError, match='sin tipo declarado'):
+        build_create_table('t', {'a': 'INT'}, ['a', 'b'])
+
+def test_partition_column_must_be_part_of_the_key():
+    with pytest.raises(ValueError, match='debe formar parte de la clave'):
+        build_create_table('t', {'a': 'INT', 'fecha': 'DATE'}, ['a'], 'fecha')
+
+def test_integer_year_columns_partition_directly():
+    assert build_year_partitions('anio', 'SMALLINT', 2020, 2020).startswith("PARTITION BY RANGE (`anio`) (")
+    with pytest.raises(ValueError):
+        build_year_partitions('anio', 'VARCHAR(4)')
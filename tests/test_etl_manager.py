@@ -0,0 +1,139 @@
+import threading
+import pytest
+from etl_manager import ETLManager
+from loaders.connection_pool import ConnectionPool
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ETLManager({
+        'SHAREPOINT_SITE_URL': 'http://127.0.0.1:9/sites/etl',
+        'SHAREPOINT_USERNAME': '',
+        'SHAREPOINT_PASSWORD': '',
+        'SHAREPOINT_AUTH': 'none',
+        'DATABASE_CONFIG': {'url': f"sqlite:///{tmp_path / 'etl.db'}"},
+        'MANIFEST_PATH': str(tmp_path / 'run_manifest.json'),
+        'CHECKPOINT_PATH': str(tmp_path / 'checkpoints'),
+        'JOB_HISTORY_PATH': str(tmp_path / 'job_history.json'),
+        'ETL_MAX_WORKERS': 1,
+    })
+    yield manager
+    manager.close()
+    ConnectionPool.dispose_all()
+
+def test_reset_connections_reaches_worker_extractors(manager):
+    executor = manager._get_executor()
+    worker_extractor = executor.submit(manager._get_extractor).result()
+    assert worker_extractor is not manager.extractor
+
+    # Sesiones abiertas (simuladas) en el hilo principal y en el worker
+    manager.extractor.ctx = object()
+    worker_extractor.ctx = object()
+    manager.reset_connections()
+
+    assert manager.extractor.ctx is None
+    assert executor.submit(manager._get_extractor).result() is worker_extractor
+    assert worker_extractor.ctx is None
+
+def _sharded_manager(tmp_path, name):
+    return ETLManager({
+        'SHAREPOINT_SITE_URL': 'http://127.0.0.1:9/sites/etl',
+        'SHAREPOINT_USERNAME': '',
+        'SHAREPOINT_PASSWORD': '',
+        'SHAREPOINT_AUTH': 'none',
+        'DATABASE_CONFIG': {'url': f"sqlite:///{tmp_path / 'etl.db'}"},
+        'MANIFEST_PATH': str(tmp_path / name / 'run_manifest.json'),
+        'CHECKPOINT_PATH': str(tmp_path / name / 'checkpoints'),
+        'JOB_HISTORY_PATH': str(tmp_path / name / 'job_history.json'),
+        'ETL_MAX_WORKERS': 1,
+        'ETL_SHARDED': True,
+        'SHARD_RUN_ID': 'run-1',
+    })
+
+class TurismoProcessor:
+    pass
+
+def test_shard_round_id_depends_on_folder_contents_not_on_pass_count(tmp_path):
+    files = [{'name': 'turismo.xlsx', 'etag': '"{A},1"', 'modified': '2026-01-01', 'size': 10}]
+    jobs = [('Turismo', '/Turismo', TurismoProcessor)]
+    node_a, node_b = _sharded_manager(tmp_path, 'a'), _sharded_manager(tmp_path, 'b')
+    try:
+        for node in (node_a, node_b):
+            node.extractor.list_files_metadata = lambda folder_path: list(files)
+
+        first = node_a._shard_round_id(jobs)
+        # El nodo B se une después de que el nodo A hiciera varias pasadas sin cambios
+        node_a._shard_round_id(jobs)
+        assert node_b._shard_round_id(jobs) == first
+        assert first.startswith('run-1.')
+
+        files[0] = dict(files[0], etag='"{A},2"')
+        # Cada pasada (_run_jobs) vuelve a listar las carpetas
+        node_a._listings.clear()
+        node_b._listings.clear()
+        assert node_a._shard_round_id(jobs) == node_b._shard_round_id(jobs) != first
+    finally:
+        node_a.close()
+        node_b.close()
+        ConnectionPool.dispose_all()
+
+def test_single_folder_ignores_jobs_of_other_nodes(manager, monkeypatch):
+    monkeypatch.setattr(manager, '_get_processor_classes', lambda folder_name: [TurismoProcessor, TurismoProcessor])
+    monkeypatch.setattr(manager, '_run_jobs', lambda jobs: [None, True])
+    assert manager.process_single_folder('Turismo', '/Turismo')
+
+    monkeypatch.setattr(manager, '_run_jobs', lambda jobs: [None, False])
+    assert not manager.process_single_folder('Turismo', '/Turismo')
+
+class CountingExtractor:
+    def __init__(self):
+        self.listings = 0
+
+    def list_files_metadata(self, folder_path):
+        self.listings += 1
+        return [{'name': 'turismo.xlsx', 'etag': '1', 'modified': None, 'size': 10}]
+
+def test_folders_are_listed_once_per_run(manager, monkeypatch):
+    from processors.turismo_processor_salida_colombianos import TurismoSalidaColombianosProcessor
+    from processors.turismo_processor_visitantes_pais import TurismoVisitantesPaisProcessor
+    extractor = CountingExtractor()
+    monkeypatch.setattr(manager, '_get_extractor', lambda: extractor)
+
+    def process(processor_class, folder_path, folder_name):
+        return manager._create_processor(processor_class).list_matching_files(folder_path) is not None
+
+    monkeypatch.setattr(manager, '_process_with_single_processor', process)
+    jobs = [
+        ('4-Turismo', '/Turismo', TurismoSalidaColombianosProcessor),
+        ('4-Turismo', '/Turismo', TurismoVisitantesPaisProcessor),
+    ]
+
+    assert manager._run_jobs(jobs) == [True, True]
+    assert extractor.listings == 1
+    # La siguiente ejecución vuelve a listar
+    manager._run_jobs(jobs)
+    assert extractor.listings == 2
+
+def _in_new_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+def test_short_lived_threads_reuse_pooled_extractors(manager):
+    def borrow():
+        with manager.extractor_session() as extractor:
+            session = extractor.ctx
+            # Sesión abierta (simulada) por el trabajo
+            extractor.ctx = object()
+            return extractor, session
+
+    first, _ = _in_new_thread(borrow)
+    assert first is not manager.extractor
+    # Un hilo nuevo (p. ej. el del pipeline en la siguiente revisión) reutiliza la sesión abierta
+    extractor, session = _in_new_thread(borrow)
+    assert extractor is first and session is not None
+
+    manager.reset_connections()
+    extractor, session = _in_new_thread(borrow)
+    assert extractor is first and session is None
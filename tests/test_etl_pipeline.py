@@ -0,0 +1,71 @@
+from contextlib import nullcontext
+import pandas as pd
+import pytest
+from etl_pipeline import ETLPipeline
+from utils.job_history import JobHistory
+
+class FakeManager:
+    def __init__(self, processor, tmp_path):
+        self.processor = processor
+        self.history = JobHistory(str(tmp_path / 'job_history.json'))
+
+    def extractor_session(self):
+        return nullcontext()
+
+    def _create_processor(self, processor_class):
+        return self.processor
+
+class FullRefreshProcessor:
+    files_downloaded = 0
+    bytes_downloaded = 0
+
+    def __init__(self, files=3, missing=(), strategy_error=None):
+        self.files = [{'name': f'libro_{index}.xlsx'} for index in range(files)]
+        self.missing = set(missing)
+        self.strategy_error = strategy_error
+        self.loaded = []
+
+    def list_matching_files(self, folder_path):
+        return self.files
+
+    def download_file(self, folder_path, metadata):
+        if metadata['name'] in self.missing:
+            return None
+        return {'path': folder_path, 'metadata': metadata}
+
+    def transform_file(self, file_info):
+        return pd.DataFrame({'archivo': [file_info['metadata']['name']]})
+
+    def get_load_strategy(self):
+        if self.strategy_error:
+            raise self.strategy_error
+        return 'full_refresh'
+
+    def load_data(self, df):
+        self.loaded.append(df)
+        return True
+
+    def record_loaded(self, folder_path, metadata, rows):
+        pass
+
+def test_full_refresh_is_not_replaced_when_a_download_failed(tmp_path):
+    processor = FullRefreshProcessor(missing={'libro_1.xlsx'})
+    pipeline = ETLPipeline(FakeManager(processor, tmp_path), queue_size=1)
+
+    assert pipeline.run([('Turismo', '/Turismo', FullRefreshProcessor)]) == [False]
+    assert processor.loaded == []
+
+def test_full_refresh_loads_all_files_together(tmp_path):
+    processor = FullRefreshProcessor()
+    pipeline = ETLPipeline(FakeManager(processor, tmp_path), queue_size=1)
+
+    assert pipeline.run([('Turismo', '/Turismo', FullRefreshProcessor)]) == [True]
+    assert [len(df) for df in processor.loaded] == [3]
+
+def test_load_stage_error_is_raised_without_blocking_the_pipeline(tmp_path):
+    # Más archivos que capacidad en las colas: sin vaciarlas, la transformación quedaría bloqueada
+    processor = FullRefreshProcessor(files=6, strategy_error=RuntimeError("estrategia desconocida"))
+    pipeline = ETLPipeline(FakeManager(processor, tmp_path), queue_size=1)
+
+    with pytest.raises(RuntimeError, match="estrategia desconocida"):
+        pipeline.run([('Turismo', '/Turismo', FullRefreshProcessor)])
@@ -0,0 +1,27 @@
+import pytest
+from utils.job_history import JobHistory
+
+def test_jobs_without_files_are_left_out_of_the_average(tmp_path):
+    history = JobHistory(str(tmp_path / 'job_history.json'))
+    history.record_job('IedPaisOrigenProcessor', 100.0, files=2, bytes_processed=1000)
+    history.record_job('IedPaisOrigenProcessor', 0.2, files=0)
+
+    assert history.predict('IedPaisOrigenProcessor') == 100.0
+
+def test_prediction_scales_with_pending_bytes(tmp_path):
+    history = JobHistory(str(tmp_path / 'job_history.json'))
+    history.record_job('IedPaisOrigenProcessor', 10.0, files=1, bytes_processed=1000)
+    history.record_job('PaisAcuerdosProcessor', 1.0, files=1, bytes_processed=1000)
+
+    assert history.predict('IedPaisOrigenProcessor', pending_bytes=0) == 0
+    assert history.predict('PaisAcuerdosProcessor', pending_bytes=50000) == pytest.approx(50.0)
+    # Sin tamaños pendientes se usa la media de duraciones
+    assert history.predict('PaisAcuerdosProcessor') == 1.0
+
+def test_prediction_falls_back_to_file_history(tmp_path):
+    history = JobHistory(str(tmp_path / 'job_history.json'))
+    history.record_file('TurismoVisitantesPaisProcessor', {'name': 'a.xlsx', 'size': 2000}, 'download', 1.0)
+    history.record_file('TurismoVisitantesPaisProcessor', {'name': 'a.xlsx', 'size': 2000}, 'transform', 3.0)
+
+    assert history.predict('TurismoVisitantesPaisProcessor', pending_bytes=4000) == pytest.approx(8.0)
+    assert history.predict('TurismoVisitantesPaisProcessor') is None
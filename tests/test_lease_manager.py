@@ -0,0 +1,65 @@
+import pytest
+from loaders.connection_pool import ConnectionPool
+from loaders.lease_manager import LeaseManager, new_run_id
+
+KEYS = ['Turismo/TurismoVisitantesPaisProcessor', 'Inversión/IedPaisOrigenProcessor']
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool({'url': f"sqlite:///{tmp_path / 'leases.db'}"})
+    yield pool
+    pool.dispose()
+
+def _manager(pool, owner, run_id='run-1', **kwargs) -> LeaseManager:
+    manager = LeaseManager(pool, run_id, owner=owner, **kwargs)
+    manager.register({KEYS[0]: 2, KEYS[1]: 1})
+    return manager
+
+def test_claim_by_priority_and_once_per_key(pool):
+    node_a = _manager(pool, 'a')
+    node_b = _manager(pool, 'b')
+
+    assert node_a.claim(KEYS) == KEYS[0]
+    assert node_b.claim(KEYS) == KEYS[1]
+    assert node_a.claim(KEYS) is None
+    assert node_a.remaining(KEYS) == 2
+
+    node_a.complete(KEYS[0], True)
+    node_b.complete(KEYS[1], True)
+    assert node_a.remaining(KEYS) == 0
+    assert node_b.claim(KEYS) is None
+
+def test_expired_lease_is_claimed_by_another_node(pool):
+    # TTL negativo: el lease expira en cuanto se toma, como el de un nodo caído
+    dead = _manager(pool, 'dead', ttl_seconds=-1)
+    alive = _manager(pool, 'alive')
+
+    assert dead.claim([KEYS[0]]) == KEYS[0]
+    assert alive.claim([KEYS[0]]) == KEYS[0]
+
+    # El nodo caído ya no es dueño del lease: su complete no lo modifica
+    dead.complete(KEYS[0], False)
+    assert alive.remaining([KEYS[0]]) == 1
+    alive.complete(KEYS[0], True)
+    assert alive.remaining([KEYS[0]]) == 0
+
+def test_failed_lease_is_retried_up_to_max_attempts(pool):
+    node = _manager(pool, 'a', max_attempts=2)
+
+    assert node.claim([KEYS[0]]) == KEYS[0]
+    node.complete(KEYS[0], False)
+    assert node.remaining([KEYS[0]]) == 1
+
+    assert node.claim([KEYS[0]]) == KEYS[0]
+    node.complete(KEYS[0], False)
+    assert node.remaining([KEYS[0]]) == 0
+    assert node.claim([KEYS[0]]) is None
+
+def test_new_run_starts_with_pending_leases(pool):
+    first = _manager(pool, 'a', run_id=new_run_id())
+    while (key := first.claim(KEYS)) is not None:
+        first.complete(key, True)
+
+    second = _manager(pool, 'a', run_id=new_run_id())
+    assert second.run_id != first.run_id
+    assert second.claim(KEYS) == KEYS[0]
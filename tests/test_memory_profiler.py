@@ -0,0 +1,41 @@
+import tracemalloc
+import pytest
+from utils.memory_profiler import MemoryProfiler
+
+_MB = 1024 * 1024
+
+@pytest.fixture
+def profiler():
+    started = tracemalloc.is_tracing()
+    profiler = MemoryProfiler()
+    profiler.configure(enabled=True)
+    yield profiler
+    if not started:
+        tracemalloc.stop()
+
+def _peaks(profiler) -> dict:
+    return {stage['stage']: stage['max_traced_peak_mb'] for stage in profiler.get_report()['stages']}
+
+def test_inner_stage_does_not_wipe_outer_peak(profiler):
+    with profiler.stage('outer'):
+        buffer = bytearray(20 * _MB)
+        del buffer
+        with profiler.stage('inner'):
+            small = bytearray(_MB)
+            del small
+
+    peaks = _peaks(profiler)
+    assert peaks['inner'] < 5
+    assert peaks['outer'] >= 20
+
+def test_outer_peak_includes_inner_stages(profiler):
+    with profiler.stage('outer'):
+        with profiler.stage('inner'):
+            buffer = bytearray(30 * _MB)
+            del buffer
+        small = bytearray(_MB)
+        del small
+
+    peaks = _peaks(profiler)
+    assert peaks['inner'] >= 30
+    assert peaks['outer'] >= 30
@@ -0,0 +1,34 @@
+from utils.perf_history import PerfHistory
+
+KEY = ('IedPaisOrigenProcessor', 'ban_rep_inversion', 'load')
+
+def _point(seconds: float, rows: int) -> dict:
+    return {'processor': KEY[0], 'table': KEY[1], 'stage': KEY[2], 'seconds': seconds, 'rows': rows,
+            'bytes': 0, 'rows_per_sec': round(rows / seconds, 1) if rows else None}
+
+def _history(points):
+    return {KEY: [{'run_id': str(number), 'finished_at': None, **point} for number, point in enumerate(points)]}
+
+def test_more_rows_at_better_throughput_is_not_a_regression():
+    store = PerfHistory('unused.jsonl', min_runs=3, min_seconds=0)
+    history = _history([_point(10.0, 10000)] * 5)
+
+    assert store.check([_point(30.0, 50000)], history) == []
+
+def test_lower_throughput_is_a_regression():
+    store = PerfHistory('unused.jsonl', min_runs=3, min_seconds=0)
+    history = _history([_point(10.0, 10000)] * 5)
+
+    [regression] = store.check([_point(10.0, 5000)], history)
+
+    assert regression['metric'] == 'ms_per_row'
+    assert regression['slowdown'] == 2.0
+
+def test_runs_without_rows_compare_seconds():
+    store = PerfHistory('unused.jsonl', min_runs=3, min_seconds=0)
+    history = _history([_point(2.0, 0)] * 5 + [_point(10.0, 10000)])
+
+    [regression] = store.check([_point(4.0, 0)], history)
+
+    assert regression['metric'] == 'seconds'
+    assert regression['runs'] == 5
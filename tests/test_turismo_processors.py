@@ -0,0 +1,25 @@
+import logging
+import numpy as np
+import pandas as pd
+from processors.turismo_processor_salida_colombianos import TurismoSalidaColombianosProcessor
+
+def _processor() -> TurismoSalidaColombianosProcessor:
+    return TurismoSalidaColombianosProcessor(None, None, None, logging.getLogger('tests'))
+
+def test_salida_colombianos_rules_drop_invalid_rows():
+    raw = pd.DataFrame({
+        'Año': [2023, 2023, 1990, 2023, 2023, 2023, 2023],
+        'Mes': ['Ene', 'febrero', 'enero', 'mes13', 'marzo', 'abril', 'ene'],
+        'País': ['perú', 'Chile', 'Perú', 'Perú', np.nan, 'Perú', 'Perú'],
+        'Viajeros': [10, 20, 30, 40, 50, -5, 99],
+    })
+
+    result = _processor().transform_data(raw)
+
+    # Inválidos: año fuera de rango, mes desconocido, país vacío, viajeros negativos;
+    # la última fila repite (2023, enero, Perú) y se descarta como duplicada
+    assert result[['anio', 'mes', 'pais', 'viajeros']].values.tolist() == [
+        ['2023', 'enero', 'Perú', 10],
+        ['2023', 'febrero', 'Chile', 20],
+    ]
+    assert (result['flujo'] == 'Col en Ext').all()
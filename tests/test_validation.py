@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.validation import InSet, NonNegative, NotEmpty, NotNull, NumericRange, Rule, ValidationEngine
+
+RULES = [
+    NumericRange('anio', 2000, 2030),
+    InSet('mes', ['enero', 'febrero']),
+    NonNegative('viajeros'),
+    NotEmpty('pais', empty=('', 'Nan')),
+    NotNull('columna_ausente'),
+]
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'anio': [2023, 1990, 2023, 2023, 2023, 1999],
+        'mes': ['enero', 'enero', 'mes13', 'febrero', 'enero', 'mes13'],
+        'pais': ['Perú', 'Chile', 'Perú', 'Nan', 'Perú', 'Chile'],
+        'viajeros': [10, 20, 30, 40, -5, np.nan],
+    })
+
+def test_apply_counts_rejections_per_rule():
+    engine = ValidationEngine()
+
+    result = engine.apply(_frame(), RULES, 'TurismoSalidaColombianosProcessor', 'visitas_turismo')
+
+    assert result.index.tolist() == [0]
+    assert engine.get_report() == {
+        'rejections': {'TurismoSalidaColombianosProcessor': {
+            'anio en [2000, 2030]': 2,
+            'mes en conjunto válido': 2,
+            'viajeros >= 0': 2,
+            'pais no vacío': 1,
+        }},
+        'quarantine': {},
+    }
+
+def test_apply_returns_same_frame_without_rejections():
+    engine = ValidationEngine()
+    df = _frame().iloc[[0]]
+
+    assert engine.apply(df, RULES, 'TurismoSalidaColombianosProcessor') is df
+
+def test_quarantine_writes_sample_with_failed_rules(tmp_path):
+    engine = ValidationEngine()
+    engine.configure(str(tmp_path), sample_size=3)
+
+    engine.apply(_frame(), RULES, 'TurismoSalidaColombianosProcessor')
+    engine.apply(_frame(), RULES, 'TurismoSalidaColombianosProcessor')
+
+    path = tmp_path / 'TurismoSalidaColombianosProcessor.csv'
+    sample = pd.read_csv(path)
+    assert len(sample) == 6
+    assert list(sample.columns) == ['anio', 'mes', 'pais', 'viajeros', '_rules']
+    assert engine.get_report()['quarantine'] == {str(path): 6}
+    expected = {
+        (1990, 'enero'): 'anio en [2000, 2030]',
+        (2023, 'mes13'): 'mes en conjunto válido',
+        (2023, 'febrero'): 'pais no vacío',
+        (2023, 'enero'): 'viajeros >= 0',
+        (1999, 'mes13'): 'anio en [2000, 2030]; mes en conjunto válido; viajeros >= 0',
+    }
+    for row in sample.itertuples():
+        assert row._5 == expected[(row.anio, row.mes)]
+
+def test_quarantine_disabled_with_zero_sample(tmp_path):
+    engine = ValidationEngine()
+    engine.configure(str(tmp_path), sample_size=0)
+
+    engine.apply(_frame(), RULES, 'TurismoSalidaColombianosProcessor')
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_rule_without_invalid_cannot_be_instantiated():
+    class Incomplete(Rule):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete('anio')
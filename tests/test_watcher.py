@@ -0,0 +1,55 @@
+import pytest
+from extractors.sharepoint_extractor import FolderInfo
+from utils.memory_profiler import MemoryBudgetExceeded
+from watcher import FolderWatcher
+
+class OverBudgetExtractor:
+    def get_folder_details(self, folder_path):
+        raise MemoryBudgetExceeded("RSS 900 MB > MEMORY_BUDGET_MB=512")
+
+class FakeManager:
+    def __init__(self):
+        self.extractor = OverBudgetExtractor()
+        self.resets = 0
+
+    def reset_connections(self):
+        self.resets += 1
+
+def test_memory_budget_stops_the_watcher():
+    manager = FakeManager()
+
+    with pytest.raises(MemoryBudgetExceeded):
+        FolderWatcher(manager, 'Base').run(once=True)
+    assert manager.resets == 0
+
+class TurismoExtractor:
+    def __init__(self):
+        self.version = 1
+
+    def get_folder_details(self, folder_path):
+        turismo = FolderInfo(name='4-Turismo', path='/Base/4-Turismo', parent_path='/Base', level='1')
+        return FolderInfo(name='Base', path='/Base', parent_path='', level='0', subfolders=[turismo])
+
+    def list_files_metadata(self, folder_path):
+        return [{'name': 'turismo.xlsx', 'etag': str(self.version), 'modified': None, 'size': 10}]
+
+class TurismoManager(FakeManager):
+    def __init__(self):
+        super().__init__()
+        self.extractor = TurismoExtractor()
+
+    def process_folders(self, folders):
+        return {name: True for name, _ in folders}
+
+def test_each_poll_that_processed_folders_is_reported():
+    manager = TurismoManager()
+    reports = []
+    watcher = FolderWatcher(manager, '/Base', on_poll=reports.append)
+
+    watcher.run(once=True)
+    # Sin cambios: no se procesa nada ni se reporta
+    watcher.run(once=True)
+    manager.extractor.version = 2
+    watcher.run(once=True)
+
+    assert reports == [{'4-Turismo': True}, {'4-Turismo': True}]